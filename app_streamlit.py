@@ -1,14 +1,15 @@
 import streamlit as st
 from src.config import get_spec, Modalidade
 from src.state import init_state, get_history, set_history, clear_history
-from src.data_caixa import load_history_from_caixa
+from src.data_caixa import load_history, revalidando
+from src.prefetch import aguardar
 
 st.set_page_config(page_title="Lottery Helper", page_icon="🎰", layout="wide")
 
 init_state()
 
 st.title("Lottery Helper")
-st.caption("Multipage nativo com lógica separada em src/ e histórico in-memory por sessão.")
+st.caption("Multipage nativo com lógica separada em src/ e histórico compartilhado pelo processo (sessão guarda só a versão).")
 
 modalidade: Modalidade = st.radio("Modalidade", ["Mega-Sena", "Lotofácil"])
 spec = get_spec(modalidade)
@@ -21,20 +22,22 @@ with col1:
 
 with col2:
     if st.button("Forçar download agora"):
-        df = load_history_from_caixa(modalidade)
+        df = load_history(modalidade, forcar=True)
         set_history(modalidade, df)
         st.rerun()
 
 df = get_history(modalidade)
 if df is None:
     with st.spinner("Baixando histórico da Caixa..."):
-        df = load_history_from_caixa(modalidade)
-        set_history(modalidade, df)
+        df = set_history(modalidade, aguardar(modalidade))
+
+if revalidando(modalidade):
+    st.caption("Procurando concursos novos na Caixa em segundo plano; a base atualiza no próximo recarregamento.")
 
 st.subheader("Checklist da base")
 st.write("Total de concursos (linhas):", len(df))
 st.write("Concurso min/max:", int(df["concurso"].min()), int(df["concurso"].max()))
 st.write("Data min/max:", df["data"].min().date(), df["data"].max().date())
 
-st.info("Use as páginas no menu lateral: Gerar jogos, Análises e Debug.")
+st.info("Use as páginas no menu lateral: Gerar jogos, Análises, Simulação e Debug.")
 
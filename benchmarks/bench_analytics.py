@@ -0,0 +1,49 @@
+"""
+Tempo de `atraso` e `padroes_par_impar_baixa_alta` (vetorizados) contra as versões antigas
+baseadas em iterrows. A equivalência é verificada em tests/test_analytics.py.
+
+Uso: python -m benchmarks.bench_analytics [--draws 1000000] [--legacy-draws 20000]
+
+As versões antigas são lentas demais para 1M de concursos; elas rodam numa amostra
+(`--legacy-draws`) e o tempo é extrapolado linearmente.
+"""
+from __future__ import annotations
+
+import argparse
+
+import pandas as pd
+
+from src.analytics import atraso, frequencias, padroes_par_impar_baixa_alta
+from src.config import get_spec
+
+from .common import atraso_legado, cronometrar, historico_sintetico, padroes_legado
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--draws", type=int, default=1_000_000)
+    ap.add_argument("--legacy-draws", type=int, default=20_000)
+    args = ap.parse_args()
+
+    for mod in ("Mega-Sena", "Lotofácil"):
+        spec = get_spec(mod)
+        n, N, lb = spec.n_dezenas_sorteio, spec.n_universo, spec.limite_baixo
+
+        amostra = historico_sintetico(spec, args.legacy_draws, seed=1)
+        freq_a = frequencias(amostra, n, N)
+        escala = args.draws / args.legacy_draws
+        t_atraso_leg = cronometrar(lambda: atraso_legado(freq_a, amostra, n, N), 1) * escala
+        t_padroes_leg = cronometrar(lambda: padroes_legado(amostra, n, lb), 1) * escala
+
+        df = historico_sintetico(spec, args.draws, seed=2)
+        freq = frequencias(df, n, N)
+        t_atraso = cronometrar(lambda: atraso(freq, df, n, N))
+        t_padroes = cronometrar(lambda: padroes_par_impar_baixa_alta(df, n, lb))
+
+        print(f"{mod} ({args.draws:,} concursos)")
+        print(f"  atraso:  {t_atraso:8.3f}s  (iterrows ~{t_atraso_leg:8.1f}s, {t_atraso_leg / t_atraso:,.0f}x)")
+        print(f"  padroes: {t_padroes:8.3f}s  (iterrows ~{t_padroes_leg:8.1f}s, {t_padroes_leg / t_padroes:,.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
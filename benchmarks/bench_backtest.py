@@ -0,0 +1,79 @@
+"""
+Tempo e memória de pico do backtest (jogos × concursos) em blocos.
+
+Uso: python -m benchmarks.bench_backtest [--games 100000] [--draws 3000] [--workers 1 2 4 8]
+
+Com --workers, mede também o backtest em processos (src/parallel.py), o speedup e o custo fixo
+do despacho (pool já aberto, 8 jogos), de onde sai o ponto de equilíbrio usado em
+`parallel.MIN_PARES_PARALELO`: pares × (1 - 1/w) / vazão serial = despacho.
+"""
+from __future__ import annotations
+
+import argparse
+import tracemalloc
+from contextlib import contextmanager
+
+import numpy as np
+
+from src import parallel
+from src.backtest import backtest
+from src.config import get_spec
+from src.domain_lottery import gerar_matriz_aleatoria
+from src.draw_index import DrawIndex
+from src.parallel import backtest_paralelo
+
+from .common import cronometrar, historico_sintetico
+
+
+@contextmanager
+def _sempre_paralelo():
+    # mede o caminho em processos mesmo abaixo do limite
+    anterior, parallel.MIN_PARES_PARALELO = parallel.MIN_PARES_PARALELO, 0
+    try:
+        yield
+    finally:
+        parallel.MIN_PARES_PARALELO = anterior
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--games", type=int, default=100_000)
+    ap.add_argument("--draws", type=int, default=3_000)
+    ap.add_argument("--workers", type=int, nargs="*", default=[])
+    args = ap.parse_args()
+
+    for mod in ("Mega-Sena", "Lotofácil"):
+        spec = get_spec(mod)
+        df = historico_sintetico(spec, args.draws, seed=1)
+        idx = DrawIndex.from_history(df, spec.n_dezenas_sorteio, spec.n_universo)
+        jogos = gerar_matriz_aleatoria(args.games, spec.n_min, spec.n_universo, np.random.default_rng(2))
+
+        tracemalloc.start()
+        res = backtest(jogos, idx)
+        pico = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        assert int(res.hist_acertos.sum()) == args.games * args.draws
+
+        t = cronometrar(lambda: backtest(jogos, idx), 1)
+        pares = args.games * args.draws
+        print(f"{mod} ({args.games:,} jogos × {args.draws:,} concursos)")
+        print(f"  {t:8.3f}s  ({pares / t / 1e6:,.0f}M pares/s, pico {pico / 1e6:,.0f} MB)")
+
+        for w in args.workers:
+            par = backtest_paralelo(jogos, idx, workers=w)  # 1ª chamada também sobe o pool
+            assert np.array_equal(par.hist_acertos, res.hist_acertos)
+            assert np.array_equal(par.melhor_concurso, res.melhor_concurso)
+            tw = cronometrar(lambda: backtest_paralelo(jogos, idx, workers=w), 1)
+            print(f"  {w:2d} workers: {tw:8.3f}s  (speedup {t / tw:4.1f}x)")
+            if w < 2:
+                continue
+            poucos = jogos[:8]
+            with _sempre_paralelo():
+                despacho = cronometrar(lambda: backtest_paralelo(poucos, idx, workers=w), 5)
+            despacho -= cronometrar(lambda: backtest(poucos, idx), 5)
+            equilibrio = despacho * (pares / t) * w / (w - 1)
+            print(f"      despacho {despacho * 1e3:5.1f} ms -> compensa acima de ~{equilibrio / 1e6:,.1f}M pares")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Coocorrência de pares (Xᵀ·X) e trios (Gram por dezena) em históricos sintéticos grandes,
+conferida contra a contagem direta de combinações numa amostra.
+
+Uso: python -m benchmarks.bench_coocorrencia [--draws 1000000] [--conferir 2000]
+"""
+from __future__ import annotations
+
+import argparse
+from collections import Counter
+from dataclasses import replace
+from itertools import combinations
+
+import numpy as np
+
+from src.config import get_spec
+from src.coocorrencia import Coocorrencia, combinacoes
+from src.draw_index import DrawIndex
+
+from .common import cronometrar, historico_sintetico
+
+
+def _conferir(df, spec) -> None:
+    idx = DrawIndex.from_history(df, spec.n_dezenas_sorteio, spec.n_universo)
+    cooc = Coocorrencia.from_index(idx)
+    bloco = df[[f"d{i}" for i in range(1, spec.n_dezenas_sorteio + 1)]].to_numpy()
+    pares, trios = Counter(), Counter()
+    for linha in bloco.tolist():
+        pares.update(combinations(linha, 2))
+        trios.update(combinations(linha, 3))
+    for r, contagem in ((2, pares), (3, trios)):
+        esperado = np.array([contagem.get(tuple(int(d) + 1 for d in c), 0) for c in combinacoes(spec.n_universo, r)])
+        assert np.array_equal(cooc.contagens(r), esperado), f"{spec.modalidade}: divergência em r={r}"
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--draws", type=int, default=1_000_000)
+    ap.add_argument("--conferir", type=int, default=2_000, help="concursos conferidos por contagem direta")
+    ap.add_argument("--repeticoes", type=int, default=3)
+    args = ap.parse_args()
+
+    for mod in ("Mega-Sena", "Lotofácil"):
+        spec = get_spec(mod)
+        df = historico_sintetico(spec, args.draws, seed=7)
+        _conferir(df.head(args.conferir), spec)
+
+        idx = DrawIndex.from_history(df, spec.n_dezenas_sorteio, spec.n_universo)
+        t_ocorr = cronometrar(lambda: DrawIndex.ocorrencias.func(idx), args.repeticoes)
+        t_total = cronometrar(lambda: Coocorrencia.from_index(replace(idx)), args.repeticoes)  # sem cached_property
+        cooc = Coocorrencia.from_index(idx)
+        t_rank = cronometrar(lambda: cooc.ranking(3, 100), args.repeticoes)
+        t_rank_com = cronometrar(lambda: cooc.ranking(3, 100, menos=True, com=1), args.repeticoes)
+        print(
+            f"{mod:10s} {args.draws:>9,} concursos  from_index {t_total:6.3f} s "
+            f"(ocorrências por dezena {t_ocorr:.3f} s)  top-100 trios {t_rank * 1e3:5.1f} ms  "
+            f"com dezena 1 {t_rank_com * 1e3:5.1f} ms  [{len(cooc.trios):,} trios]"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Atualização do histórico contra o servidor local (`stub_caixa`): download completo, 304 por
+ETag, 200 com planilha idêntica (sha256) e stale-while-revalidate com latência de rede.
+
+Uso: python -m benchmarks.bench_http [--modalidade lotofacil] [--draws 3500] [--atraso 1.0]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import timedelta
+from io import BytesIO
+
+from src.config import CACHE_DIR_ENV, DOWNLOAD_URL_ENV, get_spec
+from src.data_caixa import atualizar_da_caixa, ler_historico_xlsx, load_history, revalidar
+from src.history_registry import mais_recente
+from src.history_store import agora_brasilia, carregar_store, carregar_validadores, salvar_store, salvar_validadores
+
+from .common import planilha_caixa
+from .stub_caixa import StubCaixa
+
+
+def _store_vencido(mod: str, df) -> None:
+    """Store com a última verificação há um dia: um sorteio novo é esperado."""
+    salvar_store(mod, df, verificado_em=agora_brasilia() - timedelta(days=1))
+
+
+def _cronometrar(fn) -> tuple[float, object]:
+    t0 = time.perf_counter()
+    valor = fn()
+    return time.perf_counter() - t0, valor
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--modalidade", choices=("mega", "lotofacil"), default="lotofacil")
+    ap.add_argument("--draws", type=int, default=3_500)
+    ap.add_argument("--atraso", type=float, default=1.0, help="latência do servidor no cenário stale-while-revalidate")
+    args = ap.parse_args()
+
+    spec = get_spec("Mega-Sena" if args.modalidade == "mega" else "Lotofácil")
+    mod = spec.modalidade
+    anterior = planilha_caixa(spec, args.draws - 1)
+    atual = planilha_caixa(spec, args.draws)
+    ultimo = int(ler_historico_xlsx(BytesIO(atual), mod)["concurso"].max())
+
+    with tempfile.TemporaryDirectory() as cache_dir, StubCaixa({mod: anterior}) as srv:
+        os.environ[CACHE_DIR_ENV] = cache_dir
+        os.environ[DOWNLOAD_URL_ENV] = srv.url
+
+        t, df = _cronometrar(lambda: load_history(mod))
+        print(f"sem store (download + parse)        {t:7.3f} s  {len(df):,} concursos, {srv.bytes_enviados / 1e6:.1f} MB")
+
+        _store_vencido(mod, df)
+        t, _ = _cronometrar(lambda: atualizar_da_caixa(mod, carregar_store(mod)))
+        assert srv.nao_modificado == 1, "esperava 304"
+        print(f"store + ETag (304, sem parse)       {t:7.3f} s")
+
+        srv.validadores = False
+        t, _ = _cronometrar(lambda: atualizar_da_caixa(mod, carregar_store(mod)))
+        print(f"200 sem validadores, mesmo sha256   {t:7.3f} s")
+
+        # a Caixa publica um concurso novo; o servidor passa a responder devagar
+        srv.validadores, srv.atraso = True, args.atraso
+        srv.publicar(mod, atual)
+        base, validadores = carregar_store(mod)[0], carregar_validadores(mod)
+
+        _store_vencido(mod, base)
+        t, df = _cronometrar(lambda: load_history(mod, em_segundo_plano=True))
+        print(f"stale-while-revalidate (resposta)   {t:7.3f} s  {len(df):,} concursos (latência {args.atraso:.1f} s)")
+        t, novo = _cronometrar(lambda: revalidar(mod).result())
+        assert mais_recente(mod)[2] == ultimo
+        print(f"  revalidação concluída em +        {t:7.3f} s  {len(novo):,} concursos publicados no registro")
+
+        _store_vencido(mod, base)
+        salvar_validadores(mod, validadores)
+        t, df = _cronometrar(lambda: load_history(mod))
+        assert int(df["concurso"].max()) == ultimo
+        print(f"bloqueante, mesmo cenário           {t:7.3f} s  {len(df):,} concursos")
+
+
+if __name__ == "__main__":
+    main()
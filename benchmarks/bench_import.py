@@ -0,0 +1,63 @@
+"""
+Import a frio do núcleo (src/ sem Streamlit) vs. adaptadores Streamlit, cada medição num processo novo.
+
+Uso: python -m benchmarks.bench_import [--repeticoes 7]
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+CORE = (
+    "src.config",
+    "src.data_caixa",
+    "src.analytics",
+    "src.domain_lottery",
+    "src.games_export",
+    "src.reports",
+    "src.backtest",
+    "src.premios",
+    "src.simulacao",
+    "src.core_cached",
+)
+ALVOS = {
+    "cli (--help)": ("lottery_helper.cli",),
+    "núcleo": CORE,
+    "núcleo + adaptadores Streamlit": CORE + ("src.analytics_cached", "src.history_cached", "src.state"),
+}
+
+_SCRIPT = """
+import sys, time
+t0 = time.perf_counter()
+for m in {modulos!r}:
+    __import__(m)
+print(time.perf_counter() - t0, "streamlit" in sys.modules)
+"""
+
+
+def medir(modulos: tuple[str, ...]) -> tuple[float, bool]:
+    out = subprocess.run(
+        [sys.executable, "-c", _SCRIPT.format(modulos=modulos)], capture_output=True, text=True, check=True
+    ).stdout.split()
+    return float(out[0]), out[1] == "True"
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeticoes", type=int, default=7)
+    args = ap.parse_args()
+
+    for nome, modulos in ALVOS.items():
+        tempos, com_streamlit = zip(*(medir(modulos) for _ in range(args.repeticoes)))
+        if "Streamlit" not in nome:
+            assert not any(com_streamlit), f"{nome} importou streamlit"
+        print(
+            f"{nome:32s} mediana {statistics.median(tempos) * 1e3:7.1f} ms  "
+            f"(mín {min(tempos) * 1e3:6.1f} ms, streamlit={'sim' if com_streamlit[0] else 'não'})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Ingestão da planilha da Caixa: `pd.read_excel` + normalização antiga (uma cópia filtrada por
+coluna de bola) contra `ler_historico_xlsx` (read-only, só as colunas usadas, uma máscara).
+
+Uso: python -m benchmarks.bench_ingestao [--modalidade lotofacil] [--draws 3500] [--repeticoes 3]
+
+A planilha sintética imita a da Caixa: data dd/mm/aaaa em texto, BolaN numéricas e as colunas
+de ganhadores/rateio/cidade/arrecadação depois das bolas.
+"""
+from __future__ import annotations
+
+import argparse
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from src.config import LotterySpec, get_spec
+from src.data_caixa import COLUNAS_XLSX, ler_historico_xlsx
+
+from .common import cronometrar, planilha_caixa
+
+
+def _normalizar_legado(df_raw: pd.DataFrame, spec: LotterySpec) -> pd.DataFrame:
+    col_data = COLUNAS_XLSX[spec.modalidade][1]
+    bolas = [f"Bola{i}" for i in range(1, spec.n_dezenas_sorteio + 1)]
+    df = df_raw[["Concurso", col_data] + bolas].copy()
+    df.rename(columns={"Concurso": "concurso", col_data: "data"}, inplace=True)
+
+    df["concurso"] = pd.to_numeric(df["concurso"], errors="coerce")
+    df["data"] = pd.to_datetime(df["data"], dayfirst=True, errors="coerce")
+    df = df.dropna(subset=["concurso", "data"])
+    df = df[(df["data"] >= "1996-01-01") & (df["data"] <= pd.Timestamp.today().normalize())]
+    df["concurso"] = df["concurso"].astype(int)
+    df = df.sort_values(["concurso", "data"]).drop_duplicates(subset=["concurso"], keep="last")
+    df = df.sort_values("concurso").reset_index(drop=True)
+
+    for c in bolas:
+        df[c] = pd.to_numeric(df[c], errors="coerce")
+    df = df.dropna(subset=bolas)
+    for c in bolas:
+        df[c] = df[c].astype(int)
+        df = df[df[c].between(1, spec.n_universo)]
+
+    dezenas = [f"d{i}" for i in range(1, spec.n_dezenas_sorteio + 1)]
+    df.rename(columns=dict(zip(bolas, dezenas)), inplace=True)
+    df[dezenas] = np.sort(df[dezenas].values, axis=1)
+    return df[["concurso", "data"] + dezenas].sort_values("concurso").reset_index(drop=True)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--modalidade", choices=("mega", "lotofacil"), default="lotofacil")
+    ap.add_argument("--draws", type=int, default=3_500)
+    ap.add_argument("--repeticoes", type=int, default=3)
+    args = ap.parse_args()
+
+    spec = get_spec("Mega-Sena" if args.modalidade == "mega" else "Lotofácil")
+    conteudo = planilha_caixa(spec, args.draws)
+    print(f"{spec.modalidade}: {args.draws:,} concursos, planilha de {len(conteudo) / 1e6:.1f} MB")
+
+    def legado() -> pd.DataFrame:
+        return _normalizar_legado(pd.read_excel(BytesIO(conteudo)), spec)
+
+    def novo() -> pd.DataFrame:
+        return ler_historico_xlsx(BytesIO(conteudo), spec.modalidade)
+
+    pd.testing.assert_frame_equal(legado(), novo())
+    t_legado = cronometrar(legado, args.repeticoes)
+    t_novo = cronometrar(novo, args.repeticoes)
+    print(f"read_excel + normalização antiga  {t_legado:7.3f} s")
+    print(f"ler_historico_xlsx                {t_novo:7.3f} s  ({t_legado / t_novo:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import time
+from io import BytesIO
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from src.config import LotterySpec
+from src.data_caixa import COLUNAS_XLSX
+from src.domain_lottery import gerar_matriz_aleatoria
+
+
+def historico_sintetico(spec: LotterySpec, n_concursos: int, seed: int = 0) -> pd.DataFrame:
+    """Histórico no mesmo formato de `normalizar_megasena`/`normalizar_lotofacil`."""
+    rng = np.random.default_rng(seed)
+    m = gerar_matriz_aleatoria(n_concursos, spec.n_dezenas_sorteio, spec.n_universo, rng).astype(np.int64)
+    df = pd.DataFrame(m, columns=[f"d{i}" for i in range(1, spec.n_dezenas_sorteio + 1)])
+    df.insert(0, "concurso", np.arange(1, n_concursos + 1, dtype=np.int64))
+    df.insert(1, "data", pd.Timestamp("1996-03-11") + pd.to_timedelta(np.arange(n_concursos) // 3, unit="D"))
+    return df
+
+
+def planilha_caixa(spec: LotterySpec, n_concursos: int) -> bytes:
+    """XLSX sintético no layout da Caixa: data dd/mm/aaaa em texto e colunas extras depois das bolas."""
+    from openpyxl import Workbook
+
+    df = historico_sintetico(spec, n_concursos, seed=5)
+    faixas = spec.faixas_premio or tuple(range(spec.n_dezenas_sorteio, spec.n_dezenas_sorteio - 3, -1))
+    extras = (
+        [f"Ganhadores {k} acertos" for k in faixas]
+        + ["Cidade / UF"]
+        + [f"Rateio {k} acertos" for k in faixas]
+        + ["Acumulado", "Arrecadação Total", "Estimativa Prêmio", "Acumulado Especial", "Observação"]
+    )
+    rng = np.random.default_rng(6)
+    wb = Workbook()
+    ws = wb.active
+    ws.append(list(COLUNAS_XLSX[spec.modalidade]) + extras)
+    dezenas = df[[f"d{i}" for i in range(1, spec.n_dezenas_sorteio + 1)]].to_numpy()
+    for conc, data, bolas in zip(df["concurso"].tolist(), df["data"].dt.strftime("%d/%m/%Y"), dezenas.tolist()):
+        ganhadores = rng.integers(0, 5, len(faixas)).tolist()
+        ws.append(
+            [conc, data, *bolas, *ganhadores, "SÃO PAULO/SP"]
+            + [f"R${v:,.2f}" for v in rng.uniform(5, 2e6, len(faixas))]
+            + ["R$0,00", "R$12.345.678,00", "R$1.700.000,00", "R$0,00", ""]
+        )
+    buf = BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+def cronometrar(fn: Callable[[], object], repeticoes: int = 3) -> float:
+    """Melhor tempo (s) de `repeticoes` execuções."""
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        fn()
+        melhor = min(melhor, time.perf_counter() - t0)
+    return melhor
+
+
+# Versões antigas (iterrows) das análises: referência de tempo em bench_analytics
+def atraso_legado(freq_df: pd.DataFrame, df: pd.DataFrame, n_dezenas_sorteio: int, n_universo: int) -> pd.DataFrame:
+    dezenas_cols = [f"d{i}" for i in range(1, n_dezenas_sorteio + 1)]
+    ultimo: dict[int, int] = {}
+    for _, row in df[["concurso"] + dezenas_cols].iterrows():
+        conc = int(row["concurso"])
+        for d in row[dezenas_cols]:
+            ultimo[int(d)] = conc
+
+    max_conc = int(df["concurso"].max())
+    linhas = []
+    for dezena in range(1, n_universo + 1):
+        fr = int(freq_df.loc[freq_df["dezena"] == dezena, "frequencia"].iloc[0])
+        ult = ultimo.get(dezena)
+        linhas.append(
+            {"dezena": dezena, "frequencia": fr, "ultimo_concurso": ult, "atraso_atual": (None if ult is None else max_conc - ult)}
+        )
+    return pd.DataFrame(linhas)
+
+
+def padroes_legado(df: pd.DataFrame, n_dezenas_sorteio: int, limite_baixo: int):
+    dezenas_cols = [f"d{i}" for i in range(1, n_dezenas_sorteio + 1)]
+    registros = []
+    for _, row in df[["concurso"] + dezenas_cols].iterrows():
+        dezenas = [int(row[c]) for c in dezenas_cols]
+        pares = sum(1 for d in dezenas if d % 2 == 0)
+        impares = len(dezenas) - pares
+        baixos = sum(1 for d in dezenas if 1 <= d <= limite_baixo)
+        altos = len(dezenas) - baixos
+        registros.append({"concurso": int(row["concurso"]), "pares": pares, "impares": impares, "baixos": baixos, "altos": altos})
+
+    dfp = pd.DataFrame(registros)
+    dist_pi = dfp.groupby(["pares", "impares"]).size().reset_index(name="qtd").sort_values("qtd", ascending=False).reset_index(drop=True)
+    dist_ba = dfp.groupby(["baixos", "altos"]).size().reset_index(name="qtd").sort_values("qtd", ascending=False).reset_index(drop=True)
+    return dfp, dist_pi, dist_ba
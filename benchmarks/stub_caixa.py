@@ -0,0 +1,131 @@
+"""
+Servidor HTTP local que imita o download da Caixa (planilha por ?modalidade=), com ETag,
+Last-Modified e 304; usado por `bench_http` e para testar o app sem rede.
+
+Uso: python -m benchmarks.stub_caixa [--porta 8765] [--draws 3500] [--sem-validadores] [--atraso 0.5]
+     LOTTERY_HELPER_DOWNLOAD_URL=http://127.0.0.1:8765/download streamlit run app_streamlit.py
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+class StubCaixa:
+    """`with StubCaixa({"Lotofácil": xlsx}) as srv: os.environ[DOWNLOAD_URL_ENV] = srv.url`"""
+
+    def __init__(self, planilhas: dict[str, bytes], *, validadores: bool = True, atraso: float = 0.0, porta: int = 0):
+        self.validadores = validadores
+        self.atraso = atraso
+        self.requisicoes = 0
+        self.nao_modificado = 0
+        self.bytes_enviados = 0
+        self._lock = threading.Lock()
+        self._planilhas: dict[str, tuple[bytes, str, float]] = {}
+        for mod, conteudo in planilhas.items():
+            self.publicar(mod, conteudo)
+        self._srv = ThreadingHTTPServer(("127.0.0.1", porta), self._handler())
+        self._srv.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, porta = self._srv.server_address[:2]
+        return f"http://{host}:{porta}/download"
+
+    def publicar(self, mod: str, conteudo: bytes) -> None:
+        """Troca a planilha servida; ETag = hash do conteúdo, Last-Modified = agora."""
+        with self._lock:
+            self._planilhas[mod] = (conteudo, f'"{hashlib.sha256(conteudo).hexdigest()[:32]}"', time.time())
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                mod = parse_qs(urlsplit(self.path).query).get("modalidade", [""])[0]
+                with stub._lock:
+                    stub.requisicoes += 1
+                    item = stub._planilhas.get(mod)
+                if stub.atraso:
+                    time.sleep(stub.atraso)
+                if item is None:
+                    self.send_error(404, f"modalidade desconhecida: {mod}")
+                    return
+
+                conteudo, etag, modificado = item
+                if stub.validadores and self._nao_modificado(etag, modificado):
+                    with stub._lock:
+                        stub.nao_modificado += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+                self.send_header("Content-Length", str(len(conteudo)))
+                if stub.validadores:
+                    self.send_header("ETag", etag)
+                    self.send_header("Last-Modified", formatdate(modificado, usegmt=True))
+                self.end_headers()
+                self.wfile.write(conteudo)
+                with stub._lock:
+                    stub.bytes_enviados += len(conteudo)
+
+            def _nao_modificado(self, etag: str, modificado: float) -> bool:
+                # If-None-Match tem precedência sobre If-Modified-Since (RFC 9110)
+                inm = self.headers.get("If-None-Match")
+                if inm is not None:
+                    return etag in (t.strip() for t in inm.split(","))
+                ims = self.headers.get("If-Modified-Since")
+                if ims is None:
+                    return False
+                try:
+                    return int(modificado) <= parsedate_to_datetime(ims).timestamp()
+                except (TypeError, ValueError):
+                    return False
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        return Handler
+
+    def __enter__(self) -> StubCaixa:
+        self._thread = threading.Thread(target=self._srv.serve_forever, name="stub_caixa", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._srv.shutdown()
+        self._srv.server_close()
+
+
+def main() -> None:
+    from src.config import DOWNLOAD_URL_ENV, get_spec
+
+    from .common import planilha_caixa
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--porta", type=int, default=8765)
+    ap.add_argument("--draws", type=int, default=3_500)
+    ap.add_argument("--sem-validadores", action="store_true", help="responde sempre 200, sem ETag/Last-Modified")
+    ap.add_argument("--atraso", type=float, default=0.0, help="latência artificial por requisição (s)")
+    args = ap.parse_args()
+
+    planilhas = {mod: planilha_caixa(get_spec(mod), args.draws) for mod in ("Mega-Sena", "Lotofácil")}
+    with StubCaixa(planilhas, validadores=not args.sem_validadores, atraso=args.atraso, porta=args.porta) as srv:
+        print(f"{DOWNLOAD_URL_ENV}={srv.url}  (Ctrl+C para sair)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
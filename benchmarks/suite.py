@@ -0,0 +1,299 @@
+"""
+Suíte de benchmarks: geração, heurísticas, análises, ingestão (normalização) e exportação,
+com históricos sintéticos e pacotes de jogos em três escalas. Resultado em JSON; com
+--comparar, mostra a razão contra um baseline e sai com código 1 se houver regressão.
+
+Uso:
+  python -m benchmarks.suite [--escalas pequena media grande] [--filtro analytics] [--repeticoes 3]
+                             [--saida resultados.json] [--comparar baseline.json] [--tolerancia 0.15]
+
+Escalas (concursos / jogos): pequena 3k / 1k, media 100k / 100k, grande 1M / 1M.
+Funções com loop Python por jogo (filtrar_jogo, heurísticas por jogo, list[GameInfo]) rodam
+em no máximo LIMITE_LOOP jogos; o nº de itens medido vai no JSON.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Callable, Iterator
+
+import numpy as np
+import pandas as pd
+
+from src import analytics, domain_lottery as dl, reports
+from src.atrasos import HistoricoAtrasos
+from src.config import LotterySpec, get_spec
+from src.coocorrencia import Coocorrencia
+from src.data_caixa import normalizar_lotofacil, normalizar_megasena
+from src.draw_index import DrawIndex
+from src.game_pack import GamePack
+from src.games_export import games_info_to_df
+from src.models import Restricoes
+
+from .common import historico_sintetico
+
+ESCALAS = {"pequena": (3_000, 1_000), "media": (100_000, 100_000), "grande": (1_000_000, 1_000_000)}
+LIMITE_LOOP = 100_000
+
+
+@dataclass(frozen=True)
+class Caso:
+    nome: str
+    fn: Callable[[], object]
+    itens: int
+
+
+@dataclass
+class Contexto:
+    spec: LotterySpec
+    historico: pd.DataFrame
+    idx: DrawIndex
+    freq: pd.DataFrame
+    jogos: np.ndarray  # (n_jogos, n_min) int8
+    pack: GamePack
+    jogos_df: pd.DataFrame
+
+
+def _contexto(spec: LotterySpec, n_concursos: int, n_jogos: int) -> Contexto:
+    df = historico_sintetico(spec, n_concursos, seed=1)
+    idx = DrawIndex.from_history(df, spec.n_dezenas_sorteio, spec.n_universo)
+    jogos = dl.gerar_matriz_aleatoria(n_jogos, spec.n_min, spec.n_universo, np.random.default_rng(2))
+    pack = GamePack.from_matrizes([("Aleatório puro", jogos)])
+    return Contexto(
+        spec=spec,
+        historico=df,
+        idx=idx,
+        freq=analytics.frequencias(df, spec.n_dezenas_sorteio, spec.n_universo, idx=idx),
+        jogos=jogos,
+        pack=pack,
+        jogos_df=games_info_to_df(pack, limite_baixo=spec.limite_baixo, dezenas_ult=set(idx.ultimas_dezenas())),
+    )
+
+
+def _bruto_caixa(ctx: Contexto) -> pd.DataFrame:
+    """Histórico no formato da planilha da Caixa (datas dd/mm/aaaa, BolaN), entrada de normalizar_*."""
+    df, s = ctx.historico, ctx.spec.n_dezenas_sorteio
+    col_data = "Data do Sorteio" if ctx.spec.modalidade == "Mega-Sena" else "Data Sorteio"
+    bruto = pd.DataFrame({"Concurso": df["concurso"], col_data: df["data"].dt.strftime("%d/%m/%Y")})
+    for i in range(1, s + 1):
+        bruto[f"Bola{i}"] = df[f"d{i}"]
+    return bruto
+
+
+# ---- casos por grupo
+def casos_geracao(ctx: Contexto) -> Iterator[Caso]:
+    spec, n = ctx.spec, len(ctx.jogos)
+    N, tam = spec.n_universo, spec.n_min
+    prop = (min(5, tam), min(5, tam - min(5, tam)), max(0, tam - 10))
+    limite = 3 if N > 30 else 5
+    rng = lambda: np.random.default_rng(3)  # noqa: E731
+
+    yield Caso("gerar_matriz_aleatoria", lambda: dl.gerar_matriz_aleatoria(n, tam, N, rng()), n)
+    yield Caso("gerar_balanceado_par_impar_matriz", lambda: dl.gerar_balanceado_par_impar_matriz(n, tam, N, rng()), n)
+    yield Caso("gerar_sem_sequencias_matriz", lambda: dl.gerar_sem_sequencias_matriz(n, tam, N, limite, rng()), n)
+    yield Caso(
+        "gerar_quentes_frias_mix_matriz", lambda: dl.gerar_quentes_frias_mix_matriz(n, tam, ctx.freq, N, prop, rng()), n
+    )
+    yield Caso("gerar_aleatorio_puro", lambda: dl.gerar_aleatorio_puro(n, tam, N, rng()), n)
+    yield Caso("gerar_balanceado_par_impar", lambda: dl.gerar_balanceado_par_impar(n, tam, N, rng()), n)
+    yield Caso("gerar_quentes_frias_mix", lambda: dl.gerar_quentes_frias_mix(n, tam, ctx.freq, N, prop, rng()), n)
+    yield Caso("gerar_sem_sequencias", lambda: dl.gerar_sem_sequencias(n, tam, N, limite, rng()), n)
+
+    # filtros folgados (aceitação alta) para medir o motor, não a raridade do filtro
+    r = Restricoes(
+        soma_min=100,
+        pares_min=1,
+        pares_max=tam - 1,
+        dezenas_ultimo=ctx.idx.ultimas_dezenas(),
+        max_rep_ultimo=tam - (2 if N > 30 else 5),
+    )
+    for estrategia in dl.ESTRATEGIAS:
+        yield Caso(
+            f"gerar_estrategia[{estrategia}]",
+            lambda e=estrategia: dl.gerar_estrategia(
+                e, n, tam, N, r, limite_baixo=spec.limite_baixo, freq_df=ctx.freq, proporcao=prop, limite_seq=limite, rng=rng()
+            ),
+            n,
+        )
+
+    # pacote: unicidade (máscaras) e sobreposição limitada (blocos de max_comum + 1 dezenas)
+    m = dl.gerar_matriz_aleatoria(n, tam, N, rng())
+    for max_comum in (None, tam - 2):
+        yield Caso(
+            f"MontadorPacote.adicionar[max_comum={max_comum}]",
+            lambda c=max_comum: dl.MontadorPacote(tam, N, c).adicionar(m),
+            n,
+        )
+
+
+def casos_heuristicas(ctx: Contexto) -> Iterator[Caso]:
+    lb = ctx.spec.limite_baixo
+    listas = dl.matriz_para_listas(ctx.jogos[:LIMITE_LOOP])
+    k = len(listas)
+    fixas, proib = listas[0][:1], [d for d in range(1, 4) if d not in listas[0][:1]]
+
+    yield Caso("filtrar_jogo", lambda: [dl.filtrar_jogo(j, fixas, proib, 100, 250) for j in listas], k)
+    yield Caso("pares_impares", lambda: [dl.pares_impares(j) for j in listas], k)
+    yield Caso("baixos_altos", lambda: [dl.baixos_altos(j, lb) for j in listas], k)
+    yield Caso("contar_primos", lambda: [dl.contar_primos(j) for j in listas], k)
+    yield Caso("tem_sequencia_longa", lambda: [dl.tem_sequencia_longa(j) for j in listas], k)
+
+    m, n = ctx.jogos, len(ctx.jogos)
+    r = Restricoes(dezenas_fixas=fixas, dezenas_proibidas=proib, soma_min=100, soma_max=250, pares_min=1, primos_max=4)
+    yield Caso("pares_matriz", lambda: dl.pares_matriz(m), n)
+    yield Caso("baixos_matriz", lambda: dl.baixos_matriz(m, lb), n)
+    yield Caso("primos_matriz", lambda: dl.primos_matriz(m), n)
+    yield Caso("seq_longa_matriz", lambda: dl.seq_longa_matriz(m), n)
+    yield Caso("mascara_restricoes", lambda: dl.mascara_restricoes(m, r, lb), n)
+
+
+def casos_analytics(ctx: Contexto) -> Iterator[Caso]:
+    df, s, N, lb = ctx.historico, ctx.spec.n_dezenas_sorteio, ctx.spec.n_universo, ctx.spec.limite_baixo
+    n = len(df)
+    yield Caso("DrawIndex.from_history", lambda: DrawIndex.from_history(df, s, N), n)
+    yield Caso("frequencias", lambda: analytics.frequencias(df, s, N), n)
+    yield Caso("atraso", lambda: analytics.atraso(ctx.freq, df, s, N), n)
+    yield Caso("padroes_par_impar_baixa_alta", lambda: analytics.padroes_par_impar_baixa_alta(df, s, lb), n)
+    yield Caso("somas", lambda: analytics.somas(df, s), n)
+    # replace(): índice novo sem as cached_property já calculadas (ocorrências por dezena entram no tempo)
+    yield Caso("Coocorrencia.from_index", lambda: Coocorrencia.from_index(replace(ctx.idx)), n)
+    yield Caso("HistoricoAtrasos.from_index", lambda: HistoricoAtrasos.from_index(replace(ctx.idx)), n)
+    yield Caso("DrawIndex.acumulado", lambda: DrawIndex.acumulado.func(ctx.idx), n)
+    # consulta de janela sobre o acumulado já pronto: independe do tamanho do histórico
+    ctx.idx.acumulado
+    yield Caso("frequencias[janela=100]", lambda: analytics.frequencias(df, s, N, janela=100, idx=ctx.idx), 1)
+
+
+def casos_ingestao(ctx: Contexto) -> Iterator[Caso]:
+    bruto = _bruto_caixa(ctx)
+    normalizar = normalizar_megasena if ctx.spec.modalidade == "Mega-Sena" else normalizar_lotofacil
+    yield Caso(normalizar.__name__, lambda: normalizar(bruto), len(bruto))
+
+
+def casos_exportacao(ctx: Contexto) -> Iterator[Caso]:
+    df, n = ctx.jogos_df, len(ctx.jogos_df)
+    lb, ult = ctx.spec.limite_baixo, set(ctx.idx.ultimas_dezenas())
+    infos = list(ctx.pack[:LIMITE_LOOP])
+
+    yield Caso("games_info_to_df[GamePack]", lambda: games_info_to_df(ctx.pack, limite_baixo=lb, dezenas_ult=ult), n)
+    yield Caso(
+        "games_info_to_df[list[GameInfo]]", lambda: games_info_to_df(infos, limite_baixo=lb, dezenas_ult=ult), len(infos)
+    )
+
+    def consumir(f) -> None:
+        with f:
+            while f.read(1 << 20):
+                pass
+
+    yield Caso("df_to_csv_bytes", lambda: reports.df_to_csv_bytes(df), n)
+    yield Caso("df_to_csv_file", lambda: consumir(reports.df_to_csv_file(df)), n)
+    yield Caso("df_to_jsonl_file", lambda: consumir(reports.df_to_jsonl_file(df)), n)
+    yield Caso("df_to_parquet_file", lambda: consumir(reports.df_to_parquet_file(df)), n)
+    yield Caso("df_to_arrow_file", lambda: consumir(reports.df_to_arrow_file(df)), n)
+    yield Caso("df_to_json_bytes", lambda: reports.df_to_json_bytes(df), n)
+    yield Caso("df_to_md_bytes", lambda: reports.df_to_md_bytes("Jogos", [("Jogos", df)]), n)
+
+
+GRUPOS = {
+    "geracao": casos_geracao,
+    "heuristicas": casos_heuristicas,
+    "analytics": casos_analytics,
+    "ingestao": casos_ingestao,
+    "exportacao": casos_exportacao,
+}
+
+
+# ---- execução
+def medir(fn: Callable[[], object], repeticoes: int) -> list[float]:
+    tempos = []
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        fn()
+        tempos.append(time.perf_counter() - t0)
+    return tempos
+
+
+def rodar(escalas: list[str], filtro: str | None, repeticoes: int) -> dict[str, dict]:
+    resultados: dict[str, dict] = {}
+    for escala in escalas:
+        n_concursos, n_jogos = ESCALAS[escala]
+        for mod in ("Mega-Sena", "Lotofácil"):
+            ctx = _contexto(get_spec(mod), n_concursos, n_jogos)
+            for grupo, gerar_casos in GRUPOS.items():
+                for caso in gerar_casos(ctx):
+                    chave = f"{escala}/{mod}/{grupo}/{caso.nome}"
+                    if filtro and filtro not in chave:
+                        continue
+                    tempos = medir(caso.fn, repeticoes)
+                    resultados[chave] = {
+                        "melhor_s": min(tempos),
+                        "mediana_s": statistics.median(tempos),
+                        "itens": caso.itens,
+                        "us_por_item": min(tempos) / max(caso.itens, 1) * 1e6,
+                    }
+                    print(f"{chave:80s} {min(tempos):9.4f}s  ({caso.itens:,} itens)", flush=True)
+    return resultados
+
+
+def meta(args: argparse.Namespace) -> dict:
+    return {
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "plataforma": platform.platform(),
+        "cpus": os.cpu_count(),
+        "escalas": args.escalas,
+        "repeticoes": args.repeticoes,
+    }
+
+
+def comparar(atual: dict[str, dict], baseline: dict[str, dict], tolerancia: float) -> int:
+    """Imprime a razão atual/baseline (melhor tempo) por caso; devolve o nº de regressões."""
+    regressoes = 0
+    print(f"\n{'caso':80s} {'baseline':>9s} {'atual':>9s} {'razão':>7s}")
+    for chave in sorted(atual.keys() & baseline.keys()):
+        a, b = atual[chave]["melhor_s"], baseline[chave]["melhor_s"]
+        razao = a / b if b > 0 else float("inf")
+        marca = ""
+        if razao > 1 + tolerancia:
+            marca, regressoes = "  REGRESSÃO", regressoes + 1
+        elif razao < 1 / (1 + tolerancia):
+            marca = "  melhora"
+        print(f"{chave:80s} {b:9.4f} {a:9.4f} {razao:6.2f}x{marca}")
+    for chave in sorted(baseline.keys() - atual.keys()):
+        print(f"{chave:80s} (só no baseline)")
+    print(f"\n{regressoes} regressão(ões) acima de {tolerancia:.0%}")
+    return regressoes
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--escalas", nargs="+", choices=ESCALAS, default=["pequena"])
+    ap.add_argument("--filtro", help="só casos cuja chave contém este texto (ex.: analytics, Lotofácil)")
+    ap.add_argument("--repeticoes", type=int, default=3)
+    ap.add_argument("--saida", default="bench_resultados.json")
+    ap.add_argument("--comparar", help="JSON de uma execução anterior (baseline)")
+    ap.add_argument("--tolerancia", type=float, default=0.15, help="razão acima de 1+tol conta como regressão")
+    args = ap.parse_args()
+
+    resultados = rodar(args.escalas, args.filtro, args.repeticoes)
+    with open(args.saida, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta(args), "resultados": resultados}, f, ensure_ascii=False, indent=2)
+    print(f"\n{len(resultados)} casos -> {args.saida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            baseline = {k: v for k, v in json.load(f)["resultados"].items() if not args.filtro or args.filtro in k}
+        sys.exit(1 if comparar(resultados, baseline, args.tolerancia) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Linha de comando (sem Streamlit): `python -m lottery_helper --help`."""
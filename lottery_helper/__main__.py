@@ -0,0 +1,4 @@
+from lottery_helper.cli import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+"""
+CLI para rotinas em lote (cron): histórico, análises, geração, backtest e exportação.
+
+Não importa Streamlit; numpy/pandas/pyarrow só são importados dentro de cada subcomando,
+então `--help` e erros de argumento respondem sem carregar a pilha científica.
+Saídas vão para arquivo (gravado em `<destino>.tmp` e renomeado ao final) ou `-` (stdout).
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import IO, Iterator
+
+MODALIDADES = {"mega": "Mega-Sena", "mega-sena": "Mega-Sena", "lotofacil": "Lotofácil", "lotofácil": "Lotofácil"}
+ESTRATEGIAS_CLI = {
+    "aleatorio": "Aleatório puro",
+    "balanceado": "Balanceado par/ímpar",
+    "quentes-frias": "Quentes/Frias/Mix",
+    "sem-sequencias": "Sem sequências longas",
+}
+TABELAS = ("frequencias", "atraso", "padroes", "dist_par_impar", "dist_baixa_alta", "somas", "dist_soma")
+FORMATOS = ("csv", "jsonl", "parquet", "arrow")
+
+
+def _log(msg: str) -> None:
+    print(msg, file=sys.stderr, flush=True)
+
+
+def _modalidade(txt: str) -> str:
+    try:
+        return MODALIDADES[txt.lower()]
+    except KeyError:
+        raise argparse.ArgumentTypeError(f"modalidade inválida: {txt} (use mega ou lotofacil)") from None
+
+
+def _lista(txt: str) -> list[int]:
+    from src.ui import parse_lista
+
+    return parse_lista(txt)
+
+
+def _slug(mod: str) -> str:
+    return "megasena" if mod == "Mega-Sena" else "lotofacil"
+
+
+@contextmanager
+def _saida(destino: str) -> Iterator[IO[bytes]]:
+    """`-` = stdout; arquivo é escrito num .tmp e só substitui o destino se tudo der certo."""
+    if destino == "-":
+        yield sys.stdout.buffer
+        sys.stdout.buffer.flush()
+        return
+    tmp = destino + ".tmp"
+    try:
+        with open(tmp, "wb") as f:
+            yield f
+        os.replace(tmp, destino)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _formato(destino: str, formato: str | None) -> str:
+    if formato:
+        return formato
+    if destino == "-":
+        return "csv"
+    from src.reports import formato_tabela
+
+    return formato_tabela(destino)
+
+
+def _gravar(df, destino: str, formato: str | None) -> None:
+    from src.reports import write_table
+
+    fmt = _formato(destino, formato)
+    with _saida(destino) as f:
+        write_table(df, f, fmt)
+    if destino != "-":
+        _log(f"{destino}: {len(df):,} linhas ({fmt})")
+
+
+def _historico(mod: str, forcar: bool = False):
+    from src.data_caixa import load_history
+
+    return load_history(mod, forcar=forcar)
+
+
+# ---- subcomandos
+def cmd_fetch(args: argparse.Namespace) -> None:
+    for mod in args.modalidades:
+        df = _historico(mod, forcar=args.forcar)
+        _log(f"{mod}: {len(df):,} concursos (último {int(df['concurso'].max()) if len(df) else '-'})")
+
+
+def cmd_analytics(args: argparse.Namespace) -> None:
+    from src.analytics import padroes_par_impar_baixa_alta, somas
+    from src.analytics_state import sincronizar_state
+    from src.config import get_spec
+    from src.draw_index import DrawIndex
+
+    spec = get_spec(args.modalidade)
+    df = _historico(args.modalidade)
+    st = sincronizar_state(args.modalidade, df)
+    _, dist_pi, dist_ba = st.padroes()
+    _, dist_soma = st.somas()
+    # o estado só guarda a cauda das séries por concurso; os arquivos levam o histórico inteiro
+    tabelas = {
+        "frequencias": st.frequencias_df,
+        "atraso": st.atraso_df,
+        "padroes": lambda: padroes_par_impar_baixa_alta(
+            df,
+            spec.n_dezenas_sorteio,
+            spec.limite_baixo,
+            idx=DrawIndex.from_history(df, spec.n_dezenas_sorteio, spec.n_universo),
+        )[0],
+        "dist_par_impar": lambda: dist_pi,
+        "dist_baixa_alta": lambda: dist_ba,
+        "somas": lambda: somas(df, spec.n_dezenas_sorteio)[0],
+        "dist_soma": lambda: dist_soma,
+    }
+    os.makedirs(args.dir, exist_ok=True)
+    for nome in args.tabelas or TABELAS:
+        destino = os.path.join(args.dir, f"{nome}_{_slug(args.modalidade)}.{args.formato}")
+        _gravar(tabelas[nome](), destino, args.formato)
+
+
+def cmd_gerar(args: argparse.Namespace) -> None:
+    import numpy as np
+
+    from src.config import get_spec
+    from src.draw_index import DrawIndex
+    from src.analytics import frequencias
+    from src.domain_lottery import MontadorPacote, gerar_estrategia
+    from src.game_pack import GamePack
+    from src.games_export import games_info_to_df
+    from src.models import Restricoes
+    from src.ui import validar_dezenas
+
+    spec = get_spec(args.modalidade)
+    tam = args.tam or spec.n_min
+    if not spec.n_min <= tam <= spec.n_max:
+        raise ValueError(f"Dezenas por jogo deve estar entre {spec.n_min} e {spec.n_max}.")
+    validar_dezenas(args.fixas, spec.n_universo, "Fixas")
+    validar_dezenas(args.proibidas, spec.n_universo, "Proibidas")
+
+    df = _historico(args.modalidade)
+    idx = DrawIndex.from_history(df, spec.n_dezenas_sorteio, spec.n_universo)
+    dezenas_ult = idx.ultimas_dezenas()
+    estrategia = ESTRATEGIAS_CLI[args.estrategia]
+
+    r = Restricoes(
+        dezenas_fixas=args.fixas,
+        dezenas_proibidas=args.proibidas,
+        soma_min=args.soma_min,
+        soma_max=args.soma_max,
+        pares_min=args.pares_min,
+        pares_max=args.pares_max,
+        primos_min=args.primos_min,
+        primos_max=args.primos_max,
+        baixos_min=args.baixos_min,
+        baixos_max=args.baixos_max,
+        max_rep_ultimo=args.max_rep_ultimo,
+        dezenas_ultimo=sorted(dezenas_ult),
+    )
+    freq_df = (
+        frequencias(df, spec.n_dezenas_sorteio, spec.n_universo, janela=args.janela, idx=idx)
+        if estrategia == "Quentes/Frias/Mix"
+        else None
+    )
+    quentes = min(args.quentes, tam)
+    frias = min(args.frias, tam - quentes)
+
+    t0 = time.perf_counter()
+    res = gerar_estrategia(
+        estrategia,
+        args.qtd,
+        tam,
+        spec.n_universo,
+        r,
+        limite_baixo=spec.limite_baixo,
+        freq_df=freq_df,
+        proporcao=(quentes, frias, tam - quentes - frias),
+        limite_seq=args.limite_seq,
+        rng=np.random.default_rng(args.seed),
+        pacote=MontadorPacote(tam, spec.n_universo, args.max_comum),
+    )
+    pack = GamePack.from_matrizes([(estrategia, res.jogos)])
+    _log(f"{len(pack):,} jogos em {time.perf_counter() - t0:.2f}s (aceitação {res.taxa_aceitacao:.1%})")
+    if res.saturado:
+        regra = "sem repetir jogos" if args.max_comum is None else f"com no máximo {args.max_comum} dezenas em comum"
+        _log(
+            f"aviso: pacote saturado em {len(pack):,} de {args.qtd:,} jogos: {regra}, quase nada do que a "
+            "estratégia gera (com os filtros) cabe mais; aumente --max-comum, afrouxe os filtros ou reduza -n"
+        )
+    elif len(pack) < args.qtd:
+        _log(f"aviso: só {len(pack):,} de {args.qtd:,} jogos atendem aos filtros")
+    if res.descartadas_pacote:
+        _log(f"{res.descartadas_pacote:,} candidatos descartados por repetir ou sobrepor jogos do pacote")
+
+    _gravar(games_info_to_df(pack, limite_baixo=spec.limite_baixo, dezenas_ult=dezenas_ult), args.saida, args.formato)
+
+
+def cmd_backtest(args: argparse.Namespace) -> None:
+    from src.backtest import backtest_df, resumo_faixas
+    from src.config import get_spec
+    from src.draw_index import DrawIndex
+    from src.games_export import games_df_to_pack
+    from src.parallel import backtest_paralelo
+    from src.reports import read_table
+
+    spec = get_spec(args.modalidade)
+    with open(args.jogos, "rb") as f:
+        pack = games_df_to_pack(read_table(f, args.jogos), n_universo=spec.n_universo)
+    df = _historico(args.modalidade)
+    idx = DrawIndex.from_history(df, spec.n_dezenas_sorteio, spec.n_universo)
+
+    t0 = time.perf_counter()
+    res = backtest_paralelo(pack, idx, workers=args.workers)
+    _log(f"{len(pack):,} jogos × {len(idx.concursos):,} concursos em {time.perf_counter() - t0:.2f}s")
+    for linha in resumo_faixas(res, spec).itertuples(index=False):
+        _log(f"  {linha.faixa}: {linha.ocorrencias:,} ocorrências, {linha.jogos_premiados:,} jogos")
+
+    _gravar(backtest_df(pack, res, spec), args.saida, args.formato)
+
+
+def cmd_export(args: argparse.Namespace) -> None:
+    _gravar(_historico(args.modalidade), args.saida, args.formato)
+
+
+# ---- argumentos
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(prog="python -m lottery_helper", description="Lottery Helper em lote (sem interface).")
+    sub = ap.add_subparsers(dest="comando", required=True)
+
+    def saida(p: argparse.ArgumentParser, padrao: str = "-") -> None:
+        p.add_argument("-o", "--saida", default=padrao, help="arquivo de saída ou - (stdout); formato pela extensão")
+        p.add_argument("--formato", choices=FORMATOS, help="força o formato (padrão: extensão; stdout = csv)")
+
+    p = sub.add_parser("fetch", help="atualiza o histórico local (Caixa só se houver sorteio novo)")
+    p.add_argument("modalidades", nargs="+", type=_modalidade)
+    p.add_argument("--forcar", action="store_true", help="consulta a Caixa mesmo sem sorteio novo esperado")
+    p.set_defaults(func=cmd_fetch)
+
+    p = sub.add_parser("analytics", help="frequências, atraso, padrões e somas (uma tabela por arquivo)")
+    p.add_argument("modalidade", type=_modalidade)
+    p.add_argument("--tabelas", nargs="+", choices=TABELAS, help="padrão: todas")
+    p.add_argument("-d", "--dir", default=".", help="diretório de saída")
+    p.add_argument("--formato", choices=FORMATOS, default="parquet")
+    p.set_defaults(func=cmd_analytics)
+
+    p = sub.add_parser("gerar", help="gera N jogos com uma estratégia e filtros")
+    p.add_argument("modalidade", type=_modalidade)
+    p.add_argument("-n", "--qtd", type=int, default=10)
+    p.add_argument("-e", "--estrategia", choices=ESTRATEGIAS_CLI, default="aleatorio")
+    p.add_argument("-t", "--tam", type=int, help="dezenas por jogo (padrão: mínimo da modalidade)")
+    p.add_argument("--seed", type=int)
+    p.add_argument("--fixas", type=_lista, default=[])
+    p.add_argument("--proibidas", type=_lista, default=[])
+    for nome in ("soma", "pares", "primos", "baixos"):
+        p.add_argument(f"--{nome}-min", type=int)
+        p.add_argument(f"--{nome}-max", type=int)
+    p.add_argument("--max-rep-ultimo", type=int)
+    p.add_argument("--quentes", type=int, default=5, help="Quentes/Frias/Mix: dezenas quentes")
+    p.add_argument("--frias", type=int, default=5, help="Quentes/Frias/Mix: dezenas frias")
+    p.add_argument("--janela", type=int, help="Quentes/Frias/Mix: frequências só dos últimos N concursos (padrão: todos)")
+    p.add_argument("--max-comum", type=int, help="máximo de dezenas em comum entre dois jogos (padrão: sem limite)")
+    p.add_argument("--limite-seq", type=int, default=3, help="Sem sequências longas: máximo permitido")
+    saida(p)
+    p.set_defaults(func=cmd_gerar)
+
+    p = sub.add_parser("backtest", help="confere um pacote exportado contra todo o histórico")
+    p.add_argument("modalidade", type=_modalidade)
+    p.add_argument("jogos", help="pacote exportado (parquet, arrow, feather, csv ou jsonl)")
+    p.add_argument("--workers", type=int, help="processos (padrão: LOTTERY_HELPER_WORKERS)")
+    saida(p)
+    p.set_defaults(func=cmd_backtest)
+
+    p = sub.add_parser("export", help="exporta o histórico")
+    p.add_argument("modalidade", type=_modalidade)
+    saida(p)
+    p.set_defaults(func=cmd_export)
+
+    return ap
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+    try:
+        args.func(args)
+    except ValueError as e:
+        sys.exit(f"erro: {e}")
+    except BrokenPipeError:
+        # saída em pipe fechada antes do fim (ex.: | head)
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
@@ -2,36 +2,53 @@ from __future__ import annotations
 
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 
-from src.analytics_cached import cached_frequencias
+from src.analytics_cached import (
+    cached_backtest,
+    cached_draw_index,
+    cached_frequencias,
+    cached_probabilidades_faixas,
+    history_version,
+)
+from src.backtest import backtest_df, resumo_faixas
 from src.config import Modalidade, get_spec
 from src.domain_lottery import (
-    baixos_altos,
-    contar_primos,
+    ESTRATEGIAS,
+    MontadorPacote,
     custo_total,
-    filtrar_jogo,
     formatar_jogo,
-    gerar_aleatorio_puro,
-    gerar_balanceado_par_impar,
-    gerar_quentes_frias_mix,
-    gerar_sem_sequencias,
-    pares_impares,
+    gerar_estrategia,
     preco_aposta,
-    prob_premio_maximo_aprox,
 )
-from src.games_export import games_info_to_df
+from src.game_pack import GamePack
+from src.games_export import games_df_to_pack, games_info_to_df
 from src.history_cached import load_history_cached
-from src.models import GameInfo
-from src.reports import build_html_report, df_to_csv_bytes, df_to_json_bytes, df_to_md_bytes
+from src.models import Restricoes
+from src.reports import (
+    as_download,
+    build_html_report,
+    df_to_arrow_file,
+    df_to_csv_bytes,
+    df_to_csv_file,
+    df_to_jsonl_file,
+    df_to_md_bytes,
+    df_to_parquet_file,
+    iter_csv_chunks,
+    iter_file_chunks,
+    iter_jsonl_chunks,
+    make_zip_file,
+    read_table,
+)
 from src.state import (
     clear_games,
     clear_history,
-    get_games_info,
+    get_game_pack,
     get_history,
     init_state,
-    set_games_info,
+    set_game_pack,
     set_history,
 )
 from src.ui import money_ptbr, parse_lista, validar_dezenas
@@ -89,6 +106,17 @@ if st.session_state.get("confirm_clear_games") is True:
     st.toast("Jogos limpos", icon="🧹")
     st.rerun()
 
+with st.sidebar.expander("Importar pacote", expanded=False):
+    arq = st.file_uploader("Parquet, Arrow/Feather ou CSV exportado", type=["parquet", "arrow", "feather", "csv"])
+    if arq is not None and st.button("Carregar jogos do arquivo"):
+        try:
+            set_game_pack(games_df_to_pack(read_table(arq, arq.name), n_universo=spec.n_universo))
+        except ValueError as e:
+            st.error(str(e))
+        else:
+            st.toast("Pacote importado", icon="📥")
+            st.rerun()
+
 height = table_prefs_sidebar(prefix="gerar")
 
 with st.sidebar.expander("Filtros (básico)", expanded=False):
@@ -154,6 +182,21 @@ with st.sidebar.expander("Filtros (heurísticas)", expanded=False):
         step=1,
     )
 
+with st.sidebar.expander("Diversidade do pacote", expanded=False):
+    st.caption("Jogos repetidos nunca entram no pacote.")
+    limitar_comum = st.checkbox("Limitar dezenas em comum entre jogos", value=False)
+    max_comum = st.number_input(
+        "Máx. dezenas em comum",
+        min_value=0,
+        max_value=spec.n_max - 1,
+        value=spec.n_min - 2,
+        step=1,
+        disabled=not limitar_comum,
+        help="Dois jogos quaisquer do pacote (inclusive no misto) dividem no máximo esta quantidade de dezenas.",
+    )
+max_comum_val = int(max_comum) if limitar_comum else None
+regra_pacote = "sem repetir jogos" if max_comum_val is None else f"com no máximo {max_comum_val} dezenas em comum"
+
 try:
     validar_dezenas(dezenas_fixas, spec.n_universo, "Fixas")
     validar_dezenas(dezenas_proib, spec.n_universo, "Proibidas")
@@ -177,13 +220,26 @@ if df is None:
                 st.error(f"Falha ao baixar/ler histórico: {e}")
                 st.stop()
 
-    set_history(modalidade, df)
+    df = set_history(modalidade, df)
     st.toast("Histórico carregado", icon="✅")
 
-freq_df = cached_frequencias(df, spec.n_dezenas_sorteio, spec.n_universo)
+idx = cached_draw_index(df, spec.n_dezenas_sorteio, spec.n_universo)
+freq_df = cached_frequencias(df, spec.n_dezenas_sorteio, spec.n_universo, _idx=idx)
+
+dezenas_ult = idx.ultimas_dezenas()
 
-last_row = df.sort_values("concurso").iloc[-1]
-dezenas_ult = {int(last_row[f"d{i}"]) for i in range(1, spec.n_dezenas_sorteio + 1)}
+JANELAS_QF = [None, 10, 25, 50, 100, 200, 500]
+
+
+def _janela_label(j: int | None) -> str:
+    return "Histórico todo" if j is None else f"Últimos {j} concursos"
+
+
+def freq_quentes_frias(janela: int | None):
+    # Quentes/frias sobre os últimos N concursos: subtração nas contagens acumuladas do índice
+    if janela is None:
+        return freq_df
+    return cached_frequencias(df, spec.n_dezenas_sorteio, spec.n_universo, int(janela), _idx=idx)
 
 header_cards(
     spec,
@@ -195,42 +251,31 @@ st.divider()
 # --------------------------
 # Filtros combinados
 # --------------------------
-def passa_heuristicas(j: list[int]) -> bool:
-    pares, _ = pares_impares(j)
-    if pares < int(pares_min) or pares > int(pares_max):
-        return False
-
-    primos = contar_primos(j)
-    if primos < int(primos_min) or primos > int(primos_max):
-        return False
-
-    baixos, _ = baixos_altos(j, spec.limite_baixo)
-    if baixos < int(baixos_min) or baixos > int(baixos_max):
-        return False
-
-    rep = len(set(j) & dezenas_ult)
-    if rep > int(max_rep_ultimo):
-        return False
-
-    return True
-
-
-def filtro_total(j: list[int]) -> bool:
-    if not filtrar_jogo(j, dezenas_fixas, dezenas_proib, soma_min_val, soma_max_val):
-        return False
-    return passa_heuristicas(j)
-
+restricoes = Restricoes(
+    dezenas_fixas=dezenas_fixas,
+    dezenas_proibidas=dezenas_proib,
+    soma_min=soma_min_val,
+    soma_max=soma_max_val,
+    pares_min=int(pares_min),
+    pares_max=int(pares_max),
+    primos_min=int(primos_min),
+    primos_max=int(primos_max),
+    baixos_min=int(baixos_min),
+    baixos_max=int(baixos_max),
+    max_rep_ultimo=int(max_rep_ultimo),
+    dezenas_ultimo=sorted(dezenas_ult),
+)
 
 # --------------------------
 # Geração
 # --------------------------
 modo = st.radio("Modo de geração", ["Uma estratégia", "Misto"], horizontal=True)
 
-estrategias = ["Aleatório puro", "Balanceado par/ímpar", "Quentes/Frias/Mix", "Sem sequências longas"]
+estrategias = list(ESTRATEGIAS)
 gerar = False
 gerar_misto = False
 
-games_info = get_games_info()
+pack = get_game_pack()
 usar_orcamento = float(orcamento_max) > 0
 
 if modo == "Uma estratégia":
@@ -264,6 +309,7 @@ if modo == "Uma estratégia":
         )
 
     q_quentes = q_frias = q_neutras = 0
+    janela_qf = None
     limite_seq = 3
 
     if estrategia == "Quentes/Frias/Mix":
@@ -271,6 +317,7 @@ if modo == "Uma estratégia":
         q_quentes = c1.number_input("Quentes", 0, int(tam), min(5, int(tam)))
         q_frias = c2.number_input("Frias", 0, int(tam), min(5, int(tam)))
         q_neutras = c3.number_input("Neutras", 0, int(tam), max(0, int(tam) - int(q_quentes) - int(q_frias)))
+        janela_qf = st.selectbox("Quentes/frias em", JANELAS_QF, format_func=_janela_label, key="janela_qf")
 
     if estrategia == "Sem sequências longas":
         limite_seq = st.slider("Máx. sequência", 2, min(10, int(tam)), 3)
@@ -379,6 +426,9 @@ else:
         mix_q_neutras = c3.number_input(
             "Neutras (misto)", 0, int(tam), max(0, int(tam) - int(mix_q_quentes) - int(mix_q_frias))
         )
+        mix_janela_qf = st.selectbox(
+            "Quentes/frias em (misto)", JANELAS_QF, format_func=_janela_label, key="mix_janela_qf"
+        )
 
     with st.expander("Parâmetros do Sem sequências longas (misto)", expanded=False):
         mix_limite_seq = st.slider("Máx. sequência (misto)", 2, min(10, int(tam)), 3)
@@ -390,141 +440,232 @@ else:
 # --------------------------
 if modo == "Uma estratégia" and gerar:
     with st.status("Gerando jogos...", expanded=False) as status:
-        if estrategia == "Aleatório puro":
-            jogos = gerar_aleatorio_puro(int(qtd), int(tam), spec.n_universo)
-        elif estrategia == "Balanceado par/ímpar":
-            jogos = gerar_balanceado_par_impar(int(qtd), int(tam), spec.n_universo)
-        elif estrategia == "Quentes/Frias/Mix":
-            jogos = gerar_quentes_frias_mix(
+        try:
+            res = gerar_estrategia(
+                estrategia,
                 int(qtd),
                 int(tam),
-                freq_df,
                 spec.n_universo,
-                (int(q_quentes), int(q_frias), int(q_neutras)),
+                restricoes,
+                limite_baixo=spec.limite_baixo,
+                freq_df=freq_quentes_frias(janela_qf),
+                proporcao=(int(q_quentes), int(q_frias), int(q_neutras)),
+                limite_seq=int(limite_seq),
+                pacote=MontadorPacote(int(tam), spec.n_universo, max_comum_val),
             )
-        else:
-            jogos = gerar_sem_sequencias(int(qtd), int(tam), spec.n_universo, int(limite_seq))
+        except ValueError as e:
+            status.update(label="Restrições inviáveis", state="error", expanded=True)
+            st.error(str(e))
+            st.stop()
 
-        jogos = [j for j in jogos if filtro_total(j)]
-        games_info = [GameInfo(jogo_id=i, estrategia=estrategia, dezenas=j) for i, j in enumerate(jogos, start=1)]
+        pack = GamePack.from_matrizes([(estrategia, res.jogos)])
 
-        status.update(label=f"Gerados {len(games_info)} jogos", state="complete")
-        st.toast(f"Gerados {len(games_info)} jogos", icon="🎲")
+        status.update(
+            label=f"Gerados {len(pack)} jogos (aceitação {res.taxa_aceitacao:.1%})",
+            state="complete" if len(pack) == int(qtd) else "error",
+        )
+        if res.saturado:
+            st.warning(
+                f"Pacote saturado em {len(pack)} de {int(qtd)} jogos: {regra_pacote}, "
+                "quase nada do que esta estratégia gera (com os filtros) cabe mais. Aumente o máximo em comum ou peça menos jogos."
+            )
+        elif len(pack) < int(qtd):
+            st.warning(f"Só {len(pack)} de {int(qtd)} jogos atendem aos filtros (aceitação {res.taxa_aceitacao:.2%}).")
+        if res.descartadas_pacote:
+            st.caption(f"{res.descartadas_pacote:,} candidatos descartados por repetir ou sobrepor jogos do pacote.")
+        st.toast(f"Gerados {len(pack)} jogos", icon="🎲")
 
 if modo == "Misto" and gerar_misto:
     with st.status("Gerando jogos (misto)...", expanded=False) as status:
-        itens: list[tuple[str, list[int]]] = []
-
-        if jm.get("Aleatório puro", 0) > 0:
-            jogos = gerar_aleatorio_puro(int(jm["Aleatório puro"]), int(tam), spec.n_universo)
-            itens += [("Aleatório puro", j) for j in jogos]
-
-        if jm.get("Balanceado par/ímpar", 0) > 0:
-            jogos = gerar_balanceado_par_impar(int(jm["Balanceado par/ímpar"]), int(tam), spec.n_universo)
-            itens += [("Balanceado par/ímpar", j) for j in jogos]
-
-        if jm.get("Quentes/Frias/Mix", 0) > 0:
-            jogos = gerar_quentes_frias_mix(
-                int(jm["Quentes/Frias/Mix"]),
-                int(tam),
-                freq_df,
-                spec.n_universo,
-                (int(mix_q_quentes), int(mix_q_frias), int(mix_q_neutras)),
-            )
-            itens += [("Quentes/Frias/Mix", j) for j in jogos]
+        partes: list[tuple[str, np.ndarray]] = []
+        taxas: dict[str, float] = {}
+        saturadas: list[str] = []
+        freq_qf = freq_quentes_frias(mix_janela_qf)
+        pacote = MontadorPacote(int(tam), spec.n_universo, max_comum_val)  # um só para todas as estratégias
+        params = {
+            "Quentes/Frias/Mix": (int(mix_q_quentes), int(mix_q_frias), int(mix_q_neutras)),
+        }
 
-        if jm.get("Sem sequências longas", 0) > 0:
-            jogos = gerar_sem_sequencias(
-                int(jm["Sem sequências longas"]), int(tam), spec.n_universo, int(mix_limite_seq)
+        try:
+            for estrat in estrategias:
+                n = int(jm.get(estrat, 0))
+                if n <= 0:
+                    continue
+                res = gerar_estrategia(
+                    estrat,
+                    n,
+                    int(tam),
+                    spec.n_universo,
+                    restricoes,
+                    limite_baixo=spec.limite_baixo,
+                    freq_df=freq_qf,
+                    proporcao=params.get(estrat, (0, 0, 0)),
+                    limite_seq=int(mix_limite_seq),
+                    pacote=pacote,
+                )
+                partes.append((estrat, res.jogos))
+                taxas[estrat] = res.taxa_aceitacao
+                if res.saturado:
+                    saturadas.append(estrat)
+        except ValueError as e:
+            status.update(label="Restrições inviáveis", state="error", expanded=True)
+            st.error(str(e))
+            st.stop()
+
+        pack = GamePack.from_matrizes(partes)
+
+        status.update(label=f"Gerados {len(pack)} jogos (misto)", state="complete")
+        st.caption("Aceitação por estratégia: " + " | ".join(f"{k}: {v:.1%}" for k, v in taxas.items()))
+        pedidos = sum(int(jm.get(e, 0)) for e in estrategias)
+        if saturadas:
+            st.warning(
+                f"Pacote saturado ({', '.join(saturadas)}): {regra_pacote}, "
+                f"só {len(pack)} de {pedidos} jogos couberam. Aumente o máximo em comum ou peça menos jogos."
             )
-            itens += [("Sem sequências longas", j) for j in jogos]
-
-        filtrados = [(estrat, j) for (estrat, j) in itens if filtro_total(j)]
-        games_info = [GameInfo(jogo_id=i, estrategia=estrat, dezenas=j) for i, (estrat, j) in enumerate(filtrados, start=1)]
-
-        status.update(label=f"Gerados {len(games_info)} jogos (misto)", state="complete")
-        st.toast(f"Gerados {len(games_info)} jogos (misto)", icon="🎲")
-
-# orçamento (corta a lista para caber no orçamento)
-if (gerar or gerar_misto) and games_info and float(orcamento_max) > 0:
-    dentro: list[GameInfo] = []
-    custo_acum = 0.0
-
-    for gi in games_info:
-        c = float(preco_aposta(len(gi.dezenas), spec.n_min, spec.preco_base))
-        if custo_acum + c > float(orcamento_max):
-            break
-        custo_acum += c
-        dentro.append(gi)
-
-    games_info = dentro
-    st.toast(f"Aplicado orçamento: {len(games_info)} jogos mantidos", icon="💰")
+        elif len(pack) < pedidos:
+            st.warning(f"Só {len(pack)} de {pedidos} jogos couberam no pacote (filtros e diversidade).")
+        if pacote.descartados:
+            st.caption(f"{pacote.descartados:,} candidatos descartados por repetir ou sobrepor jogos do pacote.")
+        st.toast(f"Gerados {len(pack)} jogos (misto)", icon="🎲")
+
+# orçamento (corta o pacote no primeiro jogo que estoura o orçamento)
+if (gerar or gerar_misto) and pack and float(orcamento_max) > 0:
+    acumulado = np.cumsum(pack.custos(spec.n_min, spec.preco_base))
+    pack = pack[: int(np.searchsorted(acumulado, float(orcamento_max), side="right"))]
+    st.toast(f"Aplicado orçamento: {len(pack)} jogos mantidos", icon="💰")
 
 if gerar or gerar_misto:
-    set_games_info(games_info)
+    set_game_pack(pack)
 
 # --------------------------
 # Tabs
 # --------------------------
-tab1, tab2, tab3 = st.tabs(["Jogos", "Tabela/Exportar", "Relatório"])
+tab1, tab2, tab3, tab4 = st.tabs(["Jogos", "Tabela/Exportar", "Relatório", "Backtest"])
+
+if pack:
+    # Probabilidade exata por faixa (união dos sorteios cobertos), calculada 1x por pacote.
+    # Faixas caras (pacotes grandes) saem só com a cota superior até o usuário pedir a exata
+    faixas_completas = st.session_state.get("faixas_exatas") == pack.chave()
+    with st.spinner("Calculando probabilidades por faixa..."):
+        faixas_df = cached_probabilidades_faixas(pack.chave(), modalidade, pack, faixas_completas)
+    faixa_max = spec.nome_faixa(spec.n_dezenas_sorteio)
+    chance_txt = faixas_df["chance"].iloc[0]
+    faixas_show = pd.DataFrame(
+        {
+            "Faixa": faixas_df["faixa"],
+            "Chance (≥1 prêmio)": faixas_df["chance"],
+            "Probabilidade": [
+                f"{p:.6%}" if exata else f"≤ {cota:.6%}"
+                for p, cota, exata in zip(faixas_df["probabilidade"], faixas_df["cota_superior"], faixas_df["exata"])
+            ],
+            "Bilhetes premiados (esperado)": faixas_df["esperado_bilhetes"].round(4),
+            "Apostas premiadas (esperado)": faixas_df["esperado_premios"].round(4),
+        }
+    )
 
 with tab1:
-    if not games_info:
+    if not pack:
         st.info("Gere jogos para exibir.")
     else:
-        jogos = [gi.dezenas for gi in games_info]
-        ct = custo_total(jogos, spec.n_min, spec.preco_base)
-        p = prob_premio_maximo_aprox(jogos, spec.n_min, spec.comb_target)
-        chance_txt = ("NA" if p <= 0 else f"1 em {1/p:,.0f}".replace(",", "."))
+        ct = custo_total(pack, spec.n_min, spec.preco_base)
 
         m1, m2, m3, m4 = st.columns(4)
-        m1.metric("Jogos", len(games_info))
+        m1.metric("Jogos", len(pack))
         m2.metric("Custo estimado", money_ptbr(ct))
-        m3.metric("Chance aprox.", chance_txt)
-        m4.metric("Média dezenas/jogo", f"{sum(len(j) for j in jogos) / len(jogos):.1f}")
-
-        preview = games_info[:100]
-        if len(games_info) > 100:
+        m3.metric(f"Chance ({faixa_max})", chance_txt)
+        m4.metric("Média dezenas/jogo", f"{pack.tamanhos.mean():.1f}")
+
+        st.caption("Probabilidades exatas do pacote por faixa (jogos sobrepostos não são contados duas vezes).")
+        df_show(st, faixas_show, height=min(height, 40 + 36 * len(faixas_show)))
+        if not faixas_df["exata"].all():
+            st.caption("Faixas com “até”/“≤”: cota superior (soma das chances por bilhete); a união exata deste pacote é cara.")
+            if st.button("Calcular probabilidades exatas (pode demorar)"):
+                st.session_state["faixas_exatas"] = pack.chave()
+                st.rerun()
+
+        preview = pack[:100]
+        if len(pack) > 100:
             st.caption("Mostrando os 100 primeiros jogos. Use a aba Tabela/Exportar para paginação/CSV.")
 
         for gi in preview:
             st.code(f"{gi.jogo_id:02d} - {gi.estrategia} - {formatar_jogo(gi.dezenas)}")
 
 with tab2:
-    if not games_info:
+    if not pack:
         st.info("Sem dados.")
     else:
-        df_out_all = games_info_to_df(games_info, limite_baixo=spec.limite_baixo, dezenas_ult=dezenas_ult)
+        df_out_all = games_info_to_df(pack, limite_baixo=spec.limite_baixo, dezenas_ult=dezenas_ult)
 
         st.subheader("Tabela (paginada)")
         df_page = paginate_df(df_out_all, key="gerar_out", default_page_size=50)
         df_show(st, df_page, height=height)
 
-        st.download_button(
-            "Baixar CSV (completo)",
-            data=df_to_csv_bytes(df_out_all),
-            file_name=f"jogos_{spec.modalidade}_{datetime.now().date()}.csv",
-            mime="text/csv",
-            use_container_width=True,
-        )
+        # Arquivos gerados só no clique (callable), em blocos, num temporário spooled
+        nome = f"jogos_{spec.modalidade}_{datetime.now().date()}"
+        c1, c2, c3 = st.columns(3)
+        with c1:
+            st.download_button(
+                "Baixar CSV (completo)",
+                data=lambda: as_download(df_to_csv_file(df_out_all)),
+                file_name=f"{nome}.csv",
+                mime="text/csv",
+                use_container_width=True,
+            )
+            st.download_button(
+                "Baixar Parquet",
+                data=lambda: as_download(df_to_parquet_file(df_out_all)),
+                file_name=f"{nome}.parquet",
+                mime="application/vnd.apache.parquet",
+                use_container_width=True,
+            )
+        with c2:
+            st.download_button(
+                "Baixar JSONL (completo)",
+                data=lambda: as_download(df_to_jsonl_file(df_out_all)),
+                file_name=f"{nome}.jsonl",
+                mime="application/x-ndjson",
+                use_container_width=True,
+            )
+            st.download_button(
+                "Baixar Arrow (IPC)",
+                data=lambda: as_download(df_to_arrow_file(df_out_all)),
+                file_name=f"{nome}.arrow",
+                mime="application/vnd.apache.arrow.file",
+                use_container_width=True,
+            )
+        with c3:
+            st.download_button(
+                "Baixar tudo (ZIP)",
+                data=lambda: as_download(
+                    make_zip_file(
+                        [
+                            (f"jogos_{spec.modalidade}.csv", iter_csv_chunks(df_out_all)),
+                            (f"jogos_{spec.modalidade}.jsonl", iter_jsonl_chunks(df_out_all)),
+                            (f"jogos_{spec.modalidade}.parquet", iter_file_chunks(df_to_parquet_file(df_out_all))),
+                            (f"jogos_{spec.modalidade}.arrow", iter_file_chunks(df_to_arrow_file(df_out_all))),
+                        ]
+                    )
+                ),
+                file_name=f"{nome}.zip",
+                mime="application/zip",
+                use_container_width=True,
+            )
+        st.caption("Parquet/Arrow/CSV exportados aqui podem ser recarregados em “Importar pacote” na barra lateral.")
 
 with tab3:
-    if not games_info:
+    if not pack:
         st.info("Gere jogos para habilitar o relatório.")
     else:
-        df_out_all = games_info_to_df(games_info, limite_baixo=spec.limite_baixo, dezenas_ult=dezenas_ult)
+        df_out_all = games_info_to_df(pack, limite_baixo=spec.limite_baixo, dezenas_ult=dezenas_ult)
 
-        jogos = [gi.dezenas for gi in games_info]
-        ct = custo_total(jogos, spec.n_min, spec.preco_base)
-        p = prob_premio_maximo_aprox(jogos, spec.n_min, spec.comb_target)
-        chance_txt = ("NA" if p <= 0 else f"1 em {1/p:,.0f}".replace(",", "."))
+        ct = custo_total(pack, spec.n_min, spec.preco_base)
 
         resumo = {
             "Modalidade": spec.modalidade,
-            "Jogos": str(len(games_info)),
+            "Jogos": str(len(pack)),
             "Custo estimado": money_ptbr(ct),
-            "Chance aprox.": chance_txt,
-            "Dezenas/jogo": f"{min(len(j) for j in jogos)}–{max(len(j) for j in jogos)}",
+            **{f"Chance ({f})": c for f, c in zip(faixas_df["faixa"], faixas_df["chance"])},
+            "Dezenas/jogo": f"{pack.tamanhos.min()}–{pack.tamanhos.max()}",
         }
 
         filtros_txt = {
@@ -576,6 +717,7 @@ with tab3:
             generated_at=datetime.now(),
             summary={**resumo, **{f"Filtro: {k}": v for k, v in filtros_txt.items()}},
             tables=[
+                ("Faixas de prêmio", faixas_show),
                 ("Resumo por estratégia", by_estrat.reset_index()),
                 ("Jogos (amostra)", df_out_all.head(50)),
             ],
@@ -593,7 +735,7 @@ with tab3:
         with c2:
             st.download_button(
                 "CSV (jogos)",
-                data=df_to_csv_bytes(df_out_all),
+                data=lambda: as_download(df_to_csv_file(df_out_all)),
                 file_name=f"jogos_{spec.modalidade}_{datetime.now().date()}.csv",
                 mime="text/csv",
                 use_container_width=True,
@@ -614,6 +756,7 @@ with tab3:
                     dfs=[
                         ("Resumo", pd.DataFrame([resumo])),
                         ("Filtros", pd.DataFrame([filtros_txt])),
+                        ("Faixas de prêmio", faixas_show),
                         ("Resumo por estratégia", by_estrat.reset_index()),
                         ("Jogos (Top 50)", df_out_all.head(50)),
                     ],
@@ -625,9 +768,43 @@ with tab3:
             )
         with c5:
             st.download_button(
-                "JSON",
-                data=df_to_json_bytes(df_out_all),
-                file_name=f"jogos_{spec.modalidade}_{datetime.now().date()}.json",
-                mime="application/json",
+                "JSONL",
+                data=lambda: as_download(df_to_jsonl_file(df_out_all)),
+                file_name=f"jogos_{spec.modalidade}_{datetime.now().date()}.jsonl",
+                mime="application/x-ndjson",
                 use_container_width=True,
-            )
\ No newline at end of file
+            )
+
+with tab4:
+    if not pack:
+        st.info("Gere jogos para rodar o backtest.")
+    else:
+        with st.spinner("Conferindo jogos contra o histórico..."):
+            bt = cached_backtest(pack.chave(), history_version(df), pack, idx)
+        bt_df = backtest_df(pack, bt, spec)
+        bt_resumo = resumo_faixas(bt, spec)
+
+        st.caption(
+            f"Cada jogo conferido contra os {bt.n_concursos} concursos do histórico "
+            "(contagem = concursos com exatamente esse número de acertos)."
+        )
+        b1, b2, b3 = st.columns(3)
+        b1.metric("Melhor resultado", f"{int(bt.melhor_acertos.max())} acertos")
+        b2.metric("Jogos que já teriam premiado", int((bt.hist_acertos[:, min(spec.faixas_premio):].sum(axis=1) > 0).sum()))
+        b3.metric("Concursos conferidos", bt.n_concursos)
+
+        st.subheader("Por faixa")
+        df_show(st, bt_resumo, height=min(height, 40 + 36 * len(bt_resumo)))
+
+        st.subheader("Melhor resultado por jogo")
+        st.bar_chart(bt_df["melhor_acertos"].value_counts().sort_index(), width="stretch", height=240)
+
+        st.subheader("Por jogo (paginado)")
+        df_show(st, paginate_df(bt_df, key="gerar_bt", default_page_size=50), height=height)
+        st.download_button(
+            "Baixar CSV (backtest)",
+            data=lambda: as_download(df_to_csv_file(bt_df)),
+            file_name=f"backtest_{spec.modalidade}_{datetime.now().date()}.csv",
+            mime="text/csv",
+            use_container_width=True,
+        )
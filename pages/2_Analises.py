@@ -5,16 +5,31 @@ from datetime import datetime
 import pandas as pd
 import streamlit as st
 
-from src.analytics_cached import cached_atraso, cached_frequencias, cached_padroes, cached_somas
-from src.charts_data import atraso_top_df, freq_top_df, soma_series_df
+from src.analytics_cached import (
+    cached_analytics_state,
+    cached_atraso,
+    cached_atrasos,
+    cached_coocorrencia,
+    cached_draw_index,
+    cached_frequencias,
+    cached_padroes,
+    cached_somas,
+    history_version,
+)
+from src.charts_data import atraso_top_df, freq_movel_df, freq_top_df, soma_series_df
 from src.config import Modalidade, get_spec
 from src.history_cached import load_history_cached
 from src.reports import (
+    as_download,
     build_html_report,
+    df_to_arrow_file,
     df_to_csv_bytes,
     df_to_json_bytes,
     df_to_md_bytes,
-    make_zip_bytes,
+    df_to_parquet_file,
+    iter_csv_chunks,
+    iter_file_chunks,
+    make_zip_file,
 )
 from src.state import clear_history, get_history, init_state, set_history
 from src.ui_components import header_cards
@@ -40,6 +55,10 @@ with st.sidebar.expander("Ações", expanded=True):
 
     with c2:
         if st.button("Limpar cache (somente análises)"):
+            cached_analytics_state.clear()
+            cached_coocorrencia.clear()
+            cached_atrasos.clear()
+            cached_draw_index.clear()
             cached_frequencias.clear()
             cached_atraso.clear()
             cached_padroes.clear()
@@ -59,30 +78,43 @@ if df is None:
                 st.error(f"Falha ao baixar/ler histórico: {e}")
                 st.stop()
 
-    set_history(modalidade, df)
+    df = set_history(modalidade, df)
     st.toast("Histórico carregado", icon="✅")
 
 header_cards(spec, df, extra_right="Tabelas paginadas + gráficos com fragment + relatórios.")
 st.divider()
 
-# Computa 1x (cacheado) e reutiliza
-freq_df = cached_frequencias(df, spec.n_dezenas_sorteio, spec.n_universo)
-atraso_df = cached_atraso(freq_df, df, spec.n_dezenas_sorteio, spec.n_universo)
-dfp, dist_pi, dist_ba = cached_padroes(df, spec.n_dezenas_sorteio, spec.limite_baixo)
-dfs_soma, dist_soma = cached_somas(df, spec.n_dezenas_sorteio)
+# Estado incremental (salvo ao lado do histórico): só concursos novos são processados
+an_state = cached_analytics_state(modalidade, history_version(df), df)
+freq_df = an_state.frequencias_df()
+atraso_df = an_state.atraso_df()
+dfp, dist_pi, dist_ba = an_state.padroes()
+dfs_soma, dist_soma = an_state.somas()
+idx = cached_draw_index(df, spec.n_dezenas_sorteio, spec.n_universo)
 
-tab1, tab2, tab3, tab4, tab5 = st.tabs(
-    ["Frequência/Atraso", "Padrões", "Somas", "Últimos", "Gráficos/Relatório"]
+tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs(
+    ["Frequência/Atraso", "Padrões", "Somas", "Coocorrência", "Atrasos", "Últimos", "Gráficos/Relatório"]
 )
 
 with tab1:
+    janela = st.selectbox(
+        "Janela de frequência",
+        options=[None, 10, 25, 50, 100, 200, 500, 1000],
+        format_func=lambda j: "Histórico todo" if j is None else f"Últimos {j} concursos",
+        key="anal_janela",
+    )
+    # Janela = subtração de duas linhas das contagens acumuladas do índice
+    freq_janela = freq_df if janela is None else cached_frequencias(
+        df, spec.n_dezenas_sorteio, spec.n_universo, int(janela), _idx=idx
+    )
+
     c1, c2 = st.columns(2)
 
-    c1.subheader("Frequência (total)")
+    c1.subheader("Frequência (total)" if janela is None else f"Frequência (últimos {janela})")
     df_show(
         c1,
         paginate_df(
-            freq_df.sort_values("frequencia", ascending=False),
+            freq_janela.sort_values("frequencia", ascending=False),
             key="anal_freq",
             default_page_size=50,
         ),
@@ -93,6 +125,21 @@ with tab1:
     atraso_sorted = atraso_df.sort_values(["atraso_atual", "frequencia"], ascending=[False, False])
     df_show(c2, paginate_df(atraso_sorted, key="anal_atraso", default_page_size=50), height=height)
 
+    with st.expander("Evolução da frequência (janela móvel)", expanded=False):
+        c1, c2 = st.columns([1, 3])
+        janela_movel = c1.selectbox(
+            "Janela móvel", options=[10, 25, 50, 100, 200, 500], index=2, key="anal_janela_movel"
+        )
+        padrao = freq_df.sort_values("frequencia", ascending=False)["dezena"].head(5).tolist()
+        dezenas_ev = c2.multiselect(
+            "Dezenas", options=list(range(1, spec.n_universo + 1)), default=padrao, key="anal_dezenas_ev"
+        )
+        if dezenas_ev and len(idx) >= int(janela_movel):
+            st.line_chart(freq_movel_df(idx, int(janela_movel), dezenas_ev), height=300)
+            st.caption(f"Concursos em que cada dezena saiu nos {janela_movel} concursos até cada ponto.")
+        elif dezenas_ev:
+            st.info("Histórico menor que a janela escolhida.")
+
 with tab2:
     c1, c2 = st.columns(2)
 
@@ -102,7 +149,7 @@ with tab2:
     c2.subheader("Baixa/Alta (distribuição)")
     df_show(c2, paginate_df(dist_ba, key="anal_ba", default_page_size=50), height=height)
 
-    with st.expander("Detalhado por concurso (pode ser pesado)"):
+    with st.expander(f"Detalhado por concurso (últimos {len(dfp)})"):
         df_show(st, paginate_df(dfp.sort_values("concurso"), key="anal_det", default_page_size=100), height=height)
 
 with tab3:
@@ -117,11 +164,77 @@ with tab3:
     df_show(c2, paginate_df(dist_soma, key="anal_dist_soma", default_page_size=50), height=height)
 
 with tab4:
+    # Pares (Xᵀ·X) e trios calculados 1x por versão do histórico; aqui só ranking/filtro
+    cooc = cached_coocorrencia(modalidade, history_version(df), idx)
+
+    c1, c2, c3, c4 = st.columns(4)
+    tipo = c1.radio("Conjunto", ["Pares", "Trios"], horizontal=True, key="cooc_tipo")
+    ordem = c2.radio("Ordem", ["Mais frequentes", "Menos frequentes"], horizontal=True, key="cooc_ordem")
+    com = c3.selectbox(
+        "Contendo a dezena",
+        options=[None, *range(1, spec.n_universo + 1)],
+        format_func=lambda d: "Qualquer" if d is None else str(d),
+        key="cooc_com",
+    )
+    limite = c4.selectbox("Top K", options=[50, 100, 500, 1000, "Todos"], index=1, key="cooc_k")
+
+    r = 2 if tipo == "Pares" else 3
+    ranking = cooc.ranking(
+        r, None if limite == "Todos" else int(limite), menos=ordem == "Menos frequentes", com=com
+    )
+    st.caption(
+        f"Esperado por {'par' if r == 2 else 'trio'} com sorteios uniformes: "
+        f"{cooc.esperado(r):,.1f} ocorrências em {cooc.n_concursos:,} concursos (razao = qtd / esperado)."
+    )
+    df_show(st, paginate_df(ranking, key="anal_cooc", default_page_size=50), height=height)
+
+    if com is not None:
+        st.caption(f"Concursos em que a dezena {com} saiu junto com cada outra")
+        st.bar_chart(cooc.pares_com(com).set_index("dezena")["qtd"], height=260)
+
+with tab5:
+    # Todos os atrasos entre aparições consecutivas, 1x por versão do histórico
+    hist_atrasos = cached_atrasos(modalidade, history_version(df), idx)
+    resumo_atrasos = hist_atrasos.resumo()
+
+    st.caption(
+        "Atraso = concursos sem sair entre duas aparições seguidas (0 = saiu em concursos consecutivos). "
+        "percentil_atual = % dos atrasos históricos da dezena menores que o atraso atual."
+    )
+    df_show(
+        st,
+        paginate_df(
+            resumo_atrasos.sort_values(["percentil_atual", "atraso_atual"], ascending=False),
+            key="anal_atrasos",
+            default_page_size=50,
+        ),
+        height=height,
+    )
+
+    c1, c2 = st.columns([1, 3])
+    dezena_at = c1.selectbox("Dezena", options=list(range(1, spec.n_universo + 1)), key="atrasos_dezena")
+    linha = resumo_atrasos.iloc[int(dezena_at) - 1]
+    if linha["qtd_atrasos"] > 0:
+        c1.metric(
+            "Atraso atual",
+            f"{linha['atraso_atual']:.0f}",
+            f"percentil {linha['percentil_atual']:.0f}%",
+            delta_color="off",
+        )
+        c1.metric("Máximo histórico", f"{linha['maximo']:.0f}")
+        c1.metric("Média / p90", f"{linha['media']:.1f} / {linha['p90']:.0f}")
+        with c2:
+            st.caption(f"Distribuição dos atrasos da dezena {dezena_at}")
+            st.bar_chart(hist_atrasos.histograma(int(dezena_at)).set_index("atraso")["qtd"], height=300)
+    else:
+        c2.info(f"A dezena {dezena_at} ainda não tem dois sorteios no histórico.")
+
+with tab6:
     qtd = st.selectbox("Quantidade", options=[10, 15, 20, 30, 50, 80], index=1, key="ult_qtd")
     ult = df.sort_values("concurso", ascending=False).head(int(qtd)).sort_values("concurso")
     df_show(st, ult, height=height)
 
-with tab5:
+with tab7:
     st.subheader("Configurações")
     c1, c2 = st.columns(2)
 
@@ -197,19 +310,40 @@ with tab5:
             max_rows=200,
         )
 
-        zip_bytes = make_zip_bytes(
-            [
-                (f"relatorio_{spec.modalidade}_analises.html", html_bytes),
-                (f"freq_{spec.modalidade}.csv", df_to_csv_bytes(freq_df)),
-                (f"atraso_{spec.modalidade}.csv", df_to_csv_bytes(atraso_df)),
-                (f"freq_{spec.modalidade}.json", df_to_json_bytes(freq_df)),
-                (f"relatorio_{spec.modalidade}_analises.md", md_bytes),
+        def membros_tabelas():
+            # Tabelas também em Parquet e Arrow IPC (tipadas, leitura direta em pandas/polars/duckdb).
+            # `an_state` só guarda a cauda exibida em tela; o detalhe por concurso exportado
+            # cobre o histórico inteiro (via índice) e só é calculado no clique
+            dfp_completo = cached_padroes(df, spec.n_dezenas_sorteio, spec.limite_baixo, _idx=idx)[0]
+            dfs_completo = cached_somas(df, spec.n_dezenas_sorteio)[0]
+            tabelas = [
+                ("freq", freq_df),
+                ("atraso", atraso_df),
+                ("padroes", dfp_completo),
+                ("dist_par_impar", dist_pi),
+                ("dist_baixa_alta", dist_ba),
+                ("somas", dfs_completo),
+                ("dist_soma", dist_soma),
             ]
-        )
+            for nome, t in tabelas:
+                yield (f"{nome}_{spec.modalidade}.parquet", iter_file_chunks(df_to_parquet_file(t)))
+                yield (f"{nome}_{spec.modalidade}.arrow", iter_file_chunks(df_to_arrow_file(t)))
 
+        # ZIP montado só no clique, membro a membro, num temporário spooled
         st.download_button(
             "Baixar tudo (ZIP)",
-            data=zip_bytes,
+            data=lambda: as_download(
+                make_zip_file(
+                    [
+                        (f"relatorio_{spec.modalidade}_analises.html", html_bytes),
+                        (f"freq_{spec.modalidade}.csv", iter_csv_chunks(freq_df)),
+                        (f"atraso_{spec.modalidade}.csv", iter_csv_chunks(atraso_df)),
+                        (f"freq_{spec.modalidade}.json", df_to_json_bytes(freq_df)),
+                        (f"relatorio_{spec.modalidade}_analises.md", md_bytes),
+                        *membros_tabelas(),
+                    ]
+                )
+            ),
             file_name=f"bundle_analises_{spec.modalidade}_{datetime.now().date()}.zip",
             mime="application/zip",
             use_container_width=True,
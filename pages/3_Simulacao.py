@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import pandas as pd
+import streamlit as st
+
+from src.analytics_cached import cached_draw_index, cached_frequencias
+from src.config import PREMIOS_FAIXA, Modalidade, get_spec, get_workers
+from src.history_cached import load_history_cached
+from src.simulacao import ESTRATEGIAS_SIM, ConfigSimulacao, faixas_df, resumo_df, simular
+from src.state import clear_history, get_history, get_simulacoes, init_state, set_history, set_simulacoes
+from src.ui import money_ptbr
+from src.ui_table_prefs import df_show, table_prefs_sidebar
+
+st.set_page_config(page_title="Simulação", page_icon="🧪", layout="wide")
+init_state()
+
+st.title("Simulação Monte Carlo de estratégias")
+st.caption(
+    "Cada jogo gerado pela estratégia enfrenta um sorteio aleatório independente. "
+    "Os acertos vão para um histograma fixo; a simulação para quando o IC 95% do retorno fica estreito."
+)
+
+modalidade: Modalidade = st.sidebar.radio("Modalidade", ["Mega-Sena", "Lotofácil"])
+spec = get_spec(modalidade)
+
+with st.sidebar.expander("Ações", expanded=True):
+    if st.button("Recarregar histórico (limpar cache de sessão)"):
+        clear_history(modalidade)
+        st.rerun()
+    if st.button("Limpar resultados"):
+        set_simulacoes(modalidade, [])
+        st.rerun()
+
+height = table_prefs_sidebar(prefix="sim")
+
+df = get_history(modalidade)
+if df is None:
+    with st.status("Carregando histórico...", expanded=False) as status:
+        try:
+            df = load_history_cached(modalidade)
+        except Exception as e:
+            status.update(label="Falha ao carregar histórico", state="error", expanded=True)
+            st.exception(e)
+            st.stop()
+        df = set_history(modalidade, df)
+        status.update(label="Histórico carregado", state="complete")
+
+idx = cached_draw_index(df, spec.n_dezenas_sorteio, spec.n_universo)
+
+# --------------------------
+# Parâmetros
+# --------------------------
+c1, c2 = st.columns(2)
+with c1:
+    estrategias = st.multiselect("Estratégias", list(ESTRATEGIAS_SIM), default=list(ESTRATEGIAS_SIM))
+    tam = st.slider("Dezenas por jogo", spec.n_min, spec.n_max, spec.n_min, key="sim_tam")
+    # Lotofácil: quase todo jogo de 15 tem sequência de 3 (aceitação ~0,3%)
+    limite_seq = st.slider("Máx. sequência (Sem sequências)", 2, min(10, int(tam)), 3 if spec.n_universo > 30 else 5)
+    janela_qf = st.selectbox(
+        "Quentes/frias em",
+        [None, 10, 25, 50, 100, 200, 500],
+        format_func=lambda j: "Histórico todo" if j is None else f"Últimos {j} concursos",
+        key="sim_janela_qf",
+    )
+with c2:
+    max_jogos = st.select_slider(
+        "Máx. de jogos simulados (por estratégia)",
+        options=[500_000, 1_000_000, 2_000_000, 5_000_000, 10_000_000, 20_000_000, 50_000_000],
+        value=2_000_000,
+    )
+    tol = st.number_input("Parar quando IC 95% do retorno/R$ ≤", 0.0005, 0.5, 0.005, step=0.001, format="%.4f")
+    seed = st.number_input("Semente", 0, 2**31 - 1, 42, step=1)
+    st.caption(f"Processos: {get_workers()} (variável LOTTERY_HELPER_WORKERS)")
+
+with st.expander("Tabela de prêmios (R$ por aposta simples)"):
+    padrao = PREMIOS_FAIXA[modalidade]
+    cols = st.columns(len(spec.faixas_premio))
+    premios = {
+        t: float(col.number_input(spec.nome_faixa(t), 0.0, 1e10, float(padrao.get(t, 0.0)), step=1.0, key=f"sim_premio_{t}"))
+        for t, col in zip(spec.faixas_premio, cols)
+    }
+
+freq_df = cached_frequencias(
+    df, spec.n_dezenas_sorteio, spec.n_universo, None if janela_qf is None else int(janela_qf), _idx=idx
+)
+q_quentes = min(5, int(tam))
+q_frias = min(5, int(tam) - q_quentes)
+proporcao = (q_quentes, q_frias, int(tam) - q_quentes - q_frias)
+
+if st.button("Simular", type="primary", disabled=not estrategias):
+    resultados = []
+    barra = st.progress(0.0, text="Simulando...")
+    for i, estrategia in enumerate(estrategias):
+        cfg = ConfigSimulacao(estrategia, int(tam), proporcao, int(limite_seq))
+
+        def progresso(res, i=i, estrategia=estrategia):
+            frac = (i + min(1.0, res.n_jogos / max_jogos)) / len(estrategias)
+            barra.progress(frac, text=f"{estrategia}: {res.n_jogos:,} jogos (IC ±{res.ic95:.4f})".replace(",", "."))
+
+        try:
+            resultados.append(
+                simular(
+                    cfg,
+                    spec,
+                    freq_df,
+                    premios=premios,
+                    max_jogos=int(max_jogos),
+                    min_jogos=min(1_000_000, int(max_jogos)),
+                    tol=float(tol),
+                    seed=int(seed),
+                    progresso=progresso,
+                )
+            )
+        except ValueError as e:
+            st.error(f"{estrategia}: {e}")
+    barra.empty()
+    set_simulacoes(modalidade, resultados)
+
+# --------------------------
+# Resultados
+# --------------------------
+resultados = get_simulacoes(modalidade)
+if not resultados:
+    st.info("Configure e clique em Simular.")
+    st.stop()
+
+resumo = resumo_df(resultados, spec)
+
+m1, m2, m3 = st.columns(3)
+m1.metric("Jogos simulados", f"{int(resumo['jogos_simulados'].sum()):,}".replace(",", "."))
+m2.metric("Custo por jogo", money_ptbr(float(resumo["custo_jogo"].iloc[0])))
+m3.metric("Retorno exato/R$ (sorteio uniforme)", f"{resumo['retorno_exato_uniforme'].iloc[0]:.4f}")
+
+st.subheader("Retorno por real apostado")
+st.bar_chart(resumo.set_index("estrategia")[["retorno_por_real"]], width="stretch", height=280)
+df_show(st, resumo, height=min(height, 40 + 36 * len(resumo)))
+st.caption(
+    "Contra sorteios uniformes nenhuma estratégia muda a distribuição de acertos: diferenças entre elas "
+    "devem caber no IC. O IC só considera faixas já observadas (prêmio máximo raro pode não aparecer)."
+)
+
+st.subheader("Distribuição por faixa")
+partes = []
+for r in resultados:
+    f = faixas_df(r, spec)
+    f.insert(0, "estrategia", r.config.estrategia)
+    partes.append(f)
+df_show(st, pd.concat(partes, ignore_index=True), height=height)
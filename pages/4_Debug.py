@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from dataclasses import asdict
+from datetime import datetime
+
+import streamlit as st
+
+from src import instrumentation
+from src.analytics_cached import cached_draw_index, cached_frequencias
+from src.config import Modalidade, get_spec
+from src.data_caixa import revalidando
+from src.history_cached import load_history_cached
+from src.history_registry import resumo as resumo_registro
+from src.history_store import carregar_validadores
+from src.state import clear_history, get_history, get_history_token, init_state, set_history
+from src.ui_pagination import paginate_df
+from src.ui_table_prefs import df_show, table_prefs_sidebar
+
+st.set_page_config(page_title="Debug", page_icon="🛠️", layout="wide")
+init_state()
+
+st.title("Debug / Diagnóstico")
+
+modalidade: Modalidade = st.sidebar.radio("Modalidade", ["Mega-Sena", "Lotofácil"])
+spec = get_spec(modalidade)
+
+with st.sidebar.expander("Ações", expanded=True):
+    if st.button("Recarregar histórico (limpar cache de sessão)"):
+        clear_history(modalidade)
+        st.rerun()
+
+height = table_prefs_sidebar(prefix="debug")
+
+df = get_history(modalidade)
+if df is None:
+    with st.status("Carregando histórico...", expanded=False) as status:
+        try:
+            df = load_history_cached(modalidade)
+        except Exception as e:
+            status.update(label="Falha ao carregar histórico", state="error", expanded=True)
+            st.exception(e)
+            st.stop()
+        df = set_history(modalidade, df)
+        status.update(label="Histórico carregado", state="complete")
+        st.toast("Histórico carregado", icon="✅")
+
+idx = cached_draw_index(df, spec.n_dezenas_sorteio, spec.n_universo)
+
+st.divider()
+
+tab1, tab2, tab3, tab4 = st.tabs(["Histórico", "Frequências", "Sanity checks", "Desempenho"])
+
+with tab1:
+    st.subheader("Histórico (paginado)")
+    df_sorted = df.sort_values("concurso", ascending=False)
+    df_page = paginate_df(df_sorted, key="dbg_hist", default_page_size=50)
+    df_show(st, df_page, height=height)
+
+with tab2:
+    st.subheader("Frequência (paginado)")
+    freq_df = cached_frequencias(df, spec.n_dezenas_sorteio, spec.n_universo, _idx=idx).sort_values(
+        "frequencia", ascending=False
+    )
+    df_show(st, paginate_df(freq_df, key="dbg_freq", default_page_size=50), height=height)
+
+with tab3:
+    st.subheader("Checagens rápidas")
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("Linhas", len(df))
+    c2.metric("Concurso min", int(df["concurso"].min()))
+    c3.metric("Concurso max", int(df["concurso"].max()))
+    c4.metric("Universo", f"1–{spec.n_universo}")
+
+    # Último sorteio
+    st.markdown("### Último sorteio")
+    last = df.sort_values("concurso").iloc[-1]
+    st.write({"concurso": int(last["concurso"]), "data": str(last["data"]), "dezenas": idx.dezenas_do_concurso(-1)})
+
+    st.markdown("### Histórico compartilhado (processo)")
+    st.caption(f"Token desta sessão: {get_history_token(modalidade)}")
+    df_show(st, resumo_registro(), height=160)
+
+    st.markdown("### Download condicional (Caixa)")
+    validadores = carregar_validadores(modalidade)
+    st.write(
+        {
+            "revalidando": revalidando(modalidade),
+            "validadores": None if validadores is None else asdict(validadores),
+        }
+    )
+
+with tab4:
+    st.subheader("Tempo por etapa (processo inteiro, todas as sessões)")
+    c1, c2 = st.columns([3, 1])
+    n_ult = c1.select_slider("Últimas medições", options=[50, 100, 200, 500, 1000, 5000], value=500)
+    if c2.button("Zerar medições"):
+        instrumentation.limpar()
+        st.rerun()
+
+    df_show(st, instrumentation.resumo_etapas(int(n_ult)), height=min(height, 420))
+
+    st.markdown("### Cache (acertos/faltas por wrapper)")
+    df_show(st, instrumentation.resumo_cache(), height=min(height, 360))
+
+    contadores = instrumentation.contadores()
+    if contadores:
+        st.markdown("### Contadores")
+        st.write(contadores)
+
+    with st.expander("Medições (mais recentes primeiro)"):
+        med = instrumentation.medicoes_df(int(n_ult)).iloc[::-1]
+        df_show(st, paginate_df(med, key="dbg_med", default_page_size=100), height=height)
+
+    st.download_button(
+        "Exportar JSON",
+        data=lambda: instrumentation.exportar_json(int(n_ult)),
+        file_name=f"instrumentacao_{datetime.now():%Y%m%d_%H%M%S}.json",
+        mime="application/json",
+    )
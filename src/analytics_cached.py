@@ -1,26 +1,60 @@
+"""
+Adaptador Streamlit das funções de `core_cached`. As análises ficam num só cache: o `memoizar`
+do núcleo (aquecido por `src.prefetch`), com o armazenamento dentro de st.cache_resource
+(`CacheStreamlit`), então o "Clear cache" do Streamlit também o esvazia. Os DataFrames
+devolvidos são compartilhados (copy-on-write do pandas: alterar um não mexe no cache).
+Probabilidades e backtest não passam pelo aquecimento: st.cache_data direto sobre a função pura.
+Acertos/faltas de cada wrapper vão para `instrumentation` (página Debug).
+"""
 from __future__ import annotations
 
-import pandas as pd
+import uuid
+from typing import Any, Hashable
+
 import streamlit as st
 
-from .analytics import atraso, frequencias, padroes_par_impar_baixa_alta, somas
+from . import core_cached as core
+from .cache import CacheMemoria, definir_fabrica
+from .history_registry import history_version  # noqa: F401 (reexport)
+from .instrumentation import cache_instrumentado
+
+
+@st.cache_resource(show_spinner=False)
+def _armazenamento(chave: str, max_entries: int, ttl: float | None) -> CacheMemoria:
+    return CacheMemoria(max_entries, ttl)
+
+
+class CacheStreamlit:
+    """Backend de `memoizar` cujo armazenamento vive em st.cache_resource (um por função memoizada)."""
+
+    def __init__(self, max_entries: int = 32, ttl: float | None = None):
+        self._args = (uuid.uuid4().hex, max_entries, ttl)
+
+    def get(self, chave: Hashable) -> Any:
+        return _armazenamento(*self._args).get(chave)
 
+    def set(self, chave: Hashable, valor: Any) -> None:
+        _armazenamento(*self._args).set(chave, valor)
 
-@st.cache_data(show_spinner=False, ttl=60 * 60, max_entries=32)
-def cached_frequencias(df: pd.DataFrame, n_dezenas: int, n_universo: int) -> pd.DataFrame:
-    return frequencias(df, n_dezenas, n_universo)
+    def clear(self) -> None:
+        _armazenamento(*self._args).clear()
 
 
-@st.cache_data(show_spinner=False, ttl=60 * 60, max_entries=32)
-def cached_atraso(freq_df: pd.DataFrame, df: pd.DataFrame, n_dezenas: int, n_universo: int) -> pd.DataFrame:
-    return atraso(freq_df, df, n_dezenas, n_universo)
+# trocar o backend descarta o que já estava em cache: `src.state` importa este módulo antes do aquecimento
+definir_fabrica(CacheStreamlit)
 
 
-@st.cache_data(show_spinner=False, ttl=60 * 60, max_entries=32)
-def cached_padroes(df: pd.DataFrame, n_dezenas: int, limite_baixo: int):
-    return padroes_par_impar_baixa_alta(df, n_dezenas, limite_baixo)
+def _dados(max_entries: int):
+    return st.cache_data(show_spinner=False, ttl=core.TTL_S, max_entries=max_entries)
 
 
-@st.cache_data(show_spinner=False, ttl=60 * 60, max_entries=32)
-def cached_somas(df: pd.DataFrame, n_dezenas: int):
-    return somas(df, n_dezenas)
+cached_draw_index = core.cached_draw_index
+cached_frequencias = core.cached_frequencias
+cached_atraso = core.cached_atraso
+cached_padroes = core.cached_padroes
+cached_somas = core.cached_somas
+cached_analytics_state = core.cached_analytics_state
+cached_coocorrencia = core.cached_coocorrencia
+cached_atrasos = core.cached_atrasos
+cached_probabilidades_faixas = cache_instrumentado(_dados(16), core.cached_probabilidades_faixas.__wrapped__)
+cached_backtest = cache_instrumentado(_dados(8), core.cached_backtest.__wrapped__)
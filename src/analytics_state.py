@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .analytics import SOMA_BINS, SOMA_LABELS
+from .config import LotterySpec, Modalidade, get_spec
+from .draw_index import matriz_incidencia
+from .history_store import gravar_npz_atomico, state_path
+from .instrumentation import medido
+
+# Séries por concurso (soma, pares, baixos) ficam só para a cauda do histórico
+RECENTES_MAX = 500
+
+
+def _vazio_int(n: int, fill: int = 0) -> np.ndarray:
+    return np.full(n, fill, dtype=np.int64)
+
+
+@dataclass
+class AnalyticsState:
+    """
+    Agregados das análises mantidos incrementalmente: `apply(novos)` custa O(novos concursos).
+    Tudo é histograma/contador de tamanho fixo, exceto a cauda `recentes_*` (limitada, só para
+    exibição em tela: exportações por concurso saem de `analytics` sobre o histórico inteiro).
+    """
+
+    n_universo: int
+    n_dezenas_sorteio: int
+    limite_baixo: int
+    n_concursos: int = 0
+    ultimo_concurso: int = -1
+    frequencias: np.ndarray = field(default_factory=lambda: _vazio_int(0))
+    ultimo_visto: np.ndarray = field(default_factory=lambda: _vazio_int(0))
+    hist_pares: np.ndarray = field(default_factory=lambda: _vazio_int(0))
+    hist_baixos: np.ndarray = field(default_factory=lambda: _vazio_int(0))
+    hist_soma: np.ndarray = field(default_factory=lambda: _vazio_int(0))
+    ultimo_sorteio: np.ndarray = field(default_factory=lambda: _vazio_int(0))
+    recentes_concurso: np.ndarray = field(default_factory=lambda: _vazio_int(0))
+    recentes_soma: np.ndarray = field(default_factory=lambda: _vazio_int(0))
+    recentes_pares: np.ndarray = field(default_factory=lambda: _vazio_int(0))
+    recentes_baixos: np.ndarray = field(default_factory=lambda: _vazio_int(0))
+
+    @classmethod
+    def vazio(cls, spec: LotterySpec) -> "AnalyticsState":
+        n, N = spec.n_dezenas_sorteio, spec.n_universo
+        soma_max = sum(range(N - n + 1, N + 1))
+        return cls(
+            n_universo=N,
+            n_dezenas_sorteio=n,
+            limite_baixo=spec.limite_baixo,
+            frequencias=_vazio_int(N),
+            ultimo_visto=_vazio_int(N, -1),
+            hist_pares=_vazio_int(n + 1),
+            hist_baixos=_vazio_int(n + 1),
+            hist_soma=_vazio_int(soma_max + 1),
+            ultimo_sorteio=_vazio_int(n),
+        )
+
+    @classmethod
+    def from_history(cls, df: pd.DataFrame, spec: LotterySpec) -> "AnalyticsState":
+        st = cls.vazio(spec)
+        st.apply(df)
+        return st
+
+    # ---- atualização incremental
+    def apply(self, novos: pd.DataFrame) -> int:
+        """Incorpora concursos com número > `ultimo_concurso`. Retorna quantos entraram."""
+        novos = novos[novos["concurso"] > self.ultimo_concurso].sort_values("concurso")
+        if novos.empty:
+            return 0
+
+        n = self.n_dezenas_sorteio
+        bloco = novos[[f"d{i}" for i in range(1, n + 1)]].to_numpy(dtype=np.int64)
+        concursos = novos["concurso"].to_numpy(dtype=np.int64)
+
+        inc = matriz_incidencia(bloco, self.n_universo)
+        self.frequencias += inc.sum(axis=0, dtype=np.int64)
+
+        presente = inc.any(axis=0)
+        ult_pos = inc.shape[0] - 1 - inc[::-1].argmax(axis=0)
+        self.ultimo_visto = np.where(presente, concursos[ult_pos], self.ultimo_visto)
+
+        pares = (bloco % 2 == 0).sum(axis=1)
+        baixos = ((bloco >= 1) & (bloco <= self.limite_baixo)).sum(axis=1)
+        soma = bloco.sum(axis=1)
+        self.hist_pares += np.bincount(pares, minlength=n + 1)
+        self.hist_baixos += np.bincount(baixos, minlength=n + 1)
+        self.hist_soma += np.bincount(soma, minlength=len(self.hist_soma))
+
+        self.recentes_concurso = np.concatenate([self.recentes_concurso, concursos])[-RECENTES_MAX:]
+        self.recentes_soma = np.concatenate([self.recentes_soma, soma])[-RECENTES_MAX:]
+        self.recentes_pares = np.concatenate([self.recentes_pares, pares])[-RECENTES_MAX:]
+        self.recentes_baixos = np.concatenate([self.recentes_baixos, baixos])[-RECENTES_MAX:]
+
+        self.ultimo_sorteio = np.sort(bloco[-1])
+        self.ultimo_concurso = int(concursos[-1])
+        self.n_concursos += len(concursos)
+        return len(concursos)
+
+    # ---- mesmas tabelas de src/analytics.py
+    def frequencias_df(self) -> pd.DataFrame:
+        return pd.DataFrame({"dezena": np.arange(1, self.n_universo + 1, dtype=np.int64), "frequencia": self.frequencias})
+
+    def atraso_df(self) -> pd.DataFrame:
+        out = self.frequencias_df()
+        ult = self.ultimo_visto
+        if (ult < 0).any():
+            ult = np.where(ult >= 0, ult, np.nan)
+        out["ultimo_concurso"] = ult
+        out["atraso_atual"] = self.ultimo_concurso - ult
+        return out
+
+    def padroes(self) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        """(detalhe dos últimos RECENTES_MAX concursos, dist. par/ímpar, dist. baixa/alta)."""
+        n = self.n_dezenas_sorteio
+        dfp = pd.DataFrame(
+            {
+                "concurso": self.recentes_concurso,
+                "pares": self.recentes_pares,
+                "impares": n - self.recentes_pares,
+                "baixos": self.recentes_baixos,
+                "altos": n - self.recentes_baixos,
+            }
+        )
+
+        def dist(hist: np.ndarray, a: str, b: str) -> pd.DataFrame:
+            k = np.flatnonzero(hist)
+            d = pd.DataFrame({a: k, b: n - k, "qtd": hist[k]})
+            return d.sort_values("qtd", ascending=False).reset_index(drop=True)
+
+        return dfp, dist(self.hist_pares, "pares", "impares"), dist(self.hist_baixos, "baixos", "altos")
+
+    def somas(self) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """(soma dos últimos RECENTES_MAX concursos, distribuição por faixa sobre todo o histórico)."""
+        dfs = pd.DataFrame({"concurso": self.recentes_concurso, "soma": self.recentes_soma})
+        dfs["faixa_soma"] = pd.cut(dfs["soma"], bins=SOMA_BINS, labels=SOMA_LABELS, right=True)
+
+        valores = np.flatnonzero(self.hist_soma)
+        faixas = pd.cut(pd.Series(valores), bins=SOMA_BINS, labels=SOMA_LABELS, right=True)
+        qtd = pd.Series(self.hist_soma[valores]).groupby(faixas, observed=False).sum()
+        dist = pd.DataFrame({"faixa_soma": qtd.index, "qtd": qtd.to_numpy(dtype=np.int64)})
+        return dfs, dist
+
+    # ---- serialização (.npz ao lado do histórico)
+    def salvar(self, path: Path) -> None:
+        gravar_npz_atomico(path, {f.name: np.asarray(getattr(self, f.name)) for f in fields(self)})
+
+    @classmethod
+    def carregar(cls, path: Path) -> "AnalyticsState | None":
+        if not path.exists():
+            return None
+        try:
+            with np.load(path) as z:
+                kw = {f.name: z[f.name] for f in fields(cls)}
+        except (OSError, KeyError, ValueError):
+            return None
+        for k in ("n_universo", "n_dezenas_sorteio", "limite_baixo", "n_concursos", "ultimo_concurso"):
+            kw[k] = int(kw[k])
+        return cls(**{k: (v.astype(np.int64) if isinstance(v, np.ndarray) else v) for k, v in kw.items()})
+
+
+def _consistente(st: AnalyticsState, df: pd.DataFrame, spec: LotterySpec) -> bool:
+    # O estado precisa ser um prefixo exato deste histórico (mesma contagem e mesmo último sorteio)
+    if (st.n_universo, st.n_dezenas_sorteio, st.limite_baixo) != (spec.n_universo, spec.n_dezenas_sorteio, spec.limite_baixo):
+        return False
+    if st.ultimo_concurso < 0:
+        return True
+    linha = df[df["concurso"] == st.ultimo_concurso]
+    if linha.empty or int((df["concurso"] <= st.ultimo_concurso).sum()) != st.n_concursos:
+        return False
+    dezenas = np.sort(linha[[f"d{i}" for i in range(1, spec.n_dezenas_sorteio + 1)]].to_numpy(dtype=np.int64)[-1])
+    return bool(np.array_equal(dezenas, st.ultimo_sorteio))
+
+
+@medido("analytics.estado_incremental")
+def sincronizar_state(mod: Modalidade, df: pd.DataFrame, cache_dir: Path | None = None) -> AnalyticsState:
+    """
+    Estado salvo + só os concursos que faltam. Reconstrói do zero se o estado salvo não
+    for um prefixo deste histórico (outra modalidade, store apagado/trocado etc.).
+    """
+    spec = get_spec(mod)
+    path = state_path(mod, cache_dir)
+    st = AnalyticsState.carregar(path)
+
+    if st is None or not _consistente(st, df, spec):
+        st = AnalyticsState.from_history(df, spec)
+        st.salvar(path)
+    elif st.apply(df[df["concurso"] > st.ultimo_concurso]):
+        st.salvar(path)
+    return st
@@ -0,0 +1,104 @@
+"""
+Distribuição histórica dos atrasos de cada dezena: quantos concursos ela ficou sem sair entre
+duas aparições consecutivas (mesma unidade de `atraso_atual`; 0 = saiu em concursos seguidos).
+
+Sai das linhas de ocorrência por dezena (`DrawIndex.ocorrencias`): um diff nos números de
+concurso, sem laço por linha. As estatísticas por dezena usam os atrasos ordenados dentro de
+cada grupo (CSR) e aritmética de índices, também sem laço por dezena.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .draw_index import DrawIndex
+from .instrumentation import medido
+
+PERCENTIS = (50, 75, 90, 95)
+
+
+@dataclass(frozen=True)
+class HistoricoAtrasos:
+    n_universo: int
+    atrasos: np.ndarray  # int64, agrupados por dezena e ordenados dentro do grupo
+    inicio: np.ndarray  # int64 (N + 1,): atrasos da dezena d em atrasos[inicio[d - 1]:inicio[d]]
+    atual: np.ndarray  # int64 (N,): atraso atual; -1 se a dezena nunca saiu
+
+    @classmethod
+    @medido("analytics.atrasos")
+    def from_index(cls, idx: DrawIndex) -> "HistoricoAtrasos":
+        n = idx.n_universo
+        linhas, inicio_oc = idx.ocorrencias
+        conc = idx.concursos[linhas]
+
+        # diff dentro de cada dezena: descarta os pares que cruzam a fronteira entre grupos
+        dezena = np.repeat(np.arange(n), np.diff(inicio_oc))
+        mesmo = dezena[1:] == dezena[:-1]
+        atrasos = (np.diff(conc) - 1)[mesmo]
+        grupo = dezena[1:][mesmo]
+        # ordena dentro de cada grupo: sort simples de uma chave composta (grupo já está em ordem)
+        escala = int(atrasos.max(initial=0)) + 1
+        atrasos = np.sort(grupo * escala + atrasos) - grupo * escala
+
+        inicio = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(grupo, minlength=n), out=inicio[1:])
+
+        ult = idx.ultimo_visto
+        ultimo = int(idx.concursos[-1]) if len(idx) else 0
+        atual = np.where(ult >= 0, ultimo - ult, -1).astype(np.int64)
+
+        out = cls(n, atrasos, inicio, atual)
+        for arr in (out.atrasos, out.inicio, out.atual):
+            arr.flags.writeable = False
+        return out
+
+    def _grupos(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # sentinela no fim: índices de grupos vazios continuam válidos (o valor é descartado)
+        return np.diff(self.inicio), self.inicio[:-1], np.append(self.atrasos, 0)
+
+    def _percentil(self, q: float) -> np.ndarray:
+        # interpolação linear (mesma regra de np.percentile) em cada grupo já ordenado
+        m, base, a = self._grupos()
+        pos = q / 100 * np.maximum(m - 1, 0)
+        lo = np.floor(pos).astype(np.int64)
+        hi = np.minimum(lo + 1, np.maximum(m - 1, 0))
+        v = a[base + lo] + (a[base + hi] - a[base + lo]) * (pos - lo)
+        return np.where(m > 0, v, np.nan)
+
+    def resumo(self) -> pd.DataFrame:
+        """
+        Por dezena: quantidade de atrasos fechados, média, máximo, percentis, atraso atual e
+        `percentil_atual` (% dos atrasos históricos menores que o atual).
+        """
+        m, base, a = self._grupos()
+        vazio = m == 0
+        soma = np.add.reduceat(a, base)
+        maximo = a[np.maximum(self.inicio[1:] - 1, 0)]
+
+        # menores que o atual: busca (lado esquerdo) na chave composta dezena/atraso, já ordenada
+        escala = int(self.atrasos.max(initial=0)) + 2
+        grupo = np.arange(self.n_universo, dtype=np.int64)
+        chave = np.repeat(grupo, m) * escala + self.atrasos
+        menores = np.searchsorted(chave, grupo * escala + np.clip(self.atual, 0, escala - 1)) - base
+
+        out = pd.DataFrame({"dezena": grupo + 1, "qtd_atrasos": m})
+        out["media"] = np.where(vazio, np.nan, soma / np.maximum(m, 1))
+        out["maximo"] = np.where(vazio, np.nan, maximo)
+        for q in PERCENTIS:
+            out[f"p{q}"] = self._percentil(q)
+        out["atraso_atual"] = np.where(self.atual >= 0, self.atual, np.nan)
+        out["percentil_atual"] = np.where(vazio | (self.atual < 0), np.nan, 100 * menores / np.maximum(m, 1))
+        return out
+
+    def de(self, dezena: int) -> np.ndarray:
+        """Atrasos fechados da dezena, ordenados."""
+        if not 1 <= dezena <= self.n_universo:
+            raise ValueError(f"Dezena {dezena} fora do universo 1–{self.n_universo}.")
+        return self.atrasos[self.inicio[dezena - 1] : self.inicio[dezena]]
+
+    def histograma(self, dezena: int) -> pd.DataFrame:
+        """Quantas vezes a dezena ficou exatamente `atraso` concursos sem sair."""
+        valores, qtd = np.unique(self.de(dezena), return_counts=True)
+        return pd.DataFrame({"atraso": valores, "qtd": qtd})
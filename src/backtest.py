@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterator, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .config import LotterySpec
+from .draw_index import DrawIndex, mascaras_matriz, popcount
+from .game_pack import GamePack
+from .models import GameInfo
+
+# Pares jogo×concurso por bloco: limita a matriz de acertos (uint8) + contagem (int64) em memória
+CHUNK_PARES = 4_000_000
+
+
+@dataclass(frozen=True)
+class ResultadoBacktest:
+    """
+    Resultado por jogo contra todo o histórico.
+    `hist_acertos[i, h]` = em quantos concursos o jogo i acertou exatamente h dezenas.
+    """
+
+    n_concursos: int
+    hist_acertos: np.ndarray  # int64 (n_jogos, s + 1)
+    melhor_acertos: np.ndarray  # int64 (n_jogos,)
+    melhor_concurso: np.ndarray  # int64 (n_jogos,): concurso mais recente com o melhor resultado; -1 se vazio
+
+    def __len__(self) -> int:
+        return int(self.hist_acertos.shape[0])
+
+    def contagem_faixa(self, acertos: int) -> np.ndarray:
+        return self.hist_acertos[:, acertos]
+
+
+def mascaras_jogos(jogos: Sequence[Sequence[int]] | np.ndarray | GamePack) -> np.ndarray:
+    """Jogos de tamanhos variados -> uint64 (n,). Linhas curtas são completadas com 0 (ignorado)."""
+    if isinstance(jogos, GamePack):
+        return mascaras_matriz(jogos.dezenas)
+    if isinstance(jogos, np.ndarray):
+        return mascaras_matriz(jogos)
+    if not jogos:
+        return np.zeros(0, dtype=np.uint64)
+    m = np.zeros((len(jogos), max(len(j) for j in jogos)), dtype=np.int64)
+    for i, j in enumerate(jogos):
+        m[i, : len(j)] = j
+    return mascaras_matriz(m)
+
+
+def iter_acertos(
+    mascaras: np.ndarray, sorteios: np.ndarray, chunk_pares: int = CHUNK_PARES
+) -> Iterator[tuple[slice, np.ndarray]]:
+    """Gera (fatia de jogos, acertos uint8 (jogos da fatia, concursos)) sem montar a matriz inteira."""
+    passo = max(1, chunk_pares // max(1, len(sorteios)))
+    for i in range(0, len(mascaras), passo):
+        bloco = slice(i, min(i + passo, len(mascaras)))
+        yield bloco, popcount(mascaras[bloco][:, None] & sorteios[None, :])
+
+
+def backtest_mascaras(
+    mascaras: np.ndarray,
+    sorteios: np.ndarray,
+    concursos: np.ndarray,
+    n_dezenas_sorteio: int,
+    chunk_pares: int = CHUNK_PARES,
+) -> ResultadoBacktest:
+    n, largura = len(mascaras), n_dezenas_sorteio + 1
+    hist = np.zeros((n, largura), dtype=np.int64)
+    melhor = np.zeros(n, dtype=np.int64)
+    melhor_concurso = np.full(n, -1, dtype=np.int64)
+
+    if len(sorteios):
+        for bloco, h in iter_acertos(mascaras, sorteios, chunk_pares):
+            c = h.shape[0]
+            # histograma por linha num bincount só: desloca cada linha para a sua faixa de `largura`
+            base = (np.arange(c, dtype=np.int64) * largura)[:, None]
+            hist[bloco] = np.bincount((h + base).ravel(), minlength=c * largura).reshape(c, largura)
+
+            mx = h.max(axis=1)
+            ult = h.shape[1] - 1 - (h[:, ::-1] == mx[:, None]).argmax(axis=1)
+            melhor[bloco] = mx
+            melhor_concurso[bloco] = concursos[ult]
+
+    return ResultadoBacktest(
+        n_concursos=int(len(sorteios)),
+        hist_acertos=hist,
+        melhor_acertos=melhor,
+        melhor_concurso=melhor_concurso,
+    )
+
+
+def backtest(jogos: Sequence[Sequence[int]] | np.ndarray | GamePack, idx: DrawIndex) -> ResultadoBacktest:
+    """Acertos de cada jogo em cada concurso do índice (AND + popcount), agregados por jogo."""
+    return backtest_mascaras(mascaras_jogos(jogos), idx.mascaras, idx.concursos, idx.n_dezenas_sorteio)
+
+
+def backtest_df(games_info: list[GameInfo] | GamePack, res: ResultadoBacktest, spec: LotterySpec) -> pd.DataFrame:
+    if isinstance(games_info, GamePack):
+        ids, estrategias = games_info.ids.astype(np.int64), games_info.estrategia_col()
+    else:
+        ids, estrategias = [gi.jogo_id for gi in games_info], [gi.estrategia for gi in games_info]
+    out = pd.DataFrame(
+        {
+            "jogo_id": ids,
+            "estrategia": estrategias,
+            "melhor_acertos": res.melhor_acertos,
+            "melhor_concurso": res.melhor_concurso,
+        }
+    )
+    for t in spec.faixas_premio:
+        out[spec.nome_faixa(t)] = res.contagem_faixa(t)
+    return out
+
+
+def resumo_faixas(res: ResultadoBacktest, spec: LotterySpec) -> pd.DataFrame:
+    """Totais do pacote por faixa: jogo×concurso premiados e jogos que já teriam premiado."""
+    linhas = []
+    for t in spec.faixas_premio:
+        c = res.contagem_faixa(t)
+        linhas.append(
+            {
+                "faixa": spec.nome_faixa(t),
+                "acertos": t,
+                "ocorrencias": int(c.sum()),
+                "jogos_premiados": int((c > 0).sum()),
+            }
+        )
+    return pd.DataFrame(linhas)
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import functools
+import hashlib
+import inspect
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Protocol
+
+from .instrumentation import registrar_cache
+
+# Sentinela de "não está no cache" (None é um valor válido)
+AUSENTE = object()
+
+
+class Cache(Protocol):
+    """Backend plugável de `memoizar`: um por função memoizada."""
+
+    def get(self, chave: Hashable) -> Any: ...  # valor ou AUSENTE
+
+    def set(self, chave: Hashable, valor: Any) -> None: ...
+
+    def clear(self) -> None: ...
+
+
+class CacheMemoria:
+    """LRU em memória com TTL opcional; seguro entre threads. Devolve o próprio objeto (sem cópia)."""
+
+    def __init__(self, max_entries: int = 32, ttl: float | None = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._dados: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, chave: Hashable) -> Any:
+        with self._lock:
+            item = self._dados.get(chave)
+            if item is None:
+                return AUSENTE
+            criado, valor = item
+            if self.ttl is not None and time.monotonic() - criado > self.ttl:
+                del self._dados[chave]
+                return AUSENTE
+            self._dados.move_to_end(chave)
+            return valor
+
+    def set(self, chave: Hashable, valor: Any) -> None:
+        with self._lock:
+            self._dados[chave] = (time.monotonic(), valor)
+            self._dados.move_to_end(chave)
+            while len(self._dados) > self.max_entries:
+                self._dados.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._dados.clear()
+
+
+class CacheNulo:
+    """Não guarda nada (benchmarks, testes de caminho frio)."""
+
+    def __init__(self, max_entries: int = 0, ttl: float | None = None):
+        pass
+
+    def get(self, chave: Hashable) -> Any:
+        return AUSENTE
+
+    def set(self, chave: Hashable, valor: Any) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+
+FabricaCache = Callable[[int, "float | None"], Cache]
+_fabrica: FabricaCache = CacheMemoria
+
+
+def definir_fabrica(fabrica: FabricaCache) -> None:
+    """Troca o backend de todas as funções memoizadas (vale a partir da próxima chamada)."""
+    global _fabrica
+    _fabrica = fabrica
+
+
+def _digest(*partes: bytes) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    for p in partes:
+        h.update(p)
+    return h.hexdigest()
+
+
+def chave_arg(v: Any) -> Hashable:
+    """
+    Chave estável para um argumento: conteúdo para DataFrame/ndarray, `chave()` quando o objeto
+    oferece uma (GamePack), o próprio valor para hasheáveis. numpy/pandas não são importados aqui.
+    """
+    if v is None or isinstance(v, (bool, int, float, str, bytes)):
+        return v
+    if isinstance(v, (tuple, list)):
+        return (type(v).__name__, tuple(chave_arg(x) for x in v))
+    if isinstance(v, dict):
+        return ("dict", tuple(sorted((k, chave_arg(x)) for k, x in v.items())))
+    if callable(getattr(v, "chave", None)):
+        return (type(v).__name__, v.chave())
+
+    np = sys.modules.get("numpy")
+    if np is not None and isinstance(v, np.ndarray):
+        a = np.ascontiguousarray(v)
+        return ("ndarray", a.dtype.str, a.shape, _digest(a.tobytes()))
+    pd = sys.modules.get("pandas")
+    if pd is not None and isinstance(v, (pd.DataFrame, pd.Series)):
+        linhas = pd.util.hash_pandas_object(v, index=True).to_numpy()
+        colunas = tuple(map(str, v.columns)) if isinstance(v, pd.DataFrame) else (str(v.name),)
+        return (type(v).__name__, v.shape, colunas, _digest(linhas.tobytes()))
+
+    try:
+        hash(v)
+    except TypeError:
+        raise TypeError(
+            f"Argumento {type(v).__name__} não serve de chave de cache: use o prefixo _ no parâmetro."
+        ) from None
+    return v
+
+
+class _Memoizado:
+    def __init__(self, fn: Callable[..., Any], max_entries: int, ttl: float | None):
+        functools.update_wrapper(self, fn)
+        self._fn = fn
+        self._assinatura = inspect.signature(fn)
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._cache: Cache | None = None
+        self._fabrica_usada: FabricaCache | None = None
+        self._lock = threading.Lock()
+
+    def _backend(self) -> Cache:
+        with self._lock:
+            if self._cache is None or self._fabrica_usada is not _fabrica:
+                self._cache, self._fabrica_usada = _fabrica(self._max_entries, self._ttl), _fabrica
+            return self._cache
+
+    def chave(self, *args: Any, **kwargs: Any) -> Hashable:
+        # mesma convenção do st.cache_*: parâmetros com prefixo _ não entram na chave
+        ligados = self._assinatura.bind(*args, **kwargs)
+        ligados.apply_defaults()
+        return tuple((k, chave_arg(v)) for k, v in ligados.arguments.items() if not k.startswith("_"))
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        cache = self._backend()
+        chave = self.chave(*args, **kwargs)
+        valor = cache.get(chave)
+        registrar_cache(f"core.{self.__name__}", acerto=valor is not AUSENTE)
+        if valor is AUSENTE:
+            valor = self._fn(*args, **kwargs)
+            cache.set(chave, valor)
+        return valor
+
+    def clear(self) -> None:
+        if self._cache is not None:
+            self._cache.clear()
+
+
+def memoizar(*, max_entries: int = 32, ttl: float | None = None) -> Callable[[Callable[..., Any]], _Memoizado]:
+    """Equivalente sem Streamlit de st.cache_resource (valor compartilhado, sem cópia)."""
+
+    def deco(fn: Callable[..., Any]) -> _Memoizado:
+        return _Memoizado(fn, max_entries, ttl)
+
+    return deco
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 
+from .draw_index import DrawIndex
+
 
 def freq_top_df(freq_df: pd.DataFrame, top: int = 20) -> pd.DataFrame:
     # Espera colunas: dezena, frequencia
@@ -24,3 +27,13 @@ def soma_series_df(dfs: pd.DataFrame, last_n: int = 200) -> pd.DataFrame:
     d = dfs.sort_values("concurso").tail(last_n).copy()
     d = d.set_index("concurso")[["soma"]]
     return d
+
+
+def freq_movel_df(idx: DrawIndex, janela: int, dezenas: list[int], pontos: int = 400) -> pd.DataFrame:
+    # Frequência na janela móvel por concurso (uma coluna por dezena), no máximo `pontos` linhas
+    moveis = idx.frequencias_moveis(janela)
+    linhas = np.unique(np.linspace(0, len(moveis) - 1, min(pontos, len(moveis))).astype(np.int64))
+    cols = np.asarray(dezenas, dtype=np.int64) - 1
+    d = pd.DataFrame(moveis[np.ix_(linhas, cols)], columns=[str(x) for x in dezenas])
+    d.index = pd.Index(idx.concursos[linhas + janela - 1], name="concurso")
+    return d
@@ -1,5 +1,8 @@
+import os
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Literal
+from urllib.parse import quote
 
 Modalidade = Literal["Mega-Sena", "Lotofácil"]
 
@@ -13,10 +16,25 @@ class LotterySpec:
     preco_base: float
     limite_baixo: int
     comb_target: int
+    faixas_premio: tuple[int, ...] = ()  # acertos premiados, da maior para a menor faixa
+
+    def nome_faixa(self, acertos: int) -> str:
+        return NOMES_FAIXA.get(self.modalidade, {}).get(acertos, f"{acertos} pontos")
+
+NOMES_FAIXA: dict[str, dict[int, str]] = {
+    "Mega-Sena": {6: "Sena", 5: "Quina", 4: "Quadra"},
+}
 
 PRECO_BASE_MEGA = 6.00
 PRECO_BASE_LOTO = 3.50
 
+# Prêmio (R$) por aposta simples em cada faixa, usado na simulação. Lotofácil 11–13 são fixos;
+# as demais faixas são por rateio e aqui entram como médias aproximadas (ajustáveis na página).
+PREMIOS_FAIXA: dict[str, dict[int, float]] = {
+    "Mega-Sena": {6: 50_000_000.0, 5: 50_000.0, 4: 1_000.0},
+    "Lotofácil": {15: 1_500_000.0, 14: 1_500.0, 13: 35.0, 12: 14.0, 11: 7.0},
+}
+
 URL_LOTOFACIL_DOWNLOAD = (
     "https://servicebus2.caixa.gov.br/portaldeloterias/api/resultados/download"
     "?modalidade=Lotof%C3%A1cil"
@@ -26,6 +44,40 @@ URL_MEGA_DOWNLOAD = (
     "?modalidade=Mega-Sena"
 )
 
+URLS_DOWNLOAD: dict[str, str] = {"Mega-Sena": URL_MEGA_DOWNLOAD, "Lotofácil": URL_LOTOFACIL_DOWNLOAD}
+# Base alternativa para o download (ex.: servidor local de testes); recebe ?modalidade=<nome>
+DOWNLOAD_URL_ENV = "LOTTERY_HELPER_DOWNLOAD_URL"
+
+# Armazenamento local do histórico (um arquivo por modalidade)
+CACHE_DIR_ENV = "LOTTERY_HELPER_CACHE_DIR"
+CACHE_DIR_PADRAO = Path.home() / ".cache" / "lottery_helper"
+
+# Calendário de sorteios (weekday: 0=segunda) e hora (Brasília) a partir da qual o resultado sai
+DIAS_SORTEIO: dict[str, tuple[int, ...]] = {
+    "Mega-Sena": (1, 3, 5),
+    "Lotofácil": (0, 1, 2, 3, 4, 5),
+}
+HORA_RESULTADO = 21
+# Intervalo mínimo entre consultas à Caixa quando um sorteio novo é esperado mas ainda não saiu
+MIN_INTERVALO_VERIFICACAO_S = 30 * 60
+
+def get_cache_dir() -> Path:
+    return Path(os.environ.get(CACHE_DIR_ENV) or CACHE_DIR_PADRAO)
+
+def url_download(modalidade: Modalidade) -> str:
+    base = os.environ.get(DOWNLOAD_URL_ENV)
+    return f"{base}?modalidade={quote(modalidade)}" if base else URLS_DOWNLOAD[modalidade]
+
+# Processos usados em backtest/simulação (ausente ou 0 = todos os núcleos)
+WORKERS_ENV = "LOTTERY_HELPER_WORKERS"
+
+def get_workers() -> int:
+    try:
+        n = int(os.environ.get(WORKERS_ENV) or 0)
+    except ValueError:
+        n = 0
+    return n if n > 0 else (os.cpu_count() or 1)
+
 def get_spec(modalidade: Modalidade) -> LotterySpec:
     import math
     if modalidade == "Mega-Sena":
@@ -38,6 +90,7 @@ def get_spec(modalidade: Modalidade) -> LotterySpec:
             preco_base=PRECO_BASE_MEGA,
             limite_baixo=30,
             comb_target=math.comb(60, 6),
+            faixas_premio=(6, 5, 4),
         )
     return LotterySpec(
         modalidade="Lotofácil",
@@ -48,4 +101,5 @@ def get_spec(modalidade: Modalidade) -> LotterySpec:
         preco_base=PRECO_BASE_LOTO,
         limite_baixo=13,
         comb_target=math.comb(25, 15),
+        faixas_premio=(15, 14, 13, 12, 11),
     )
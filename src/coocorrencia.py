@@ -0,0 +1,121 @@
+"""
+Coocorrência de pares e trios a partir da matriz de incidência X (concursos × dezenas).
+
+Pares: Xᵀ·X. Trios (i < j < k): para cada dezena i, o Gram só das linhas em que i saiu e só
+das colunas > i — cada produto usa a parte não nula de X daquela dezena, e o resultado já sai
+na ordem lexicográfica dos trios. Produtos em float32 (BLAS) por blocos de 2^16 linhas, onde
+as contagens são exatas, acumulados em int64.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from math import comb
+
+import numpy as np
+import pandas as pd
+
+from .draw_index import DrawIndex
+from .instrumentation import medido
+
+BLOCO = 1 << 16  # linhas por produto: contagem por bloco < 2^24 (exata em float32)
+
+
+def _gram(X: np.ndarray, linhas: np.ndarray | None = None, col0: int = 0) -> np.ndarray:
+    n = X.shape[0] if linhas is None else len(linhas)
+    g = np.zeros((X.shape[1] - col0, X.shape[1] - col0), dtype=np.int64)
+    for ini in range(0, n, BLOCO):
+        b = X[ini : ini + BLOCO] if linhas is None else X[linhas[ini : ini + BLOCO]]
+        b = b[:, col0:].astype(np.float32)
+        g += (b.T @ b).astype(np.int64)
+    return g
+
+
+@lru_cache(maxsize=8)
+def combinacoes(n_universo: int, r: int) -> np.ndarray:
+    """(C(N, r), r) dezenas base 0 em ordem lexicográfica (mesma ordem de `Coocorrencia`)."""
+    if r == 2:
+        out = np.column_stack(np.triu_indices(n_universo, 1))
+    else:
+        partes = []
+        for i in range(n_universo - 2):
+            j, k = np.triu_indices(n_universo - i - 1, 1)
+            partes.append(np.column_stack([np.full(len(j), i), j + i + 1, k + i + 1]))
+        out = np.concatenate(partes) if partes else np.zeros((0, 3), dtype=np.intp)
+    out = out.astype(np.int16)
+    out.flags.writeable = False
+    return out
+
+
+@dataclass(frozen=True)
+class Coocorrencia:
+    n_universo: int
+    n_dezenas_sorteio: int
+    n_concursos: int
+    pares: np.ndarray  # int64 (N, N) simétrica; diagonal = frequência
+    trios: np.ndarray  # int64 (C(N, 3),) na ordem de combinacoes(N, 3)
+
+    @classmethod
+    @medido("analytics.coocorrencia")
+    def from_index(cls, idx: DrawIndex) -> "Coocorrencia":
+        X, n = idx.incidencia, idx.n_universo
+        linhas, inicio = idx.ocorrencias
+        trios = np.zeros(comb(n, 3), dtype=np.int64)
+        pos = 0
+        for i in range(n - 2):
+            g = _gram(X, linhas[inicio[i] : inicio[i + 1]], col0=i + 1)
+            bloco = g[np.triu_indices(n - i - 1, 1)]
+            trios[pos : pos + len(bloco)] = bloco
+            pos += len(bloco)
+
+        out = cls(n, idx.n_dezenas_sorteio, len(idx), _gram(X), trios)
+        out.pares.flags.writeable = False
+        out.trios.flags.writeable = False
+        return out
+
+    def esperado(self, r: int) -> float:
+        """Ocorrências esperadas de um conjunto de r dezenas se os sorteios fossem uniformes."""
+        return self.n_concursos * comb(self.n_dezenas_sorteio, r) / comb(self.n_universo, r)
+
+    def contagens(self, r: int) -> np.ndarray:
+        if r == 2:
+            i, j = np.triu_indices(self.n_universo, 1)
+            return self.pares[i, j]
+        if r == 3:
+            return self.trios
+        raise ValueError("Coocorrência disponível só para pares (2) e trios (3).")
+
+    def ranking(self, r: int, k: int | None = 20, *, menos: bool = False, com: int | None = None) -> pd.DataFrame:
+        """
+        Os `k` pares/trios mais (ou `menos`) frequentes, opcionalmente só os que contêm a dezena
+        `com`; k=None devolve todos, ordenados. Empates saem em ordem lexicográfica.
+        """
+        if com is not None and not 1 <= com <= self.n_universo:
+            raise ValueError(f"Dezena {com} fora do universo 1–{self.n_universo}.")
+        qtd = self.contagens(r)
+        combos = combinacoes(self.n_universo, r)
+        sel = np.arange(len(qtd))
+        if com is not None:
+            sel = np.flatnonzero((combos == com - 1).any(axis=1))
+
+        chave = qtd[sel] if menos else -qtd[sel]
+        if k is not None and k < len(sel):
+            # top-k parcial (O(m)) e ordenação só dos k escolhidos; o corte inclui os empates
+            limite = np.partition(chave, k - 1)[k - 1]
+            sel = sel[chave <= limite]
+            chave = qtd[sel] if menos else -qtd[sel]
+        sel = sel[np.argsort(chave, kind="stable")][:k]
+
+        out = pd.DataFrame(combos[sel].astype(np.int64) + 1, columns=[f"dezena_{c + 1}" for c in range(r)])
+        esperado = self.esperado(r)
+        out["qtd"] = qtd[sel]
+        out["esperado"] = esperado
+        out["razao"] = out["qtd"] / esperado if esperado else np.nan
+        return out
+
+    def pares_com(self, dezena: int) -> pd.DataFrame:
+        """Quantas vezes `dezena` saiu junto com cada uma das outras."""
+        if not 1 <= dezena <= self.n_universo:
+            raise ValueError(f"Dezena {dezena} fora do universo 1–{self.n_universo}.")
+        outras = np.delete(np.arange(self.n_universo), dezena - 1)
+        return pd.DataFrame({"dezena": outras + 1, "qtd": self.pares[dezena - 1, outras]})
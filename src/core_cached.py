@@ -0,0 +1,90 @@
+"""
+Versões memoizadas sem Streamlit (CLI, workers, benchmarks) das funções usadas pelas páginas.
+O backend vem de `src.cache` (LRU em memória por padrão). Parâmetros com prefixo _ não entram
+na chave; nas páginas, `analytics_cached` troca o backend por um guardado em st.cache_resource.
+"""
+from __future__ import annotations
+
+import pandas as pd
+
+from .analytics import atraso, frequencias, padroes_par_impar_baixa_alta, somas
+from .analytics_state import AnalyticsState, sincronizar_state
+from .atrasos import HistoricoAtrasos
+from .backtest import ResultadoBacktest
+from .cache import memoizar
+from .config import Modalidade, get_spec
+from .coocorrencia import Coocorrencia
+from .data_caixa import load_history
+from .draw_index import DrawIndex
+from .game_pack import GamePack
+from .parallel import backtest_paralelo
+from .premios import ORCAMENTO_EXATO, probabilidades_faixas
+
+TTL_S = 60 * 60
+
+
+@memoizar(max_entries=2, ttl=TTL_S)
+def load_history_cached(modalidade: Modalidade) -> pd.DataFrame:
+    # store local na hora; concursos novos chegam pela revalidação (registro do processo)
+    return load_history(modalidade, em_segundo_plano=True)
+
+
+@memoizar(max_entries=8, ttl=TTL_S)
+def cached_draw_index(df: pd.DataFrame, n_dezenas: int, n_universo: int) -> DrawIndex:
+    return DrawIndex.from_history(df, n_dezenas, n_universo)
+
+
+@memoizar(max_entries=32, ttl=TTL_S)
+def cached_frequencias(
+    df: pd.DataFrame, n_dezenas: int, n_universo: int, janela: int | None = None, _idx: DrawIndex | None = None
+) -> pd.DataFrame:
+    return frequencias(df, n_dezenas, n_universo, janela=janela, idx=_idx)
+
+
+@memoizar(max_entries=32, ttl=TTL_S)
+def cached_atraso(
+    freq_df: pd.DataFrame, df: pd.DataFrame, n_dezenas: int, n_universo: int, _idx: DrawIndex | None = None
+) -> pd.DataFrame:
+    return atraso(freq_df, df, n_dezenas, n_universo, idx=_idx)
+
+
+@memoizar(max_entries=32, ttl=TTL_S)
+def cached_padroes(df: pd.DataFrame, n_dezenas: int, limite_baixo: int, _idx: DrawIndex | None = None):
+    return padroes_par_impar_baixa_alta(df, n_dezenas, limite_baixo, idx=_idx)
+
+
+@memoizar(max_entries=32, ttl=TTL_S)
+def cached_somas(df: pd.DataFrame, n_dezenas: int):
+    return somas(df, n_dezenas)
+
+
+# Chave = (modalidade, versão do histórico); o df não é hasheado (prefixo _)
+@memoizar(max_entries=8, ttl=TTL_S)
+def cached_analytics_state(modalidade: Modalidade, versao: tuple[int, int], _df: pd.DataFrame) -> AnalyticsState:
+    return sincronizar_state(modalidade, _df)
+
+
+# Chave = (modalidade, versão do histórico); o índice vem pronto e não é hasheado
+@memoizar(max_entries=4, ttl=TTL_S)
+def cached_coocorrencia(modalidade: Modalidade, versao: tuple[int, int], _idx: DrawIndex) -> Coocorrencia:
+    return Coocorrencia.from_index(_idx)
+
+
+@memoizar(max_entries=4, ttl=TTL_S)
+def cached_atrasos(modalidade: Modalidade, versao: tuple[int, int], _idx: DrawIndex) -> HistoricoAtrasos:
+    return HistoricoAtrasos.from_index(_idx)
+
+
+# Chave = hash do conteúdo do pacote (GamePack.chave); o pacote em si não é hasheado.
+# Sem `completo`, faixas caras demais ficam só com a cota superior (ORCAMENTO_EXATO)
+@memoizar(max_entries=16, ttl=TTL_S)
+def cached_probabilidades_faixas(
+    chave_pack: str, modalidade: Modalidade, _pack: GamePack, completo: bool = False
+) -> pd.DataFrame:
+    return probabilidades_faixas(_pack, get_spec(modalidade), orcamento=None if completo else ORCAMENTO_EXATO)
+
+
+# Chave = (pacote, versão do histórico); pacote e índice vêm prontos e não são hasheados
+@memoizar(max_entries=8, ttl=TTL_S)
+def cached_backtest(chave_pack: str, versao: tuple[int, int], _pack: GamePack, _idx: DrawIndex) -> ResultadoBacktest:
+    return backtest_paralelo(_pack, _idx)
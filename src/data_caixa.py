@@ -1,97 +1,315 @@
 from __future__ import annotations
 
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
 from io import BytesIO
+from typing import BinaryIO, Collection, Mapping, Sequence
+from xml.etree.ElementTree import iterparse
 
 import numpy as np
 import pandas as pd
 
-from .config import URL_LOTOFACIL_DOWNLOAD, URL_MEGA_DOWNLOAD, Modalidade
-from .http_client import get_session
+from .analytics_state import sincronizar_state
+from .config import Modalidade, get_spec, url_download
+from .history_registry import registrar
+from .history_store import (
+    agora_brasilia,
+    carregar_store,
+    carregar_validadores,
+    mesclar_novos,
+    novos_sorteios_esperados,
+    salvar_store,
+    salvar_validadores,
+)
+from .instrumentation import contar, etapa, medido
 
 
 def baixar_xlsx(url: str) -> BytesIO:
-    r = get_session().get(url, timeout=60)
-    r.raise_for_status()
+    # requests/urllib3 só quando há download de fato (~140 ms a menos no import do núcleo)
+    from .http_client import get_session
+
+    with etapa("download") as m:
+        r = get_session().get(url, timeout=60)
+        r.raise_for_status()
+        m.bytes = len(r.content)
     return BytesIO(r.content)
 
 
-def _limpar_concurso_data(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
-    df["concurso"] = pd.to_numeric(df["concurso"], errors="coerce")
-    df["data"] = pd.to_datetime(df["data"], dayfirst=True, errors="coerce")
-    df = df.dropna(subset=["concurso", "data"])
+# Colunas lidas da planilha da Caixa; as demais (ganhadores, rateios, cidades...) são ignoradas
+COLUNAS_XLSX: dict[str, tuple[str, ...]] = {
+    "Mega-Sena": ("Concurso", "Data do Sorteio", *(f"Bola{i}" for i in range(1, 7))),
+    "Lotofácil": ("Concurso", "Data Sorteio", *(f"Bola{i}" for i in range(1, 16))),
+}
 
-    hoje = pd.Timestamp.today().normalize()
-    df = df[(df["data"] >= "1996-01-01") & (df["data"] <= hoje)]
-    df["concurso"] = df["concurso"].astype(int)
+_NS_XLSX = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
 
-    df = df.sort_values(["concurso", "data"]).drop_duplicates(subset=["concurso"], keep="last")
-    df = df.sort_values("concurso").reset_index(drop=True)
-    return df
 
+@lru_cache(maxsize=None)
+def _indice_coluna(letras: str) -> int:
+    """"AB" -> 27 (base 0)."""
+    n = 0
+    for ch in letras:
+        n = n * 26 + ord(ch) - 64
+    return n - 1
 
-def normalizar_megasena(df_raw: pd.DataFrame) -> pd.DataFrame:
-    cols = ["Concurso", "Data do Sorteio", "Bola1", "Bola2", "Bola3", "Bola4", "Bola5", "Bola6"]
-    faltando = [c for c in cols if c not in df_raw.columns]
+
+def ler_xlsx_colunas(buf: BinaryIO, colunas: Sequence[str], *, datas: Collection[str] = ()) -> dict[str, list]:
+    """
+    Lê só `colunas` (pelo cabeçalho na 1ª linha) da 1ª planilha: openpyxl em modo read-only dá as
+    strings compartilhadas e o XML da planilha, que é percorrido linha a linha; só as células pedidas
+    são convertidas (número -> float, texto -> str, vazia -> None). Números nas colunas `datas` são
+    datas seriais do Excel e viram datetime.
+
+    O atalho usa atributos internos do ReadOnlyWorksheet (openpyxl fixado em 3.1.x); sem eles, cai
+    no `iter_rows` público (~2x mais lento: converte todas as células até a última coluna pedida).
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(buf, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[0]
+        if hasattr(ws, "_shared_strings") and hasattr(ws, "_get_source"):
+            valores = _ler_colunas_xml(ws, colunas, datas, wb.epoch)
+        else:
+            valores = _ler_colunas_iter_rows(ws, colunas, datas, wb.epoch)
+    finally:
+        wb.close()
+    return dict(zip(colunas, valores))
+
+
+def _ler_colunas_iter_rows(ws, colunas: Sequence[str], datas: Collection[str], epoch: datetime) -> list[list]:
+    from openpyxl.utils.datetime import from_excel
+
+    cabecalho = next(ws.iter_rows(max_row=1, values_only=True), None)
+    if cabecalho is None:
+        raise RuntimeError("XLSX inválido; planilha vazia")
+    posicoes = {str(v): i for i, v in enumerate(cabecalho) if v is not None}
+    faltando = [c for c in colunas if c not in posicoes]
     if faltando:
-        raise RuntimeError(f"XLSX Mega-Sena inválido; colunas ausentes: {faltando}")
+        raise RuntimeError(f"XLSX inválido; colunas ausentes: {faltando}")
 
-    df = df_raw[cols].copy()
-    df.rename(columns={"Concurso": "concurso", "Data do Sorteio": "data"}, inplace=True)
-    df = _limpar_concurso_data(df)
+    indices = [posicoes[c] for c in colunas]
+    linhas = list(ws.iter_rows(min_row=2, max_col=max(indices) + 1, values_only=True))
+    valores = []
+    for c, i in zip(colunas, indices):
+        col = [linha[i] if i < len(linha) else None for linha in linhas]
+        if c in datas:
+            col = [from_excel(v, epoch) if isinstance(v, (int, float)) else v for v in col]
+        valores.append(col)
+    return valores
 
-    bolas = [f"Bola{i}" for i in range(1, 7)]
-    for c in bolas:
-        df[c] = pd.to_numeric(df[c], errors="coerce")
-    df = df.dropna(subset=bolas)
 
-    for c in bolas:
-        df[c] = df[c].astype(int)
-        df = df[df[c].between(1, 60)]
+def _ler_colunas_xml(ws, colunas: Sequence[str], datas: Collection[str], epoch: datetime) -> list[list]:
+    from openpyxl.utils.datetime import from_excel
 
-    df.rename(columns={f"Bola{i}": f"d{i}" for i in range(1, 7)}, inplace=True)
-    dezenas = [f"d{i}" for i in range(1, 7)]
-    df[dezenas] = np.sort(df[dezenas].values, axis=1)
+    # ReadOnlyWorksheet: tabela de strings e XML da planilha (os mesmos que iter_rows usa)
+    compartilhadas = ws._shared_strings
+    posicoes: dict[int, int] | None = None  # coluna na planilha -> posição em `colunas`
+    valores: list[list] = [[] for _ in colunas]
+    eh_data = [c in datas for c in colunas]
+    ultima = 0
 
-    return df[["concurso", "data"] + dezenas].sort_values("concurso").reset_index(drop=True)
+    with ws._get_source() as src:
+        for _, el in iterparse(src):
+            if el.tag != _NS_XLSX + "row":
+                continue
+            linha: list = [None] * len(colunas)
+            for j, c in enumerate(el):
+                ref = c.get("r")
+                col = _indice_coluna(ref.rstrip("0123456789")) if ref else j
+                if posicoes is not None and col > ultima:
+                    break  # células em ordem de coluna: o resto da linha não interessa
+                k = col if posicoes is None else posicoes.get(col)
+                if k is None:
+                    continue
+                tipo, v = c.get("t"), c.findtext(_NS_XLSX + "v")
+                if tipo == "s":
+                    v = compartilhadas[int(v)]
+                elif tipo == "inlineStr":
+                    v = "".join(t.text or "" for t in c.iter(_NS_XLSX + "t"))
+                elif v is not None and tipo in (None, "n"):
+                    v = float(v)
+                if posicoes is None:
+                    linha.extend([None] * (col + 1 - len(linha)))
+                linha[k] = v
+            el.clear()
 
+            if posicoes is None:
+                cabecalho = {str(v): i for i, v in enumerate(linha) if v is not None}
+                faltando = [c for c in colunas if c not in cabecalho]
+                if faltando:
+                    raise RuntimeError(f"XLSX inválido; colunas ausentes: {faltando}")
+                posicoes = {cabecalho[c]: k for k, c in enumerate(colunas)}
+                ultima = max(posicoes)
+                continue
+            for k, v in enumerate(linha):
+                if eh_data[k] and isinstance(v, float):
+                    v = from_excel(v, epoch)
+                valores[k].append(v)
 
-def normalizar_lotofacil(df_raw: pd.DataFrame) -> pd.DataFrame:
-    cols = ["Concurso", "Data Sorteio"] + [f"Bola{i}" for i in range(1, 16)]
-    faltando = [c for c in cols if c not in df_raw.columns]
+    if posicoes is None:
+        raise RuntimeError("XLSX inválido; planilha vazia")
+    return valores
+
+
+def _numerico(colunas: Sequence[Sequence]) -> np.ndarray:
+    """(n, len(colunas)) float64; valor não numérico -> NaN."""
+    try:
+        return np.array(colunas, dtype=np.float64).T
+    except (TypeError, ValueError):
+        return np.column_stack([pd.to_numeric(pd.Series(c, dtype=object), errors="coerce").to_numpy(np.float64) for c in colunas])
+
+
+@medido("normalizacao")
+def normalizar_colunas(mod: Modalidade, colunas: Mapping[str, Sequence]) -> pd.DataFrame:
+    """
+    Histórico normalizado a partir das colunas cruas da Caixa: uma máscara de validade
+    (concurso, data entre 1996 e hoje, todas as bolas no universo) aplicada uma vez, depois
+    ordenação por concurso mantendo a última linha de cada concurso.
+    """
+    spec = get_spec(mod)
+    nomes = COLUNAS_XLSX[mod]
+    faltando = [c for c in nomes if c not in colunas]
     if faltando:
-        raise RuntimeError(f"XLSX Lotofácil inválido; colunas ausentes: {faltando}")
+        raise RuntimeError(f"XLSX {mod} inválido; colunas ausentes: {faltando}")
+
+    concurso = _numerico([colunas[nomes[0]]])[:, 0]
+    datas = pd.to_datetime(pd.Series(colunas[nomes[1]], dtype=object), dayfirst=True, errors="coerce")
+    bolas = _numerico([colunas[c] for c in nomes[2:]])
+
+    hoje = pd.Timestamp.today().normalize()
+    with np.errstate(invalid="ignore"):
+        bolas = np.trunc(bolas)
+        ok = (
+            ~np.isnan(concurso)
+            & (datas >= "1996-01-01").to_numpy()
+            & (datas <= hoje).to_numpy()
+            & ((bolas >= 1) & (bolas <= spec.n_universo)).all(axis=1)
+        )
+
+    linhas = np.flatnonzero(ok)
+    concurso = concurso[linhas].astype(np.int64)
+    datas = datas.to_numpy()[linhas]
+    ordem = np.lexsort((datas, concurso))
+    ultima = np.append(concurso[ordem][1:] != concurso[ordem][:-1], True) if len(ordem) else np.zeros(0, bool)
+    sel = ordem[ultima]
+
+    dezenas = [f"d{i}" for i in range(1, spec.n_dezenas_sorteio + 1)]
+    df = pd.DataFrame(np.sort(bolas[linhas[sel]].astype(np.int64), axis=1), columns=dezenas)
+    df.insert(0, "concurso", concurso[sel])
+    df.insert(1, "data", datas[sel])
+    return df
+
 
-    df = df_raw[cols].copy()
-    df.rename(columns={"Concurso": "concurso", "Data Sorteio": "data"}, inplace=True)
-    df = _limpar_concurso_data(df)
+def normalizar_megasena(df_raw: pd.DataFrame) -> pd.DataFrame:
+    return normalizar_colunas("Mega-Sena", {c: df_raw[c].to_numpy() for c in COLUNAS_XLSX["Mega-Sena"] if c in df_raw})
 
-    bolas = [f"Bola{i}" for i in range(1, 16)]
-    for c in bolas:
-        df[c] = pd.to_numeric(df[c], errors="coerce")
-    df = df.dropna(subset=bolas)
 
-    for c in bolas:
-        df[c] = df[c].astype(int)
-        df = df[df[c].between(1, 25)]
+def normalizar_lotofacil(df_raw: pd.DataFrame) -> pd.DataFrame:
+    return normalizar_colunas("Lotofácil", {c: df_raw[c].to_numpy() for c in COLUNAS_XLSX["Lotofácil"] if c in df_raw})
 
-    df.rename(columns={f"Bola{i}": f"d{i}" for i in range(1, 16)}, inplace=True)
-    dezenas = [f"d{i}" for i in range(1, 16)]
-    df[dezenas] = np.sort(df[dezenas].values, axis=1)
 
-    return df[["concurso", "data"] + dezenas].sort_values("concurso").reset_index(drop=True)
+def ler_historico_xlsx(buf: BinaryIO, mod: Modalidade) -> pd.DataFrame:
+    nomes = COLUNAS_XLSX[mod]
+    with etapa("xlsx_parse"):
+        try:
+            colunas = ler_xlsx_colunas(buf, nomes, datas=nomes[1:2])
+        except RuntimeError as e:
+            raise RuntimeError(str(e).replace("XLSX", f"XLSX {mod}", 1)) from None
+    return normalizar_colunas(mod, colunas)
 
 
 def load_history_from_caixa(mod: Modalidade) -> pd.DataFrame:
-    if mod == "Mega-Sena":
-        buf = baixar_xlsx(URL_MEGA_DOWNLOAD)
-        df_raw = pd.read_excel(buf)
-        return normalizar_megasena(df_raw)
-
-    buf = baixar_xlsx(URL_LOTOFACIL_DOWNLOAD)
-    df_raw = pd.read_excel(buf)
-    return normalizar_lotofacil(df_raw)
-    
+    return ler_historico_xlsx(baixar_xlsx(url_download(mod)), mod)
+
+
+def atualizar_da_caixa(mod: Modalidade, local: tuple[pd.DataFrame, datetime] | None) -> pd.DataFrame:
+    """
+    Consulta a Caixa e grava o store. Com store local a requisição é condicional (ETag,
+    Last-Modified); em 304 ou planilha idêntica (sha256) nada é lido, só a verificação é registrada.
+    """
+    from .http_client import get_condicional
+
+    validadores = carregar_validadores(mod) if local is not None else None
+    with etapa("download") as m:
+        resp = get_condicional(url_download(mod), validadores)
+        m.bytes = len(resp.conteudo or b"")
+
+    if resp.conteudo is None and local is not None:
+        contar("download.nao_modificado")
+        df = local[0]
+    else:
+        novos = ler_historico_xlsx(BytesIO(resp.conteudo), mod)
+        df = novos if local is None else mesclar_novos(local[0], novos)[0]
+
+    salvar_store(mod, df, verificado_em=agora_brasilia())
+    salvar_validadores(mod, resp.validadores)  # depois do store: validadores nunca à frente dos dados
+    if resp.conteudo is not None:
+        sincronizar_state(mod, df)
+    return df
+
+
+def load_history(mod: Modalidade, *, forcar: bool = False, em_segundo_plano: bool = False) -> pd.DataFrame:
+    """
+    Histórico a partir do store local; a Caixa só é consultada quando um sorteio novo
+    é esperado (ou `forcar=True`). Só concursos acima do máximo local são mesclados.
+    Com `em_segundo_plano`, o store local é devolvido na hora e a consulta roda numa
+    thread (stale-while-revalidate); o resultado é publicado no registro do processo.
+    """
+    local = carregar_store(mod)
+    if local is not None and not forcar:
+        base, verificado_em = local
+        if base.empty or not novos_sorteios_esperados(mod, base["data"].max().to_pydatetime(), verificado_em):
+            return base
+        if em_segundo_plano:
+            revalidar(mod)
+            return base
+
+    try:
+        return atualizar_da_caixa(mod, local)
+    except Exception:
+        if local is not None:
+            return local[0]
+        raise
+
+
+# ---- revalidação em segundo plano (uma por modalidade)
+_lock_revalidacao = threading.Lock()
+_revalidacoes: dict[str, Future] = {}
+
+
+@lru_cache(maxsize=1)
+def _executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="revalidar_historico")
+
+
+def _revalidar(mod: Modalidade) -> pd.DataFrame:
+    try:
+        df = atualizar_da_caixa(mod, carregar_store(mod))
+    except Exception:
+        contar("revalidacao.falhas")
+        raise
+    registrar(mod, df)
+    return df
+
+
+def revalidar(mod: Modalidade) -> Future:
+    """Dispara (ou devolve, se já em curso) a atualização do store em segundo plano."""
+    with _lock_revalidacao:
+        fut = _revalidacoes.get(mod)
+        if fut is None or fut.done():
+            fut = _revalidacoes[mod] = _executor().submit(_revalidar, mod)
+        return fut
+
+
+def revalidando(mod: Modalidade) -> bool:
+    with _lock_revalidacao:
+        fut = _revalidacoes.get(mod)
+    return fut is not None and not fut.done()
+
+
 def read_csv_smart(path: str) -> pd.DataFrame:
     try:
         return pd.read_csv(path, encoding="utf-8")
@@ -1,7 +1,17 @@
 import math
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import combinations
+from typing import Callable
+
 import numpy as np
 import pandas as pd
 
+from .draw_index import mascaras_matriz, popcount
+from .game_pack import GamePack
+from .instrumentation import contar, medido
+from .models import Restricoes
+
 PRIMOS_ATE_60 = {2,3,5,7,11,13,17,19,23,29,31,37,41,43,47,53,59}
 
 def formatar_jogo(jogo: list[int]) -> str:
@@ -30,34 +40,126 @@ def tem_sequencia_longa(jogo: list[int], limite: int = 3) -> bool:
 def contar_primos(jogo: list[int]) -> int:
     return sum(1 for d in jogo if d in PRIMOS_ATE_60)
 
-def gerar_aleatorio_puro(qtd: int, tam: int, n_universo: int) -> list[list[int]]:
-    universe = np.arange(1, n_universo + 1)
-    return [sorted(np.random.choice(universe, size=tam, replace=False).tolist()) for _ in range(qtd)]
-
-def gerar_balanceado_par_impar(qtd: int, tam: int, n_universo: int) -> list[list[int]]:
-    universe = np.arange(1, n_universo + 1)
-    jogos: list[list[int]] = []
-    for _ in range(qtd):
-        tent = 0
-        while True:
-            tent += 1
-            dezenas = np.random.choice(universe, size=tam, replace=False).tolist()
-            p, i = pares_impares(dezenas)
-            if p not in (0, tam) and i not in (0, tam):
-                jogos.append(sorted(dezenas))
-                break
-            if tent > 50:
-                jogos.append(sorted(dezenas))
-                break
-    return jogos
+def _get_rng(rng: np.random.Generator | None) -> np.random.Generator:
+    return rng if rng is not None else np.random.default_rng()
 
-def gerar_quentes_frias_mix(
+def matriz_para_listas(m: np.ndarray) -> list[list[int]]:
+    return m.astype(int).tolist()
+
+def amostrar_sem_reposicao(
+    pool: np.ndarray,
+    qtd: int,
+    k: int,
+    rng: np.random.Generator | None = None,
+) -> np.ndarray:
+    """
+    Sorteia `k` elementos distintos de `pool` para cada uma das `qtd` linhas de uma vez.
+    Usa argpartition sobre uma matriz de chaves aleatórias (sem loop Python por jogo).
+    Retorna matriz (qtd, k) *não* ordenada.
+    """
+    pool = np.asarray(pool)
+    if k <= 0 or qtd <= 0:
+        return np.empty((max(qtd, 0), 0), dtype=pool.dtype)
+    if k > len(pool):
+        raise ValueError(f"Não é possível sortear {k} de {len(pool)} dezenas.")
+    chaves = _get_rng(rng).random((qtd, len(pool)), dtype=np.float32)
+    if k == len(pool):
+        idx = np.argsort(chaves, axis=1)
+    else:
+        idx = np.argpartition(chaves, k - 1, axis=1)[:, :k]
+    return pool[idx]
+
+def gerar_matriz_aleatoria(
+    qtd: int,
+    tam: int,
+    n_universo: int,
+    rng: np.random.Generator | None = None,
+) -> np.ndarray:
+    """Motor em lote: matriz int8 (qtd, tam) com jogos ordenados por linha."""
+    universe = np.arange(1, n_universo + 1, dtype=np.int8)
+    m = amostrar_sem_reposicao(universe, qtd, tam, rng)
+    m.sort(axis=1)
+    return m
+
+def pares_matriz(m: np.ndarray) -> np.ndarray:
+    return (m % 2 == 0).sum(axis=1)
+
+def baixos_matriz(m: np.ndarray, limite_baixo: int) -> np.ndarray:
+    return ((m >= 1) & (m <= limite_baixo)).sum(axis=1)
+
+def primos_matriz(m: np.ndarray) -> np.ndarray:
+    lut = np.zeros(max(PRIMOS_ATE_60) + 2, dtype=bool)
+    lut[list(PRIMOS_ATE_60)] = True
+    return lut[np.clip(m, 0, len(lut) - 1)].sum(axis=1)
+
+def seq_longa_matriz(m: np.ndarray, limite: int = 3) -> np.ndarray:
+    """Equivalente vetorizado de `tem_sequencia_longa` (linhas já ordenadas)."""
+    if m.shape[1] < 2:
+        return np.zeros(m.shape[0], dtype=bool)
+    consec = np.diff(m.astype(np.int16), axis=1) == 1
+    janela = max(1, limite - 1)
+    if janela > consec.shape[1]:
+        return np.zeros(m.shape[0], dtype=bool)
+    win = np.lib.stride_tricks.sliding_window_view(consec, janela, axis=1)
+    return win.all(axis=2).any(axis=1)
+
+def _regerar_rejeitados(
+    m: np.ndarray,
+    rejeitar,
+    gerar,
+    max_rodadas: int,
+) -> np.ndarray:
+    # Regera em lote só as linhas rejeitadas; após `max_rodadas` mantém o que sobrou
+    # (mesmo comportamento do limite de tentativas da versão por jogo).
+    ruins = np.flatnonzero(rejeitar(m))
+    rodada = 0
+    while ruins.size and rodada < max_rodadas:
+        rodada += 1
+        novos = gerar(ruins.size)
+        m[ruins] = novos
+        ruins = ruins[rejeitar(novos)]
+    return m
+
+def gerar_balanceado_par_impar_matriz(
+    qtd: int,
+    tam: int,
+    n_universo: int,
+    rng: np.random.Generator | None = None,
+) -> np.ndarray:
+    rng = _get_rng(rng)
+    m = gerar_matriz_aleatoria(qtd, tam, n_universo, rng)
+
+    def rejeitar(x: np.ndarray) -> np.ndarray:
+        p = pares_matriz(x)
+        return (p == 0) | (p == tam)
+
+    return _regerar_rejeitados(m, rejeitar, lambda n: gerar_matriz_aleatoria(n, tam, n_universo, rng), 50)
+
+def gerar_sem_sequencias_matriz(
+    qtd: int,
+    tam: int,
+    n_universo: int,
+    limite: int,
+    rng: np.random.Generator | None = None,
+) -> np.ndarray:
+    rng = _get_rng(rng)
+    m = gerar_matriz_aleatoria(qtd, tam, n_universo, rng)
+    return _regerar_rejeitados(
+        m,
+        lambda x: seq_longa_matriz(x, limite=limite),
+        lambda n: gerar_matriz_aleatoria(n, tam, n_universo, rng),
+        100,
+    )
+
+def gerar_quentes_frias_mix_matriz(
     qtd: int,
     tam: int,
     freq_df: pd.DataFrame,
     n_universo: int,
     proporcao: tuple[int,int,int],
-) -> list[list[int]]:
+    rng: np.random.Generator | None = None,
+) -> np.ndarray:
+    rng = _get_rng(rng)
     q_quentes, q_frias, q_neutras = proporcao
 
     freq_ord = freq_df.sort_values("frequencia", ascending=False)
@@ -68,43 +170,47 @@ def gerar_quentes_frias_mix(
 
     neutras = np.setdiff1d(np.arange(1, n_universo + 1), np.union1d(quentes, frias))
 
-    jogos: list[list[int]] = []
-    for _ in range(qtd):
-        dezenas: list[int] = []
-        qq = min(q_quentes, tam)
-        qf = min(q_frias, max(0, tam - qq))
-        qn = min(q_neutras, max(0, tam - qq - qf))
-
-        if qq > 0 and len(quentes) > 0:
-            dezenas.extend(np.random.choice(quentes, size=min(qq, len(quentes)), replace=False).tolist())
-        if qf > 0 and len(frias) > 0:
-            dezenas.extend(np.random.choice(frias, size=min(qf, len(frias)), replace=False).tolist())
-        if qn > 0 and len(neutras) > 0:
-            dezenas.extend(np.random.choice(neutras, size=min(qn, len(neutras)), replace=False).tolist())
-
-        if len(dezenas) < tam:
-            rest = np.setdiff1d(np.arange(1, n_universo + 1), np.array(dezenas, dtype=int))
-            extra = np.random.choice(rest, size=tam - len(dezenas), replace=False).tolist()
-            dezenas.extend(extra)
-
-        jogos.append(sorted(list(map(int, dezenas))))
-    return jogos
-
-def gerar_sem_sequencias(qtd: int, tam: int, n_universo: int, limite: int) -> list[list[int]]:
-    universe = np.arange(1, n_universo + 1)
-    jogos: list[list[int]] = []
-    for _ in range(qtd):
-        tent = 0
-        while True:
-            tent += 1
-            dezenas = np.random.choice(universe, size=tam, replace=False).tolist()
-            if not tem_sequencia_longa(dezenas, limite=limite):
-                jogos.append(sorted(dezenas))
-                break
-            if tent > 100:
-                jogos.append(sorted(dezenas))
-                break
-    return jogos
+    qq = min(q_quentes, tam)
+    qf = min(q_frias, max(0, tam - qq))
+    qn = min(q_neutras, max(0, tam - qq - qf))
+
+    partes = [
+        amostrar_sem_reposicao(pool.astype(np.int8), qtd, min(k, len(pool)), rng)
+        for pool, k in ((quentes, qq), (frias, qf), (neutras, qn))
+        if k > 0 and len(pool) > 0
+    ]
+    m = np.concatenate(partes, axis=1) if partes else np.empty((qtd, 0), dtype=np.int8)
+
+    falta = tam - m.shape[1]
+    if falta > 0:
+        # Completa com dezenas ainda não usadas: chave +inf nas já escolhidas
+        chaves = rng.random((qtd, n_universo), dtype=np.float32)
+        if m.shape[1]:
+            np.put_along_axis(chaves, m.astype(np.intp) - 1, np.inf, axis=1)
+        extra = np.argpartition(chaves, falta - 1, axis=1)[:, :falta] + 1
+        m = np.concatenate([m, extra.astype(np.int8)], axis=1)
+
+    m.sort(axis=1)
+    return m
+
+def gerar_aleatorio_puro(qtd: int, tam: int, n_universo: int, rng: np.random.Generator | None = None) -> list[list[int]]:
+    return matriz_para_listas(gerar_matriz_aleatoria(qtd, tam, n_universo, rng))
+
+def gerar_balanceado_par_impar(qtd: int, tam: int, n_universo: int, rng: np.random.Generator | None = None) -> list[list[int]]:
+    return matriz_para_listas(gerar_balanceado_par_impar_matriz(qtd, tam, n_universo, rng))
+
+def gerar_quentes_frias_mix(
+    qtd: int,
+    tam: int,
+    freq_df: pd.DataFrame,
+    n_universo: int,
+    proporcao: tuple[int,int,int],
+    rng: np.random.Generator | None = None,
+) -> list[list[int]]:
+    return matriz_para_listas(gerar_quentes_frias_mix_matriz(qtd, tam, freq_df, n_universo, proporcao, rng))
+
+def gerar_sem_sequencias(qtd: int, tam: int, n_universo: int, limite: int, rng: np.random.Generator | None = None) -> list[list[int]]:
+    return matriz_para_listas(gerar_sem_sequencias_matriz(qtd, tam, n_universo, limite, rng))
 
 def filtrar_jogo(jogo: list[int], dezenas_fixas: list[int], dezenas_proibidas: list[int], soma_min: int|None, soma_max: int|None) -> bool:
     s = set(jogo)
@@ -119,19 +225,529 @@ def filtrar_jogo(jogo: list[int], dezenas_fixas: list[int], dezenas_proibidas: l
         return False
     return True
 
+@dataclass(frozen=True)
+class ResultadoAmostragem:
+    jogos: np.ndarray  # int8 (n, tam), linhas ordenadas
+    geradas: int
+    aceitas: int
+    descartadas_pacote: int = 0  # passaram nos filtros, mas repetiam/sobrepunham jogos do pacote
+    saturado: bool = False  # parou porque quase nada do que a estratégia gera cabe mais no pacote
+
+    @property
+    def taxa_aceitacao(self) -> float:
+        return self.aceitas / self.geradas if self.geradas else 0.0
+
+
+LIMITE_BLOCOS = 512  # C(tam, max_comum + 1) acima disso: índice por faixas (casa dos pombos)
+ACEITOS_POR_CHAVE = 80  # pacote maior que isto × chaves por jogo: índice por faixas sai mais barato
+SATURACAO = 1e-3  # menos que esta fração dos candidatos válidos cabe no pacote: saturado
+MIN_SATURACAO = 50_000  # candidatos válidos observados antes de declarar saturação
+BITS_TABELA = 27  # universos até aqui (Lotofácil) usam tabela de bits endereçada pela máscara (16 MB)
+_ELEMENTOS_LOTE = 2_000_000  # linhas × blocos por passo (memória dos temporários uint64)
+
+
+@lru_cache(maxsize=32)
+def _subconjuntos(tam: int, k: int) -> np.ndarray:
+    return np.array(list(combinations(range(tam), k)), dtype=np.intp).reshape(-1, k)
+
+
+class _ConjuntoMascaras:
+    """
+    Conjunto de máscaras uint64. Universo pequeno: tabela de bits com a própria máscara como
+    endereço (consulta O(1), exata). Senão: array ordenado + busca binária.
+    """
+
+    def __init__(self, n_universo: int):
+        self._tabela = np.zeros(1 << max(n_universo - 3, 0), dtype=np.uint8) if n_universo <= BITS_TABELA else None
+        self._ordenado = np.zeros(0, dtype=np.uint64)
+
+    def contem(self, v: np.ndarray) -> np.ndarray:
+        if self._tabela is not None:
+            return ((self._tabela[v >> np.uint64(3)] >> (v & np.uint64(7)).astype(np.uint8)) & 1).astype(bool)
+        if len(self._ordenado) == 0:
+            return np.zeros(v.shape, dtype=bool)
+        pos = np.minimum(np.searchsorted(self._ordenado, v), len(self._ordenado) - 1)
+        return self._ordenado[pos] == v
+
+    def inserir(self, v: np.ndarray) -> None:
+        v = v.ravel()
+        if self._tabela is not None:
+            np.bitwise_or.at(self._tabela, v >> np.uint64(3), np.left_shift(1, v & np.uint64(7)).astype(np.uint8))
+        else:
+            # duas sequências já ordenadas: o sort estável (timsort) só faz a intercalação
+            self._ordenado = np.sort(np.concatenate([self._ordenado, np.sort(v)]), kind="stable")
+
+
+class _IndiceChaves:
+    """
+    Multimapa chave uint64 -> posição, em níveis ordenados: cada inserção vira um nível e níveis de
+    tamanho parecido são intercalados (como num contador binário), então cada chave é reordenada
+    O(log n) vezes no total, não a cada lote. A busca percorre os níveis (O(log n) deles).
+    """
+
+    def __init__(self) -> None:
+        self._niveis: list[tuple[np.ndarray, np.ndarray]] = []
+
+    def __len__(self) -> int:
+        return sum(len(c) for c, _ in self._niveis)
+
+    def inserir(self, chaves: np.ndarray, donos: np.ndarray) -> None:
+        ordem = np.argsort(chaves, kind="stable")
+        chaves, donos = chaves[ordem], donos[ordem]
+        while self._niveis and len(self._niveis[-1][0]) <= 2 * len(chaves):
+            c, d = self._niveis.pop()
+            # duas sequências já ordenadas: o sort estável (timsort) só faz a intercalação
+            todas = np.concatenate([c, chaves])
+            ordem = np.argsort(todas, kind="stable")
+            chaves, donos = todas[ordem], np.concatenate([d, donos])[ordem]
+        self._niveis.append((chaves, donos))
+
+    def buscar(self, chaves: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """(i, dono) para cada ocorrência de `chaves[i]` no índice."""
+        # consultas em ordem: a busca binária reaproveita a posição anterior (bem menos cache miss)
+        ordem = np.argsort(chaves)
+        chaves = chaves[ordem]
+        linhas, donos = [np.zeros(0, dtype=np.int64)], [np.zeros(0, dtype=np.int64)]
+        for c, d in self._niveis:
+            ini = np.searchsorted(c, chaves, side="left")
+            achou = c[np.minimum(ini, len(c) - 1)] == chaves
+            ini = ini[achou]
+            qtd = np.searchsorted(c, chaves[achou], side="right") - ini
+            # expande cada faixa [ini, ini + qtd) de chaves iguais em posições de `d`
+            base = np.repeat(ini - np.cumsum(qtd) + qtd, qtd)
+            donos.append(d[base + np.arange(int(qtd.sum()))])
+            linhas.append(np.repeat(ordem[achou], qtd))
+        return np.concatenate(linhas), np.concatenate(donos)
+
+
+def _faixas_pombal(tam: int, n_universo: int, max_comum: int) -> tuple[np.ndarray, int, int, float]:
+    """
+    Divide o universo em `b` faixas (dezena d na faixa (d - 1) % b). Dois jogos com mais de
+    max_comum dezenas em comum dividem ao menos q = ceil((max_comum + 1) / b) numa mesma faixa
+    (casa dos pombos): os q-subconjuntos por faixa são chaves sem falso negativo. Usa o menor
+    `b` cujo número esperado de chaves por jogo (hipergeométrica) cabe em LIMITE_BLOCOS.
+    Retorna (faixa de cada dezena, posição 0 == dezena 1; b; q; chaves esperadas por jogo).
+    """
+    k = max_comum + 1
+    for b in range(2, k + 1):
+        q = -(-k // b)
+        tamanhos = [len(range(j, n_universo, b)) for j in range(b)]
+        esperado = math.comb(tam, q) * sum(math.comb(t, q) for t in tamanhos) / math.comb(n_universo, q)
+        if esperado <= LIMITE_BLOCOS:
+            break
+    return np.arange(n_universo) % b, b, q, esperado
+
+
+def _repete_anterior(chaves: np.ndarray) -> np.ndarray:
+    """(n, s) -> (n,): a linha tem alguma chave que já aparece numa linha anterior."""
+    n, s = chaves.shape
+    plano = chaves.ravel()
+    ordem = np.argsort(plano, kind="stable")  # estável: dentro de cada valor, linhas em ordem
+    linha = ordem // s
+    inicio = np.r_[True, plano[ordem][1:] != plano[ordem][:-1]]
+    primeira = linha[np.maximum.accumulate(np.where(inicio, np.arange(len(ordem)), 0))]
+    out = np.zeros(n, dtype=bool)
+    out[linha[linha != primeira]] = True
+    return out
+
+
+@dataclass
+class MontadorPacote:
+    """
+    Pacote sem jogos repetidos e com no máximo `max_comum` dezenas em comum entre dois jogos
+    quaisquer (None = só sem repetição). Compartilhado entre chamadas (ex.: Misto), vale para o
+    pacote inteiro.
+
+    Unicidade: a máscara uint64 do jogo é a chave num conjunto de máscaras (`_ConjuntoMascaras`).
+    Sobreposição > max_comum equivale a dividir um subconjunto de max_comum + 1 dezenas; cada jogo
+    aceito registra as máscaras desses subconjuntos (blocos) e um candidato só entra se nenhum
+    bloco dele já estiver registrado — custo por candidato independe do tamanho do pacote. Quando
+    há blocos demais por jogo (LIMITE_BLOCOS), as chaves são q-subconjuntos dentro de faixas do
+    universo (`_faixas_pombal`): só os jogos aceitos que dividem alguma chave com o candidato são
+    conferidos por popcount, não o pacote inteiro. Enquanto o pacote é pequeno (ACEITOS_POR_CHAVE),
+    a comparação direta com todos os aceitos é mais barata e o índice nem é montado.
+    Dentro de um mesmo lote a regra é conservadora: sai quem conflita com qualquer linha anterior.
+    """
+
+    tam: int
+    n_universo: int
+    max_comum: int | None = None
+    descartados: int = field(default=0, init=False)  # candidatos recusados (repetidos/sobrepostos)
+
+    def __post_init__(self) -> None:
+        if self.max_comum is not None and self.max_comum < 0:
+            raise ValueError("Máximo de dezenas em comum não pode ser negativo.")
+        if self.max_comum is not None and self.max_comum >= self.tam:
+            self.max_comum = None  # jogos distintos já dividem no máximo tam - 1
+        self._jogos = _ConjuntoMascaras(self.n_universo)
+        self._blocos = _ConjuntoMascaras(self.n_universo)
+        self._n = 0
+        if self.max_comum is not None and not self.por_blocos:
+            self._faixa, self._n_faixas, self._q, chaves = _faixas_pombal(self.tam, self.n_universo, self.max_comum)
+            # pacote pequeno: comparar com todos os aceitos custa menos que gerar as chaves do candidato
+            self._min_indice = int(ACEITOS_POR_CHAVE * chaves)
+            self._aceitas = np.zeros(0, dtype=np.uint64)  # máscaras dos aceitos, na ordem
+            self._pendentes: list[np.ndarray] = []  # jogos aceitos antes de o índice existir
+            self._indice: _IndiceChaves | None = None  # chave -> posição em _aceitas (None: não montado)
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def por_blocos(self) -> bool:
+        return self.max_comum is not None and math.comb(self.tam, self.max_comum + 1) <= LIMITE_BLOCOS
+
+    def _chaves_faixas(self, m: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """(chaves, linha): máscaras dos q-subconjuntos de cada jogo dentro de cada faixa."""
+        faixa = self._faixa[m.astype(np.intp) - 1]
+        bits = np.left_shift(np.uint64(1), m.astype(np.uint64) - np.uint64(1))
+        chaves, linhas = [], []
+        for j in range(self._n_faixas):
+            na_faixa = faixa == j
+            cont = na_faixa.sum(axis=1)
+            for c in np.unique(cont[cont >= self._q]):
+                sel = np.flatnonzero(cont == c)
+                dz = bits[sel][na_faixa[sel]].reshape(len(sel), c)  # c dezenas da faixa, em ordem
+                sub = _subconjuntos(int(c), self._q)
+                ch = dz[:, sub[:, 0]]
+                for i in range(1, self._q):
+                    ch = ch | dz[:, sub[:, i]]
+                chaves.append(ch.ravel())
+                linhas.append(np.repeat(sel, len(sub)))
+        if not chaves:
+            return np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.int64)
+        return np.concatenate(chaves), np.concatenate(linhas)
+
+    def _registrar_aceitos(self, m: np.ndarray, mascaras: np.ndarray) -> None:
+        inicio = len(self._aceitas)
+        self._aceitas = np.concatenate([self._aceitas, mascaras])
+        if self._indice is None:
+            self._pendentes.append(m)
+            if len(self._aceitas) < self._min_indice:
+                return
+            # o pacote passou do ponto de equilíbrio: monta o índice 1x com todos os aceitos
+            m, inicio = np.concatenate(self._pendentes), 0
+            self._pendentes.clear()
+            self._indice = _IndiceChaves()
+
+        chaves, linhas = self._chaves_faixas(m)
+        self._indice.inserir(chaves, linhas + inicio)
+
+    def _conflita_aceitos(self, m: np.ndarray, mascaras: np.ndarray) -> np.ndarray:
+        """(n,) candidato sobrepõe demais algum aceito; com o índice, confere só quem divide alguma chave."""
+        ruim = np.zeros(len(m), dtype=bool)
+        if self._indice is None:
+            for ini in range(0, len(self._aceitas), 8192):
+                ruim |= self._sobrepoe(mascaras, self._aceitas[ini : ini + 8192]).any(axis=1)
+            return ruim
+        chaves, linhas = self._chaves_faixas(m)
+        i, donos = self._indice.buscar(chaves)
+        linhas = linhas[i]
+        conflito = popcount(mascaras[linhas] & self._aceitas[donos]) > self.max_comum
+        ruim[linhas[conflito]] = True
+        return ruim
+
+    def _blocos_de(self, m: np.ndarray, mascaras: np.ndarray) -> np.ndarray:
+        # (n, C(tam, k)) máscaras dos k-subconjuntos de cada jogo, k = max_comum + 1; com k > tam/2
+        # sai mais barato tirar da máscara do jogo as tam - k dezenas que ficam de fora
+        bits = np.left_shift(np.uint64(1), m.astype(np.uint64) - np.uint64(1))
+        k = self.max_comum + 1
+        fora = 2 * k > self.tam
+        sub = _subconjuntos(self.tam, self.tam - k if fora else k)
+        if fora:
+            out = np.repeat(mascaras[:, None], len(sub), axis=1)
+            for j in range(sub.shape[1]):
+                out ^= bits[:, sub[:, j]]
+            return out
+        out = bits[:, sub[:, 0]]
+        for j in range(1, sub.shape[1]):
+            out |= bits[:, sub[:, j]]
+        return out
+
+    def _sobrepoe(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """(len(a), len(b)) jogos com mais de max_comum dezenas em comum."""
+        return popcount(a[:, None] & b[None, :]) > self.max_comum
+
+    def _novos(self, m: np.ndarray, mascaras: np.ndarray) -> tuple[np.ndarray, np.ndarray | None]:
+        ok = ~self._jogos.contem(mascaras)
+        sel = np.flatnonzero(ok)
+        ok[sel[_repete_anterior(mascaras[sel, None])]] = False
+        if self.max_comum is None or not ok.any():
+            return ok, None
+
+        sel = np.flatnonzero(ok)
+        if self.por_blocos:
+            blocos = self._blocos_de(m[sel], mascaras[sel])
+            ruim = self._blocos.contem(blocos).any(axis=1)
+            livres = np.flatnonzero(~ruim)
+            ruim[livres[_repete_anterior(blocos[livres])]] = True
+            ok[sel[ruim]] = False
+            return ok, blocos[~ruim]
+
+        cand = mascaras[sel]
+        # dentro do lote (limitado a `passo` linhas) a comparação direta é barata
+        ruim = np.tril(self._sobrepoe(cand, cand), -1).any(axis=1)
+        ruim |= self._conflita_aceitos(m[sel], cand)
+        ok[sel[ruim]] = False
+        return ok, None
+
+    @medido("geracao.pacote")
+    def adicionar(self, m: np.ndarray, limite: int | None = None) -> np.ndarray:
+        """Filtra as linhas de `m` que cabem no pacote (na ordem), até `limite`, e as registra."""
+        m = np.asarray(m)
+        if m.ndim != 2 or m.shape[1] != self.tam:
+            raise ValueError(f"Esperava jogos de {self.tam} dezenas; recebi matriz {m.shape}.")
+        if self.por_blocos:
+            passo = max(1, _ELEMENTOS_LOTE // len(_subconjuntos(self.tam, self.max_comum + 1)))
+        else:
+            passo = 1024 if self.max_comum is not None else max(len(m), 1)
+
+        partes: list[np.ndarray] = []
+        total = descartados = 0
+        for ini in range(0, len(m), passo):
+            if limite is not None and total >= limite:
+                break
+            bloco = m[ini : ini + passo]
+            mascaras = mascaras_matriz(bloco)
+            ok, blocos = self._novos(bloco, mascaras)
+            novos = np.flatnonzero(ok)
+            descartados += len(bloco) - len(novos)
+            n = len(novos) if limite is None else min(len(novos), limite - total)
+
+            self._jogos.inserir(mascaras[novos[:n]])
+            if blocos is not None:
+                self._blocos.inserir(blocos[:n])
+            elif self.max_comum is not None and n:
+                self._registrar_aceitos(bloco[novos[:n]], mascaras[novos[:n]])
+            partes.append(bloco[novos[:n]])
+            total += n
+        self._n += total
+        self.descartados += descartados
+        contar("geracao.pacote_descartados", descartados)
+        return np.concatenate(partes, axis=0) if partes else m[:0]
+
+
+def _lut(dezenas, n_universo: int) -> np.ndarray:
+    lut = np.zeros(n_universo + 1, dtype=bool)
+    lut[list(dezenas)] = True
+    return lut
+
+def _faixa_possivel(fixas: np.ndarray, livres: np.ndarray, k: int, lut: np.ndarray) -> tuple[int, int]:
+    # Menor/maior contagem atingível de uma propriedade (par, primo, baixo, ...) com `k` livres
+    cf = int(lut[fixas].sum())
+    com = int(lut[livres].sum())
+    sem = len(livres) - com
+    return cf + max(0, k - sem), cf + min(k, com)
+
+def validar_restricoes(tam: int, n_universo: int, r: Restricoes, limite_baixo: int) -> None:
+    """Falha rápido (ValueError) quando as restrições são inviáveis por limites simples."""
+    fixas = np.array(sorted(set(r.dezenas_fixas)), dtype=np.int64)
+    proib = set(r.dezenas_proibidas)
+    if set(fixas.tolist()) & proib:
+        raise ValueError(f"Conflito fixas/proibidas: {sorted(set(fixas.tolist()) & proib)}")
+    if len(fixas) > tam:
+        raise ValueError(f"{len(fixas)} dezenas fixas não cabem em jogos de {tam} dezenas.")
+
+    livres = np.array([d for d in range(1, n_universo + 1) if d not in proib and d not in set(fixas.tolist())], dtype=np.int64)
+    k = tam - len(fixas)
+    if k > len(livres):
+        raise ValueError(f"Sobram só {len(fixas) + len(livres)} dezenas permitidas para jogos de {tam}.")
+
+    soma_lo = int(fixas.sum() + livres[:k].sum())
+    soma_hi = int(fixas.sum() + (livres[len(livres) - k:].sum() if k else 0))
+    if (r.soma_min is not None and r.soma_min > soma_hi) or (r.soma_max is not None and r.soma_max < soma_lo):
+        raise ValueError(f"Faixa de soma inviável: com fixas/proibidas a soma fica entre {soma_lo} e {soma_hi}.")
+
+    checks = [
+        ("Pares", r.pares_min, r.pares_max, _lut(range(2, n_universo + 1, 2), n_universo)),
+        ("Primos", r.primos_min, r.primos_max, _lut([p for p in PRIMOS_ATE_60 if p <= n_universo], n_universo)),
+        ("Baixos", r.baixos_min, r.baixos_max, _lut(range(1, min(limite_baixo, n_universo) + 1), n_universo)),
+        ("Repetidas do último", None, r.max_rep_ultimo, _lut(r.dezenas_ultimo, n_universo)),
+    ]
+    for nome, lo, hi, lut in checks:
+        pmin, pmax = _faixa_possivel(fixas, livres, k, lut)
+        if (lo is not None and lo > pmax) or (hi is not None and hi < pmin):
+            raise ValueError(f"{nome}: faixa pedida inviável; com fixas/proibidas fica entre {pmin} e {pmax}.")
+
+@medido("filtragem")
+def mascara_restricoes(m: np.ndarray, r: Restricoes, limite_baixo: int) -> np.ndarray:
+    """Equivalente vetorizado de filtrar_jogo + heurísticas da página, por linha de `m`."""
+    n_universo = 64  # tabelas de consulta cobrem qualquer modalidade
+    ok = np.ones(m.shape[0], dtype=bool)
+    mi = m.astype(np.intp)
+
+    if r.dezenas_fixas:
+        ok &= _lut(r.dezenas_fixas, n_universo)[mi].sum(axis=1) == len(set(r.dezenas_fixas))
+    if r.dezenas_proibidas:
+        ok &= ~_lut(r.dezenas_proibidas, n_universo)[mi].any(axis=1)
+
+    def faixa(v: np.ndarray, lo: int | None, hi: int | None) -> None:
+        nonlocal ok
+        if lo is not None:
+            ok &= v >= lo
+        if hi is not None:
+            ok &= v <= hi
+
+    faixa(m.sum(axis=1, dtype=np.int64), r.soma_min, r.soma_max)
+    faixa(pares_matriz(m), r.pares_min, r.pares_max)
+    faixa(primos_matriz(m), r.primos_min, r.primos_max)
+    faixa(baixos_matriz(m, limite_baixo), r.baixos_min, r.baixos_max)
+    if r.max_rep_ultimo is not None and r.dezenas_ultimo:
+        faixa(_lut(r.dezenas_ultimo, n_universo)[mi].sum(axis=1), None, r.max_rep_ultimo)
+    return ok
+
+def amostrar_com_restricoes(
+    qtd: int,
+    tam: int,
+    n_universo: int,
+    r: Restricoes,
+    *,
+    limite_baixo: int,
+    gerador: Callable[[int], np.ndarray] | None = None,
+    aceitar: Callable[[np.ndarray], np.ndarray] | None = None,
+    rng: np.random.Generator | None = None,
+    pacote: MontadorPacote | None = None,
+    lote_max: int = 200_000,
+    max_rodadas: int = 50,
+) -> ResultadoAmostragem:
+    """
+    Gera exatamente `qtd` jogos que respeitam `r` (quando possível).
+
+    Sem `gerador`: as fixas entram em todo jogo e as proibidas saem do universo; o resto é
+    sorteado em lote. Com `gerador` (ex.: Quentes/Frias), os lotes vêm dele e passam pela máscara.
+    `aceitar` adiciona a regra própria da estratégia (ex.: sem sequências longas).
+    Com `pacote`, só entram jogos que não repetem nem sobrepõem demais os já aceitos nele.
+    Os lotes são superdimensionados pela taxa de aceitação observada até completar a cota.
+    """
+    validar_restricoes(tam, n_universo, r, limite_baixo)
+    if pacote is not None and pacote.tam != tam:
+        raise ValueError(f"Pacote montado para jogos de {pacote.tam} dezenas, não {tam}.")
+    rng = _get_rng(rng)
+    descartadas_antes = pacote.descartados if pacote is not None else 0
+
+    fixas = np.array(sorted(set(r.dezenas_fixas)), dtype=np.int8)
+    excluidas = set(r.dezenas_fixas) | set(r.dezenas_proibidas)
+    livres = np.array([d for d in range(1, n_universo + 1) if d not in excluidas], dtype=np.int8)
+
+    def lote(n: int) -> np.ndarray:
+        if gerador is not None:
+            return gerador(n)
+        m = np.concatenate([np.broadcast_to(fixas, (n, len(fixas))), amostrar_sem_reposicao(livres, n, tam - len(fixas), rng)], axis=1)
+        m.sort(axis=1)
+        return m
+
+    aceitos: list[np.ndarray] = []
+    geradas = aceitas = validos = 0
+    validos_janela = aceitos_janela = 0  # desde a última vez que o pacote ainda aceitava bem
+    saturado = False
+    for _ in range(max_rodadas):
+        faltam = qtd - aceitas
+        if faltam <= 0:
+            break
+        taxa = (aceitas / geradas) if aceitas else (1.0 if geradas == 0 else 1.0 / geradas)
+        n = int(min(lote_max, max(faltam, np.ceil(faltam / max(taxa, 1e-9) * 1.2))))
+        if pacote is not None and validos:
+            # com pacote, a taxa cai quando ele satura: rodadas de ~MIN_SATURACAO válidos bastam para notar
+            n = min(n, max(faltam, int(np.ceil(MIN_SATURACAO * geradas / validos))))
+
+        m = lote(n)
+        ok = mascara_restricoes(m, r, limite_baixo)
+        if aceitar is not None:
+            ok &= aceitar(m)
+
+        geradas += n
+        validos += int(ok.sum())
+        bons = m[ok][:faltam] if pacote is None else pacote.adicionar(m[ok], limite=faltam)
+        aceitas += len(bons)
+        aceitos.append(bons)
+        if aceitas == 0 and geradas >= 5 * lote_max:
+            break
+        # pacote saturado: de MIN_SATURACAO candidatos que passam nos filtros, quase nada cabe nele
+        if pacote is not None:
+            validos_janela += int(ok.sum())
+            aceitos_janela += len(bons)
+            if validos_janela >= MIN_SATURACAO:
+                if aceitos_janela < SATURACAO * validos_janela:
+                    saturado = True
+                    break
+                validos_janela = aceitos_janela = 0
+
+    # pacote já cheio (ex.: Misto) não é erro: a estratégia só não acrescenta jogos
+    descartadas = pacote.descartados - descartadas_antes if pacote is not None else 0
+    if aceitas == 0 and not descartadas:
+        raise ValueError(
+            f"Nenhum jogo aceito em {geradas:,} tentativas: restrições (combinadas) provavelmente inviáveis."
+        )
+    contar("geracao.jogos_sorteados", geradas)
+    contar("geracao.jogos_aceitos", aceitas)
+    jogos = np.concatenate(aceitos, axis=0)
+    return ResultadoAmostragem(
+        jogos=jogos, geradas=geradas, aceitas=aceitas, descartadas_pacote=descartadas, saturado=saturado
+    )
+
+ESTRATEGIAS = ("Aleatório puro", "Balanceado par/ímpar", "Quentes/Frias/Mix", "Sem sequências longas")
+
+@medido("geracao")
+def gerar_estrategia(
+    estrategia: str,
+    qtd: int,
+    tam: int,
+    n_universo: int,
+    r: Restricoes,
+    *,
+    limite_baixo: int,
+    freq_df: pd.DataFrame | None = None,
+    proporcao: tuple[int, int, int] = (5, 5, 0),
+    limite_seq: int = 3,
+    rng: np.random.Generator | None = None,
+    pacote: MontadorPacote | None = None,
+) -> ResultadoAmostragem:
+    """
+    Estratégia nomeada amostrada já dentro dos filtros: a cota `qtd` é atingida sem perdas pós-filtro.
+    Com `pacote` (compartilhado no Misto), os jogos também saem sem repetição e com sobreposição limitada.
+    """
+    if estrategia not in ESTRATEGIAS:
+        raise ValueError(f"Estratégia desconhecida: {estrategia}")
+    if estrategia == "Quentes/Frias/Mix" and freq_df is None:
+        raise ValueError("Quentes/Frias/Mix precisa das frequências do histórico.")
+    rng = _get_rng(rng)
+
+    def balanceado(m):
+        p = pares_matriz(m)
+        return (p > 0) & (p < tam)
+
+    def quentes_frias(n: int):
+        return gerar_quentes_frias_mix_matriz(n, tam, freq_df, n_universo, proporcao, rng)
+
+    def sem_sequencias(m):
+        return ~seq_longa_matriz(m, limite=limite_seq)
+
+    gerador = quentes_frias if estrategia == "Quentes/Frias/Mix" else None
+    aceitar = {"Balanceado par/ímpar": balanceado, "Sem sequências longas": sem_sequencias}.get(estrategia)
+
+    return amostrar_com_restricoes(
+        qtd, tam, n_universo, r, limite_baixo=limite_baixo, gerador=gerador, aceitar=aceitar, rng=rng, pacote=pacote
+    )
+
 def preco_aposta(n_dezenas: int, n_min_base: int, preco_base: float) -> float:
     if n_dezenas < n_min_base:
         return 0.0
     return math.comb(n_dezenas, n_min_base) * preco_base
 
-def custo_total(jogos: list[list[int]], n_min_base: int, preco_base: float) -> float:
+def _tamanhos(jogos: list[list[int]] | GamePack):
+    # GamePack: usa o array de tamanhos, sem materializar as listas
+    return jogos.tamanhos.tolist() if isinstance(jogos, GamePack) else (len(j) for j in jogos)
+
+def custo_total(jogos: list[list[int]] | GamePack, n_min_base: int, preco_base: float) -> float:
+    if isinstance(jogos, GamePack):
+        return float(jogos.custos(n_min_base, preco_base).sum())
     return sum(preco_aposta(len(j), n_min_base, preco_base) for j in jogos)
 
-def prob_premio_maximo_aprox(jogos: list[list[int]], n_min_base: int, comb_target: int) -> float:
+def prob_premio_maximo_aprox(jogos: list[list[int]] | GamePack, n_min_base: int, comb_target: int) -> float:
     prob_nao = 1.0
-    for j in jogos:
-        if len(j) < n_min_base:
+    for t in _tamanhos(jogos):
+        if t < n_min_base:
             continue
-        p = math.comb(len(j), n_min_base) / comb_target
+        p = math.comb(t, n_min_base) / comb_target
         prob_nao *= (1.0 - p)
     return 1.0 - prob_nao
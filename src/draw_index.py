@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from .instrumentation import medido
+
+# 60 (Mega-Sena) e 25 (Lotofácil) bits cabem em uint64: bit (d - 1) == dezena d
+_BITS = np.uint64(1) << np.arange(64, dtype=np.uint64)
+
+
+def _popcount_lut(x: np.ndarray) -> np.ndarray:
+    lut = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+    b = np.ascontiguousarray(x).view(np.uint8).reshape(*x.shape, x.dtype.itemsize)
+    return lut[b].sum(axis=-1, dtype=np.uint8)
+
+
+def popcount(x: np.ndarray) -> np.ndarray:
+    """Contagem de bits por elemento (uint8). Usa np.bitwise_count quando disponível (NumPy 2)."""
+    x = np.asarray(x)
+    if x.dtype.kind != "u":
+        x = x.astype(np.uint64)
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(x)
+    return _popcount_lut(x)
+
+
+def mascara_jogo(dezenas: Iterable[int]) -> np.uint64:
+    m = np.uint64(0)
+    for d in dezenas:
+        m |= _BITS[int(d) - 1]
+    return m
+
+
+def mascaras_matriz(m: np.ndarray) -> np.ndarray:
+    """Matriz (n, k) de dezenas (1-based; valores <= 0 são ignorados) -> uint64 (n,)."""
+    m = np.asarray(m)
+    if m.size == 0:
+        return np.zeros(m.shape[0], dtype=np.uint64)
+    bits = np.where(m > 0, _BITS[np.clip(m.astype(np.intp) - 1, 0, 63)], np.uint64(0))
+    return np.bitwise_or.reduce(bits, axis=1)
+
+
+def matriz_incidencia(bloco: np.ndarray, n_universo: int) -> np.ndarray:
+    # (n_concursos, n_universo) uint8; coluna j == dezena j+1
+    inc = np.zeros((bloco.shape[0], n_universo), dtype=np.uint8)
+    linhas = np.repeat(np.arange(bloco.shape[0]), bloco.shape[1])
+    inc[linhas, bloco.ravel().astype(np.intp) - 1] = 1
+    return inc
+
+
+@dataclass(frozen=True)
+class DrawIndex:
+    """
+    Índice do histórico montado 1x a partir da saída de normalizar_megasena/normalizar_lotofacil.
+    Linhas ordenadas por concurso; cada concurso vira uma máscara uint64 + uma linha de incidência.
+    """
+
+    n_universo: int
+    n_dezenas_sorteio: int
+    concursos: np.ndarray  # int64 (n,)
+    mascaras: np.ndarray  # uint64 (n,)
+    incidencia: np.ndarray  # uint8 (n, n_universo)
+
+    @classmethod
+    @medido("analytics.draw_index")
+    def from_history(cls, df: pd.DataFrame, n_dezenas_sorteio: int, n_universo: int) -> "DrawIndex":
+        dezenas_cols = [f"d{i}" for i in range(1, n_dezenas_sorteio + 1)]
+        concursos = df["concurso"].to_numpy(dtype=np.int64)
+        bloco = df[dezenas_cols].to_numpy(dtype=np.int64)
+
+        if len(concursos) > 1 and not np.all(concursos[1:] >= concursos[:-1]):
+            ordem = np.argsort(concursos, kind="stable")
+            concursos, bloco = concursos[ordem], bloco[ordem]
+
+        idx = cls(
+            n_universo=int(n_universo),
+            n_dezenas_sorteio=int(n_dezenas_sorteio),
+            concursos=concursos,
+            mascaras=mascaras_matriz(bloco),
+            incidencia=matriz_incidencia(bloco, n_universo),
+        )
+        for arr in (idx.concursos, idx.mascaras, idx.incidencia):
+            arr.flags.writeable = False
+        return idx
+
+    def __len__(self) -> int:
+        return int(self.concursos.shape[0])
+
+    # ---- agregados (calculados 1x por índice)
+    @cached_property
+    def frequencias(self) -> np.ndarray:
+        """Frequência por dezena (posição 0 == dezena 1)."""
+        return self.incidencia.sum(axis=0, dtype=np.int64)
+
+    @cached_property
+    def ultima_posicao(self) -> np.ndarray:
+        """Linha da última ocorrência de cada dezena; -1 se nunca saiu."""
+        n = len(self)
+        if n == 0:
+            return np.full(self.n_universo, -1, dtype=np.int64)
+        pos = n - 1 - self.incidencia[::-1].argmax(axis=0)
+        return np.where(self.incidencia.any(axis=0), pos, -1).astype(np.int64)
+
+    @cached_property
+    def ultimo_visto(self) -> np.ndarray:
+        """Concurso da última ocorrência de cada dezena; -1 se nunca saiu."""
+        pos = self.ultima_posicao
+        if len(self) == 0:
+            return pos
+        return np.where(pos >= 0, self.concursos[np.maximum(pos, 0)], -1)
+
+    @cached_property
+    def ocorrencias(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Linhas em que cada dezena saiu, agrupadas por dezena (CSR): as da dezena d são
+        `linhas[inicio[d - 1]:inicio[d]]`, em ordem crescente.
+        """
+        linha, col = np.divmod(np.flatnonzero(self.incidencia.ravel()), self.n_universo)
+        ordem = np.argsort(col.astype(np.uint8), kind="stable")  # radix: mantém a ordem das linhas
+        inicio = np.zeros(self.n_universo + 1, dtype=np.int64)
+        np.cumsum(np.bincount(col, minlength=self.n_universo), out=inicio[1:])
+        linhas = linha[ordem]
+        linhas.flags.writeable = False
+        inicio.flags.writeable = False
+        return linhas, inicio
+
+    @cached_property
+    def acumulado(self) -> np.ndarray:
+        """
+        Contagens acumuladas int32 (n + 1, n_universo): linha i = frequências dos i primeiros
+        concursos. Qualquer janela sai de uma subtração de duas linhas.
+        """
+        out = np.zeros((len(self) + 1, self.n_universo), dtype=np.int32)
+        np.cumsum(self.incidencia, axis=0, dtype=np.int32, out=out[1:])
+        out.flags.writeable = False
+        return out
+
+    # ---- janelas (O(n_universo) por consulta sobre `acumulado`)
+    def frequencias_janela(self, inicio: int = 0, fim: int | None = None) -> np.ndarray:
+        """Frequência por dezena nos concursos das linhas [inicio, fim); índices como em fatias."""
+        a, b, _ = slice(inicio, fim).indices(len(self))
+        acum = self.acumulado
+        return (acum[max(a, b)] - acum[a]).astype(np.int64)
+
+    def frequencias_ultimos(self, janela: int) -> np.ndarray:
+        """Frequência por dezena nos últimos `janela` concursos (todos, se houver menos)."""
+        if janela < 1:
+            raise ValueError("Janela deve ter ao menos 1 concurso.")
+        return self.frequencias_janela(max(len(self) - janela, 0))
+
+    def frequencias_moveis(self, janela: int) -> np.ndarray:
+        """(n - janela + 1, n_universo): frequência na janela que termina em cada concurso, a partir do `janela`-ésimo."""
+        if not 1 <= janela <= len(self):
+            raise ValueError(f"Janela deve estar entre 1 e {len(self)} concursos.")
+        acum = self.acumulado
+        return acum[janela:] - acum[:-janela]
+
+    def dezenas_do_concurso(self, pos: int = -1) -> list[int]:
+        return (np.flatnonzero(self.incidencia[pos]) + 1).tolist()
+
+    def ultimas_dezenas(self) -> set[int]:
+        return set(self.dezenas_do_concurso(-1))
+
+    # ---- consultas por máscara
+    def overlap(self, jogo: Iterable[int]) -> np.ndarray:
+        """Acertos do jogo em cada concurso (popcount de AND)."""
+        return popcount(self.mascaras & mascara_jogo(jogo))
+
+    def contem_todas(self, dezenas: Iterable[int]) -> np.ndarray:
+        m = mascara_jogo(dezenas)
+        return (self.mascaras & m) == m
+
+    def contem_alguma(self, dezenas: Iterable[int]) -> np.ndarray:
+        return (self.mascaras & mascara_jogo(dezenas)) != 0
+
+    def contagem_mascara(self, mascara: np.uint64 | int) -> np.ndarray:
+        """Quantas dezenas de `mascara` cada concurso contém (ex.: pares, baixos)."""
+        return popcount(self.mascaras & np.uint64(mascara)).astype(np.int64)
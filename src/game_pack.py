@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import hashlib
+import math
+from dataclasses import dataclass
+from typing import Iterator, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .models import GameInfo
+
+
+@dataclass(frozen=True)
+class GamePack:
+    """
+    Pacote de jogos em colunas (substitui list[GameInfo] na sessão):
+    `dezenas` int8 (n, max_tam) com linhas ordenadas e 0 como preenchimento à direita,
+    `tamanhos` int8 (n,), `estrategia_cod` int8 (n,) indexando `estrategias`, `ids` int32 (n,).
+    """
+
+    dezenas: np.ndarray
+    tamanhos: np.ndarray
+    estrategia_cod: np.ndarray
+    estrategias: tuple[str, ...]
+    ids: np.ndarray
+
+    # ---- construção
+    @classmethod
+    def vazio(cls) -> "GamePack":
+        return cls(
+            dezenas=np.zeros((0, 0), dtype=np.int8),
+            tamanhos=np.zeros(0, dtype=np.int8),
+            estrategia_cod=np.zeros(0, dtype=np.int8),
+            estrategias=(),
+            ids=np.zeros(0, dtype=np.int32),
+        )
+
+    @classmethod
+    def from_matrizes(cls, partes: Sequence[tuple[str, np.ndarray]], primeiro_id: int = 1) -> "GamePack":
+        """Blocos (estratégia, matriz (n, tam)) vindos dos motores em lote, na ordem dada."""
+        partes = [(e, np.asarray(m)) for e, m in partes if len(m)]
+        if not partes:
+            return cls.vazio()
+        largura = max(m.shape[1] for _, m in partes)
+        estrategias = tuple(dict.fromkeys(e for e, _ in partes))
+
+        dezenas = np.zeros((sum(len(m) for _, m in partes), largura), dtype=np.int8)
+        tamanhos = np.empty(len(dezenas), dtype=np.int8)
+        cod = np.empty(len(dezenas), dtype=np.int8)
+        i = 0
+        for e, m in partes:
+            dezenas[i : i + len(m), : m.shape[1]] = np.sort(m, axis=1)
+            tamanhos[i : i + len(m)] = m.shape[1]
+            cod[i : i + len(m)] = estrategias.index(e)
+            i += len(m)
+        ids = np.arange(primeiro_id, primeiro_id + len(dezenas), dtype=np.int32)
+        return cls(dezenas, tamanhos, cod, estrategias, ids)
+
+    @classmethod
+    def from_games_info(cls, games_info: Sequence[GameInfo]) -> "GamePack":
+        if not games_info:
+            return cls.vazio()
+        largura = max(len(gi.dezenas) for gi in games_info)
+        dezenas = np.zeros((len(games_info), largura), dtype=np.int8)
+        for i, gi in enumerate(games_info):
+            dezenas[i, : len(gi.dezenas)] = sorted(gi.dezenas)
+        estrategias = tuple(dict.fromkeys(gi.estrategia for gi in games_info))
+        return cls(
+            dezenas=dezenas,
+            tamanhos=np.array([len(gi.dezenas) for gi in games_info], dtype=np.int8),
+            estrategia_cod=np.array([estrategias.index(gi.estrategia) for gi in games_info], dtype=np.int8),
+            estrategias=estrategias,
+            ids=np.array([gi.jogo_id for gi in games_info], dtype=np.int32),
+        )
+
+    # ---- acesso
+    def __len__(self) -> int:
+        return int(self.ids.shape[0])
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __getitem__(self, i: int | slice | np.ndarray) -> "GameInfo | GamePack":
+        """Inteiro -> GameInfo; fatia/máscara/índices -> GamePack (views quando possível)."""
+        if isinstance(i, (int, np.integer)):
+            return GameInfo(
+                jogo_id=int(self.ids[i]),
+                estrategia=self.estrategias[self.estrategia_cod[i]],
+                dezenas=self.dezenas[i, : self.tamanhos[i]].astype(int).tolist(),
+            )
+        return GamePack(self.dezenas[i], self.tamanhos[i], self.estrategia_cod[i], self.estrategias, self.ids[i])
+
+    def __iter__(self) -> Iterator[GameInfo]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def listas(self) -> list[list[int]]:
+        return [self.dezenas[i, :t].astype(int).tolist() for i, t in enumerate(self.tamanhos)]
+
+    def uniforme(self) -> bool:
+        """Todos os jogos com o mesmo tamanho (matriz sem preenchimento)."""
+        return len(self) == 0 or bool((self.tamanhos == self.dezenas.shape[1]).all())
+
+    def estrategia_col(self) -> pd.Categorical:
+        return pd.Categorical.from_codes(self.estrategia_cod, categories=list(self.estrategias))
+
+    def grupos_por_tamanho(self) -> dict[int, np.ndarray]:
+        """tam -> matriz (n_tam, tam) sem preenchimento."""
+        return {int(t): self.dezenas[self.tamanhos == t, :t] for t in np.unique(self.tamanhos)}
+
+    def custos(self, n_min_base: int, preco_base: float) -> np.ndarray:
+        tabela = np.array([math.comb(t, n_min_base) if t >= n_min_base else 0 for t in range(self.dezenas.shape[1] + 1)])
+        return tabela[self.tamanhos] * float(preco_base)
+
+    def chave(self) -> str:
+        """Hash do conteúdo (chave barata para st.cache_* sem hashear o pacote inteiro)."""
+        h = hashlib.blake2b(digest_size=16)
+        for a in (self.dezenas, self.tamanhos, self.estrategia_cod, self.ids):
+            h.update(np.ascontiguousarray(a).tobytes())
+            h.update(str(a.shape).encode())
+        h.update("\x1f".join(self.estrategias).encode())
+        return h.hexdigest()
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.dezenas.nbytes + self.tamanhos.nbytes + self.estrategia_cod.nbytes + self.ids.nbytes)
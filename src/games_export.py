@@ -2,9 +2,12 @@ from __future__ import annotations
 
 from typing import TypedDict
 
+import numpy as np
 import pandas as pd
 
-from src.domain_lottery import baixos_altos, contar_primos, pares_impares
+from src.domain_lottery import baixos_altos, baixos_matriz, contar_primos, pares_impares, primos_matriz
+from src.game_pack import GamePack
+from src.instrumentation import medido
 from src.models import GameInfo
 
 
@@ -21,12 +24,47 @@ class GameRow(TypedDict, total=False):
     # d1..dN entram dinamicamente (total=False)
 
 
+def _pack_to_df(pack: GamePack, *, limite_baixo: int, dezenas_ult: set[int]) -> pd.DataFrame:
+    # Mesmas colunas/dtypes do caminho por linha, direto da matriz int8 (0 = preenchimento)
+    m = pack.dezenas.astype(np.int64)
+    presente = m > 0
+    ult = np.zeros(max(int(m.max(initial=0)), max(dezenas_ult, default=0)) + 1, dtype=bool)
+    ult[list(dezenas_ult)] = True
+
+    tam = pack.tamanhos.astype(np.int64)
+    pares = ((m % 2 == 0) & presente).sum(axis=1)
+    baixos = baixos_matriz(m, limite_baixo)
+
+    cols: dict[str, object] = {
+        "jogo_id": pack.ids.astype(np.int64),
+        "estrategia": np.array(pack.estrategias, dtype=object)[pack.estrategia_cod],
+    }
+    for k in range(m.shape[1]):
+        cols[f"d{k + 1}"] = m[:, k] if presente[:, k].all() else np.where(presente[:, k], m[:, k], np.nan)
+    cols.update(
+        {
+            "soma": m.sum(axis=1),
+            "pares": pares,
+            "impares": tam - pares,
+            "baixos": baixos,
+            "altos": tam - baixos,
+            "nprimos": primos_matriz(m),
+            "rep_ultimo": (ult[m] & presente).sum(axis=1),
+        }
+    )
+    return pd.DataFrame(cols)
+
+
+@medido("dataframe.jogos")
 def games_info_to_df(
-    games_info: list[GameInfo],
+    games_info: list[GameInfo] | GamePack,
     *,
     limite_baixo: int,
     dezenas_ult: set[int],
 ) -> pd.DataFrame:
+    if isinstance(games_info, GamePack) and len(games_info):
+        return _pack_to_df(games_info, limite_baixo=limite_baixo, dezenas_ult=dezenas_ult)
+
     rows: list[GameRow] = []
     max_dezenas = 0
 
@@ -105,9 +143,36 @@ def games_info_to_df(
 
 # Alias para compatibilidade com imports antigos (pages/1_Gerar_jogos.py)
 def gamesinfotodf(
-    games_info: list[GameInfo],
+    games_info: list[GameInfo] | GamePack,
     *,
     limite_baixo: int,
     dezenas_ult: set[int],
 ) -> pd.DataFrame:
     return games_info_to_df(games_info, limite_baixo=limite_baixo, dezenas_ult=dezenas_ult)
+
+
+def games_df_to_pack(df: pd.DataFrame, *, n_universo: int) -> GamePack:
+    """Inverso de `games_info_to_df`: recarrega um pacote exportado (d1..dN, jogo_id, estrategia)."""
+    d_cols = sorted((c for c in df.columns if c[:1] == "d" and c[1:].isdigit()), key=lambda c: int(c[1:]))
+    if not d_cols or "jogo_id" not in df.columns:
+        raise ValueError("Tabela sem colunas de jogos (jogo_id, d1..dN).")
+
+    m = df[d_cols].fillna(0).to_numpy(dtype=np.int64)
+    if ((m < 0) | (m > n_universo)).any():
+        raise ValueError(f"Dezenas fora do intervalo 1–{n_universo}.")
+    # ordena com o preenchimento (0) no fim de cada linha, como em GamePack
+    vazio = n_universo + 1
+    m = np.sort(np.where(m > 0, m, vazio), axis=1)
+    if ((np.diff(m, axis=1) == 0) & (m[:, 1:] != vazio)).any():
+        raise ValueError("Há jogos com dezenas repetidas.")
+    m = np.where(m == vazio, 0, m)
+
+    estrategia = df["estrategia"].astype(str) if "estrategia" in df.columns else pd.Series(["Importado"] * len(df))
+    cat = pd.Categorical(estrategia)
+    return GamePack(
+        dezenas=m.astype(np.int8),
+        tamanhos=(m > 0).sum(axis=1).astype(np.int8),
+        estrategia_cod=cat.codes.astype(np.int8),
+        estrategias=tuple(str(c) for c in cat.categories),
+        ids=df["jogo_id"].to_numpy(dtype=np.int32),
+    )
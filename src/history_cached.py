@@ -1,12 +1,19 @@
 from __future__ import annotations
 
 import pandas as pd
-import streamlit as st
 
-from src.config import Modalidade
-from src.data_caixa import load_history_from_caixa
+from . import core_cached as core
+from . import prefetch
+from .config import Modalidade
+from .instrumentation import registrar_cache
+
+# Páginas: espera o aquecimento (src.prefetch) em vez de carregar de novo; o df devolvido é o
+# compartilhado do processo (set_history o registra sem cópia). Sem páginas: core_cached.load_history_cached
 
 
-@st.cache_data(ttl=3600, show_spinner=False)
 def load_history_cached(modalidade: Modalidade) -> pd.DataFrame:
-    return load_history_from_caixa(modalidade)
+    registrar_cache("load_history_cached", acerto=prefetch.pronto(modalidade))
+    return prefetch.aguardar(modalidade)
+
+
+load_history_cached.clear = core.load_history_cached.clear  # type: ignore[attr-defined]
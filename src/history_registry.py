@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import threading
+
+import pandas as pd
+
+from .config import Modalidade
+
+# Versões mantidas por modalidade: a atual + a anterior (sessões ainda no token antigo)
+VERSOES_POR_MODALIDADE = 2
+
+Versao = tuple[int, int]
+Token = tuple[str, int, int]  # (modalidade, n_concursos, ultimo_concurso): o que a sessão guarda
+
+_lock = threading.Lock()
+_registro: dict[Modalidade, dict[Versao, pd.DataFrame]] = {}
+
+
+def history_version(df: pd.DataFrame) -> Versao:
+    return (len(df), int(df["concurso"].max()) if len(df) else -1)
+
+
+def registrar(mod: Modalidade, df: pd.DataFrame) -> tuple[Token, pd.DataFrame]:
+    """
+    Publica o histórico no registro do processo e devolve (token, df compartilhado).
+    Se a mesma versão já existe, a cópia recebida é descartada e todas as sessões usam a mesma.
+    O df compartilhado não deve ser alterado in-place (pandas com copy-on-write só copia ao escrever).
+    """
+    versao = history_version(df)
+    with _lock:
+        versoes = _registro.setdefault(mod, {})
+        atual = versoes.get(versao)
+        if atual is None:
+            atual = versoes[versao] = df
+            # descarta as versões mais antigas (ordem de inserção)
+            for v in list(versoes)[:-VERSOES_POR_MODALIDADE]:
+                del versoes[v]
+    return (mod, *versao), atual
+
+
+def resolver(token: Token | None) -> pd.DataFrame | None:
+    """Token da sessão -> df compartilhado (None se nunca registrado ou já descartado)."""
+    if token is None:
+        return None
+    mod, n, ultimo = token
+    with _lock:
+        return _registro.get(mod, {}).get((n, ultimo))
+
+
+def mais_recente(mod: Modalidade) -> Token | None:
+    """Token da versão com o maior último concurso (ex.: publicada pela revalidação em segundo plano)."""
+    with _lock:
+        versoes = list(_registro.get(mod, {}))
+    if not versoes:
+        return None
+    n, ultimo = max(versoes, key=lambda v: (v[1], v[0]))
+    return (mod, n, ultimo)
+
+
+def resumo() -> pd.DataFrame:
+    with _lock:
+        linhas = [
+            {
+                "modalidade": mod,
+                "concursos": v[0],
+                "ultimo_concurso": v[1],
+                "mb": df.memory_usage(deep=True).sum() / 1e6,
+            }
+            for mod, versoes in _registro.items()
+            for v, df in versoes.items()
+        ]
+    return pd.DataFrame(linhas, columns=["modalidade", "concursos", "ultimo_concurso", "mb"])
+
+
+def limpar() -> None:
+    with _lock:
+        _registro.clear()
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import IO, Callable
+
+import numpy as np
+import pandas as pd
+
+from .config import DIAS_SORTEIO, HORA_RESULTADO, MIN_INTERVALO_VERIFICACAO_S, Modalidade, get_cache_dir
+
+_SLUG: dict[str, str] = {"Mega-Sena": "megasena", "Lotofácil": "lotofacil"}
+
+
+def store_path(mod: Modalidade, cache_dir: Path | None = None) -> Path:
+    return (cache_dir or get_cache_dir()) / f"historico_{_SLUG[mod]}.npz"
+
+
+def agora_brasilia() -> datetime:
+    try:
+        from zoneinfo import ZoneInfo
+
+        return datetime.now(ZoneInfo("America/Sao_Paulo")).replace(tzinfo=None)
+    except Exception:  # sem tzdata (ex.: Windows sem o pacote) -> hora local
+        return datetime.now()
+
+
+def state_path(mod: Modalidade, cache_dir: Path | None = None) -> Path:
+    return (cache_dir or get_cache_dir()) / f"analytics_{_SLUG[mod]}.npz"
+
+
+def validadores_path(mod: Modalidade, cache_dir: Path | None = None) -> Path:
+    return (cache_dir or get_cache_dir()) / f"historico_{_SLUG[mod]}.http.json"
+
+
+def _gravar_atomico(path: Path, escrever: Callable[[IO[bytes]], None]) -> None:
+    """Escreve num temporário do mesmo diretório e troca com os.replace (leitores nunca veem arquivo parcial)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=path.stem, suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            escrever(f)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def gravar_npz_atomico(path: Path, arrays: dict[str, np.ndarray]) -> None:
+    _gravar_atomico(path, lambda f: np.savez(f, **arrays))
+
+
+def salvar_store(mod: Modalidade, df: pd.DataFrame, *, verificado_em: datetime | None = None, cache_dir: Path | None = None) -> Path:
+    """Grava o histórico normalizado em .npz colunar, com substituição atômica do arquivo."""
+    path = store_path(mod, cache_dir)
+    dezenas_cols = [c for c in df.columns if c.startswith("d") and c[1:].isdigit()]
+    arrays = {
+        "concurso": df["concurso"].to_numpy(dtype=np.int64),
+        "data": df["data"].to_numpy(),
+        "dezenas": df[dezenas_cols].to_numpy(dtype=np.int8),
+        "verificado_em": np.array(verificado_em or agora_brasilia(), dtype="datetime64[s]"),
+    }
+
+    gravar_npz_atomico(path, arrays)
+    return path
+
+
+def carregar_store(mod: Modalidade, cache_dir: Path | None = None) -> tuple[pd.DataFrame, datetime] | None:
+    """Histórico local + momento da última verificação na Caixa; None se não houver store válido."""
+    path = store_path(mod, cache_dir)
+    if not path.exists():
+        return None
+    try:
+        with np.load(path) as z:
+            concurso, data, dezenas = z["concurso"], z["data"], z["dezenas"]
+            verificado_em = pd.Timestamp(z["verificado_em"].item()).to_pydatetime()
+    except (OSError, KeyError, ValueError):
+        return None
+
+    df = pd.DataFrame({"concurso": concurso, "data": data})
+    bloco = dezenas.astype(np.int64)
+    for i in range(bloco.shape[1]):
+        df[f"d{i + 1}"] = bloco[:, i]
+    return df, verificado_em
+
+
+@dataclass(frozen=True)
+class Validadores:
+    """Validadores HTTP da planilha que originou o store local (requisição condicional à Caixa)."""
+
+    etag: str | None = None
+    last_modified: str | None = None
+    sha256: str | None = None
+
+
+def salvar_validadores(mod: Modalidade, v: Validadores, cache_dir: Path | None = None) -> None:
+    dados = json.dumps(asdict(v)).encode("utf-8")
+    _gravar_atomico(validadores_path(mod, cache_dir), lambda f: f.write(dados))
+
+
+def carregar_validadores(mod: Modalidade, cache_dir: Path | None = None) -> Validadores | None:
+    try:
+        dados = json.loads(validadores_path(mod, cache_dir).read_text(encoding="utf-8"))
+        return Validadores(**{k: dados.get(k) for k in ("etag", "last_modified", "sha256")})
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def mesclar_novos(base: pd.DataFrame, novos: pd.DataFrame) -> tuple[pd.DataFrame, int]:
+    """Acrescenta só os concursos mais novos que o máximo já armazenado."""
+    if base.empty:
+        return novos.reset_index(drop=True), len(novos)
+    max_conc = int(base["concurso"].max())
+    extra = novos[novos["concurso"] > max_conc]
+    if extra.empty:
+        return base, 0
+    out = pd.concat([base, extra[base.columns]], ignore_index=True).sort_values("concurso").reset_index(drop=True)
+    return out, len(extra)
+
+
+def proximo_resultado(mod: Modalidade, ultima_data: datetime) -> datetime:
+    """Momento a partir do qual o próximo sorteio (após `ultima_data`) deve estar publicado."""
+    dias = DIAS_SORTEIO[mod]
+    d = ultima_data.date() + timedelta(days=1)
+    while d.weekday() not in dias:
+        d += timedelta(days=1)
+    return datetime(d.year, d.month, d.day, HORA_RESULTADO)
+
+
+def novos_sorteios_esperados(
+    mod: Modalidade,
+    ultima_data: datetime,
+    verificado_em: datetime,
+    agora: datetime | None = None,
+) -> bool:
+    agora = agora or agora_brasilia()
+    if agora < proximo_resultado(mod, ultima_data):
+        return False
+    # Sorteio esperado (ou adiado): não consulta a Caixa em todo rerun
+    return (agora - verificado_em).total_seconds() >= MIN_INTERVALO_VERIFICACAO_S
@@ -1,18 +1,23 @@
 from __future__ import annotations
 
+import hashlib
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Final
 
-import streamlit as st
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from .history_store import Validadores
+
 DEFAULT_HEADERS: Final[dict[str, str]] = {
     "User-Agent": "Mozilla/5.0 (compatible; LotteryHelper/1.0)",
     "Accept": "*/*",
 }
 
-@st.cache_resource(show_spinner=False)
+# Uma sessão (pool de conexões) por processo; sem Streamlit para servir também à CLI
+@lru_cache(maxsize=1)
 def get_session() -> requests.Session:
     s = requests.Session()
     retry = Retry(
@@ -27,3 +32,41 @@ def get_session() -> requests.Session:
     s.mount("http://", adapter)
     s.headers.update(DEFAULT_HEADERS)
     return s
+
+
+@dataclass(frozen=True)
+class RespostaCondicional:
+    conteudo: bytes | None  # None: não mudou desde `validadores` (304 ou mesmo sha256)
+    validadores: Validadores
+    status: int
+
+
+def get_condicional(url: str, validadores: Validadores | None = None, *, timeout: float = 60) -> RespostaCondicional:
+    """
+    GET com If-None-Match/If-Modified-Since a partir dos validadores da cópia local. Servidores
+    que ignoram os cabeçalhos (200 sempre) ainda são detectados pelo sha256 do corpo.
+    """
+    cabecalhos: dict[str, str] = {}
+    if validadores is not None:
+        if validadores.etag:
+            cabecalhos["If-None-Match"] = validadores.etag
+        if validadores.last_modified:
+            cabecalhos["If-Modified-Since"] = validadores.last_modified
+
+    r = get_session().get(url, headers=cabecalhos, timeout=timeout)
+    if r.status_code == 304 and validadores is not None:
+        return RespostaCondicional(
+            None,
+            Validadores(
+                etag=r.headers.get("ETag") or validadores.etag,
+                last_modified=r.headers.get("Last-Modified") or validadores.last_modified,
+                sha256=validadores.sha256,
+            ),
+            304,
+        )
+    r.raise_for_status()
+
+    sha256 = hashlib.sha256(r.content).hexdigest()
+    novos = Validadores(etag=r.headers.get("ETag"), last_modified=r.headers.get("Last-Modified"), sha256=sha256)
+    inalterado = validadores is not None and validadores.sha256 == sha256
+    return RespostaCondicional(None if inalterado else r.content, novos, r.status_code)
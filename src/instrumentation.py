@@ -0,0 +1,203 @@
+"""
+Instrumentação leve por processo: tempo por etapa (download, parse, análises, geração, export...),
+bytes produzidos, contadores e acertos/faltas de cache. Sem dependências (pandas só em `resumo_*`).
+"""
+from __future__ import annotations
+
+import functools
+import json
+import math
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Iterator
+
+MAX_MEDICOES = 5_000
+
+
+@dataclass(frozen=True)
+class Medicao:
+    etapa: str
+    inicio: float  # epoch (s)
+    duracao_s: float
+    bytes: int | None = None
+
+
+@dataclass
+class _Marca:
+    bytes: int | None = None
+
+
+_lock = threading.Lock()
+_medicoes: deque[Medicao] = deque(maxlen=MAX_MEDICOES)
+_contadores: Counter[str] = Counter()
+_cache: dict[str, list[int]] = {}  # função -> [acertos, faltas]
+
+
+@contextmanager
+def etapa(nome: str) -> Iterator[_Marca]:
+    """`with etapa("download") as m: ...; m.bytes = n` — registra mesmo se a etapa falhar."""
+    marca = _Marca()
+    inicio, t0 = time.time(), time.perf_counter()
+    try:
+        yield marca
+    finally:
+        m = Medicao(nome, inicio, time.perf_counter() - t0, marca.bytes)
+        with _lock:
+            _medicoes.append(m)
+
+
+def _tamanho(valor: Any) -> int | None:
+    if isinstance(valor, (bytes, bytearray)):
+        return len(valor)
+    if hasattr(valor, "seek") and hasattr(valor, "tell"):
+        pos = valor.tell()
+        valor.seek(0, 2)
+        n = valor.tell()
+        valor.seek(pos)
+        return n
+    return None
+
+
+def medido(nome: str, *, medir_bytes: bool = False) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorador de `etapa`; com `medir_bytes`, registra o tamanho do retorno (bytes ou arquivo)."""
+
+    def deco(fn: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with etapa(nome) as m:
+                valor = fn(*args, **kwargs)
+                if medir_bytes:
+                    m.bytes = _tamanho(valor)
+                return valor
+
+        return wrapper
+
+    return deco
+
+
+def contar(nome: str, n: int = 1) -> None:
+    with _lock:
+        _contadores[nome] += n
+
+
+def registrar_cache(funcao: str, acerto: bool) -> None:
+    with _lock:
+        c = _cache.setdefault(funcao, [0, 0])
+        c[0 if acerto else 1] += 1
+
+
+def cache_instrumentado(decorador: Callable[[Callable[..., Any]], Any], fn: Callable[..., Any], nome: str | None = None):
+    """
+    Aplica um decorador de cache (st.cache_data/st.cache_resource) contando acertos e faltas:
+    a função interna só roda na falta, então acertos = chamadas - faltas.
+    """
+    nome = nome or fn.__name__
+    estado = threading.local()
+
+    @functools.wraps(fn)
+    def interna(*args: Any, **kwargs: Any) -> Any:
+        estado.falta = True
+        with etapa(f"cache_miss.{nome}"):
+            return fn(*args, **kwargs)
+
+    cached = decorador(interna)
+
+    @functools.wraps(fn)
+    def chamada(*args: Any, **kwargs: Any) -> Any:
+        estado.falta = False
+        valor = cached(*args, **kwargs)
+        registrar_cache(nome, acerto=not estado.falta)
+        return valor
+
+    chamada.clear = cached.clear  # type: ignore[attr-defined]
+    return chamada
+
+
+def medicoes(n: int | None = None) -> list[Medicao]:
+    with _lock:
+        itens = list(_medicoes)
+    return itens if n is None else itens[-n:]
+
+
+def _percentil(valores: list[float], p: float) -> float:
+    """Nearest-rank (sem numpy)."""
+    if not valores:
+        return float("nan")
+    v = sorted(valores)
+    return v[min(len(v), max(1, math.ceil(p / 100 * len(v)))) - 1]
+
+
+def estatisticas_etapas(n: int | None = None) -> list[dict[str, Any]]:
+    por_etapa: dict[str, list[Medicao]] = {}
+    for m in medicoes(n):
+        por_etapa.setdefault(m.etapa, []).append(m)
+    linhas = []
+    for nome, ms in sorted(por_etapa.items()):
+        duracoes = [m.duracao_s for m in ms]
+        tamanhos = [m.bytes for m in ms if m.bytes is not None]
+        linhas.append(
+            {
+                "etapa": nome,
+                "n": len(ms),
+                "p50_ms": _percentil(duracoes, 50) * 1e3,
+                "p95_ms": _percentil(duracoes, 95) * 1e3,
+                "max_ms": max(duracoes) * 1e3,
+                "total_s": sum(duracoes),
+                "bytes_total": sum(tamanhos) if tamanhos else None,
+            }
+        )
+    return linhas
+
+
+def estatisticas_cache() -> list[dict[str, Any]]:
+    with _lock:
+        itens = {k: tuple(v) for k, v in _cache.items()}
+    return [
+        {"funcao": k, "acertos": a, "faltas": f, "taxa_acerto": a / (a + f) if a + f else 0.0}
+        for k, (a, f) in sorted(itens.items())
+    ]
+
+
+def contadores() -> dict[str, int]:
+    with _lock:
+        return dict(_contadores)
+
+
+def resumo_etapas(n: int | None = None):
+    import pandas as pd
+
+    return pd.DataFrame(estatisticas_etapas(n), columns=["etapa", "n", "p50_ms", "p95_ms", "max_ms", "total_s", "bytes_total"])
+
+
+def resumo_cache():
+    import pandas as pd
+
+    return pd.DataFrame(estatisticas_cache(), columns=["funcao", "acertos", "faltas", "taxa_acerto"])
+
+
+def medicoes_df(n: int | None = None):
+    import pandas as pd
+
+    df = pd.DataFrame([asdict(m) for m in medicoes(n)], columns=["etapa", "inicio", "duracao_s", "bytes"])
+    df["inicio"] = pd.to_datetime(df["inicio"], unit="s")
+    return df
+
+
+def exportar_json(n: int | None = None) -> bytes:
+    dados = {
+        "etapas": estatisticas_etapas(n),
+        "cache": estatisticas_cache(),
+        "contadores": contadores(),
+        "medicoes": [asdict(m) for m in medicoes(n)],
+    }
+    return json.dumps(dados, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def limpar() -> None:
+    with _lock:
+        _medicoes.clear()
+        _contadores.clear()
+        _cache.clear()
@@ -1,18 +1,26 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 
-@dataclass(frozen=True)
-class Filters:
-    dezenas_fixas: list[int]
-    dezenas_proibidas: list[int]
-    soma_min: Optional[int]
-    soma_max: Optional[int]
-    orcamento_max: float
-
 @dataclass(frozen=True)
 class GameInfo:
     jogo_id: int
     estrategia: str
     dezenas: list[int]
+
+@dataclass(frozen=True)
+class Restricoes:
+    """Filtros básicos + heurísticas, aplicados direto na amostragem (domain_lottery.amostrar_com_restricoes)."""
+    dezenas_fixas: list[int] = field(default_factory=list)
+    dezenas_proibidas: list[int] = field(default_factory=list)
+    soma_min: Optional[int] = None
+    soma_max: Optional[int] = None
+    pares_min: Optional[int] = None
+    pares_max: Optional[int] = None
+    primos_min: Optional[int] = None
+    primos_max: Optional[int] = None
+    baixos_min: Optional[int] = None
+    baixos_max: Optional[int] = None
+    max_rep_ultimo: Optional[int] = None
+    dezenas_ultimo: list[int] = field(default_factory=list)
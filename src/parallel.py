@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import atexit
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Callable, Iterable, Sequence, TypeVar
+
+import numpy as np
+
+from .backtest import ResultadoBacktest, backtest_mascaras, mascaras_jogos
+from .config import get_workers
+from .draw_index import DrawIndex
+from .game_pack import GamePack
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Abaixo disso (pares jogo×concurso) o custo de despachar para processos não compensa:
+# despacho ~5 ms com o pool aberto e ~100M pares/s em série -> equilíbrio com 2 workers em
+# ~1M pares (benchmarks/bench_backtest.py --workers 2 4). O pacote da UI (500 × ~3.000) passa disso
+MIN_PARES_PARALELO = 1_000_000
+# Shards por worker: equilibra carga sem multiplicar o overhead por tarefa
+SHARDS_POR_WORKER = 4
+
+_pool: ProcessPoolExecutor | None = None
+_pool_workers = 0
+
+
+def get_pool(workers: int | None = None) -> ProcessPoolExecutor:
+    """Pool de processos do processo atual (recriado só se o número de workers mudar)."""
+    global _pool, _pool_workers
+    workers = workers or get_workers()
+    if _pool is None or _pool_workers != workers:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        # spawn: o processo do Streamlit tem threads; fork herdaria locks em estado indefinido
+        _pool = ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn"))
+        _pool_workers = workers
+    return _pool
+
+
+@atexit.register
+def _fechar_pool() -> None:
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+
+
+def mapear(fn: Callable[[T], R], tarefas: Iterable[T], workers: int | None = None) -> list[R]:
+    """`fn` em processos; resultados na ordem das tarefas (merge determinístico)."""
+    workers = workers or get_workers()
+    tarefas = list(tarefas)
+    if workers <= 1 or len(tarefas) <= 1:
+        return [fn(t) for t in tarefas]
+    return list(get_pool(workers).map(fn, tarefas))
+
+
+def fatias(n: int, partes: int) -> list[slice]:
+    """`n` itens em até `partes` fatias contíguas de tamanho quase igual."""
+    limites = np.linspace(0, n, max(1, min(partes, n)) + 1).astype(int)
+    return [slice(a, b) for a, b in zip(limites[:-1], limites[1:]) if b > a]
+
+
+# ---- arrays read-only em memória compartilhada
+class ArraysCompartilhados:
+    """
+    Copia arrays 1x para um bloco de shared memory; os workers recebem só `descritor`
+    (nome + layout) e abrem views sem cópia. Use como context manager (libera o bloco no fim).
+    """
+
+    def __init__(self, arrays: dict[str, np.ndarray]):
+        layout, offset = [], 0
+        for nome, a in arrays.items():
+            a = np.ascontiguousarray(a)
+            layout.append((nome, a.dtype.str, a.shape, offset))
+            offset += a.nbytes
+        self._shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        for (nome, _, _, off), a in zip(layout, arrays.values()):
+            a = np.ascontiguousarray(a)
+            np.ndarray(a.shape, a.dtype, buffer=self._shm.buf, offset=off)[...] = a
+        self.descritor = (self._shm.name, tuple(layout))
+
+    def __enter__(self) -> "ArraysCompartilhados":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._shm.close()
+        self._shm.unlink()
+
+
+# Por worker: último bloco aberto (tarefas do mesmo lote reaproveitam a view)
+_anexado: tuple[str, shared_memory.SharedMemory, dict[str, np.ndarray]] | None = None
+
+
+def _abrir(descritor: tuple[str, tuple]) -> dict[str, np.ndarray]:
+    global _anexado
+    nome, layout = descritor
+    if _anexado is not None and _anexado[0] == nome:
+        return _anexado[2]
+    if _anexado is not None:
+        _anexado[1].close()
+    # workers do spawn usam o resource_tracker do pai: o registro do attach não duplica o do dono
+    shm = shared_memory.SharedMemory(name=nome)
+    arrays = {}
+    for k, dtype, shape, off in layout:
+        a = np.ndarray(shape, np.dtype(dtype), buffer=shm.buf, offset=off)
+        a.flags.writeable = False
+        arrays[k] = a
+    _anexado = (nome, shm, arrays)
+    return arrays
+
+
+# ---- backtest em shards
+def _backtest_shard(tarefa: tuple[tuple[str, tuple], np.ndarray, int]) -> ResultadoBacktest:
+    descritor, mascaras, s = tarefa
+    h = _abrir(descritor)
+    return backtest_mascaras(mascaras, h["mascaras"], h["concursos"], s)
+
+
+def concatenar_backtests(partes: Sequence[ResultadoBacktest]) -> ResultadoBacktest:
+    return ResultadoBacktest(
+        n_concursos=partes[0].n_concursos,
+        hist_acertos=np.concatenate([p.hist_acertos for p in partes]),
+        melhor_acertos=np.concatenate([p.melhor_acertos for p in partes]),
+        melhor_concurso=np.concatenate([p.melhor_concurso for p in partes]),
+    )
+
+
+def backtest_paralelo(
+    jogos: Sequence[Sequence[int]] | np.ndarray | GamePack, idx: DrawIndex, workers: int | None = None
+) -> ResultadoBacktest:
+    """Mesmo resultado de `backtest.backtest`, com os jogos divididos em shards entre processos."""
+    workers = workers or get_workers()
+    mascaras = mascaras_jogos(jogos)
+    s = idx.n_dezenas_sorteio
+    if workers <= 1 or len(mascaras) * len(idx) < MIN_PARES_PARALELO:
+        return backtest_mascaras(mascaras, idx.mascaras, idx.concursos, s)
+
+    with ArraysCompartilhados({"mascaras": idx.mascaras, "concursos": idx.concursos}) as sh:
+        tarefas = [(sh.descritor, mascaras[f], s) for f in fatias(len(mascaras), workers * SHARDS_POR_WORKER)]
+        return concatenar_backtests(mapear(_backtest_shard, tarefas, workers))
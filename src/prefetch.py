@@ -0,0 +1,67 @@
+"""
+Aquecimento ao abrir o app: histórico, índice e análises das duas modalidades carregados em
+paralelo numa pool de threads (download, parse e numpy liberam o GIL boa parte do tempo).
+O resultado fica nos caches de `core_cached`; as páginas esperam o futuro em andamento em vez
+de disparar outro carregamento, e trocar de modalidade não custa rede nem parse.
+"""
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+
+import pandas as pd
+
+from . import core_cached as core
+from .config import Modalidade, get_spec
+from .history_registry import history_version, registrar
+from .instrumentation import etapa
+
+MODALIDADES: tuple[Modalidade, ...] = ("Mega-Sena", "Lotofácil")
+
+_lock = threading.Lock()
+_futuros: dict[str, Future] = {}
+
+
+@lru_cache(maxsize=1)
+def _executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=len(MODALIDADES), thread_name_prefix="prefetch")
+
+
+def _aquecer(mod: Modalidade) -> None:
+    spec = get_spec(mod)
+    s, n = spec.n_dezenas_sorteio, spec.n_universo
+    with etapa(f"prefetch.{mod}"):
+        _, df = registrar(mod, core.load_history_cached(mod))
+        idx = core.cached_draw_index(df, s, n)
+        freq = core.cached_frequencias(df, s, n, _idx=idx)
+        core.cached_atraso(freq, df, s, n, _idx=idx)
+        core.cached_padroes(df, s, spec.limite_baixo, _idx=idx)
+        core.cached_somas(df, s)
+        core.cached_analytics_state(mod, history_version(df), df)
+        core.cached_coocorrencia(mod, history_version(df), idx)
+        core.cached_atrasos(mod, history_version(df), idx)
+
+
+def iniciar(modalidades: tuple[Modalidade, ...] = MODALIDADES) -> None:
+    """Dispara o aquecimento (idempotente; um aquecimento que falhou é tentado de novo)."""
+    with _lock:
+        for mod in modalidades:
+            fut = _futuros.get(mod)
+            if fut is None or (fut.done() and fut.exception() is not None):
+                _futuros[mod] = _executor().submit(_aquecer, mod)
+
+
+def aguardar(mod: Modalidade, timeout: float | None = None) -> pd.DataFrame:
+    """Histórico compartilhado da modalidade: espera o aquecimento em curso e lê do cache já quente."""
+    iniciar((mod,))
+    with _lock:
+        fut = _futuros[mod]
+    fut.result(timeout)  # propaga a falha do carregamento
+    return core.load_history_cached(mod)
+
+
+def pronto(mod: Modalidade) -> bool:
+    with _lock:
+        fut = _futuros.get(mod)
+    return fut is not None and fut.done() and fut.exception() is None
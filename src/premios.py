@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import math
+from functools import lru_cache
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from .config import LotterySpec
+from .draw_index import mascaras_matriz, popcount
+from .game_pack import GamePack
+
+# Orçamento de elementos por bloco (controla memória dos passos vetorizados)
+CHUNK_ELEMENTOS = 8_000_000
+# Até esse tamanho o espaço de sorteios é enumerado inteiro (Lotofácil: 3.268.760)
+MAX_SORTEIOS_VARREDURA = 5_000_000
+# Custo relativo (medido) de um par bilhete×sorteio na varredura vs. uma dezena enumerada:
+# ~3–5 ns contra ~11–30 ns por unidade (Lotofácil, 100 a 10 mil jogos de 15 e 18 dezenas)
+PESO_VARREDURA = 0.3
+# Custo (unidade de custo_enum) por faixa até o qual a união exata sai direto: ~1–3 s medidos.
+# Acima disso (ex.: quadra da Mega com 10 mil jogos, ~1,3e9) fica sob demanda
+ORCAMENTO_EXATO = 1e8
+
+
+@lru_cache(maxsize=4)
+def _tabela_comb(n_max: int, k_max: int) -> np.ndarray:
+    t = np.zeros((n_max + 1, k_max + 1), dtype=np.int64)
+    for n in range(n_max + 1):
+        for k in range(min(n, k_max) + 1):
+            t[n, k] = math.comb(n, k)
+    return t
+
+
+def rank_colex(m: np.ndarray, n_universo: int) -> np.ndarray:
+    """Rank colex de combinações (linhas ordenadas, dezenas 0-based) em [0, C(N, k))."""
+    k = m.shape[-1]
+    t = _tabela_comb(n_universo, k)
+    pos = np.arange(1, k + 1)
+    return t[m.astype(np.intp), pos].sum(axis=-1)
+
+
+@lru_cache(maxsize=2)
+def mascaras_todos_sorteios(n_universo: int, s: int) -> np.ndarray:
+    """Máscaras de todas as combinações C(N, s) em ordem colex (índice == rank_colex)."""
+    # colex: as (k-1)-combinações de range(m) são prefixo das de range(N)
+    prev = np.zeros(1, dtype=np.uint64)
+    for k in range(1, s + 1):
+        partes = [
+            prev[: math.comb(m, k - 1)] | (np.uint64(1) << np.uint64(m))
+            for m in range(k - 1, n_universo)
+        ]
+        prev = np.concatenate(partes)
+    return prev
+
+
+def _acertos_validos(k: int, t: int, n_universo: int, s: int) -> range:
+    # Com h acertos num bilhete de k dezenas existe aposta simples com exatamente t acertos
+    # se t <= h e sobram dezenas não sorteadas suficientes: s - t <= k - h
+    h_min = max(t, s - (n_universo - k))
+    h_max = min(s, k, k - s + t)
+    return range(h_min, h_max + 1)
+
+
+def prob_bilhete_faixa(k: int, t: int, n_universo: int, s: int) -> float:
+    """P(um bilhete de k dezenas ganhar ao menos um prêmio da faixa t) — hipergeométrica."""
+    total = math.comb(n_universo, s)
+    return sum(math.comb(k, h) * math.comb(n_universo - k, s - h) for h in _acertos_validos(k, t, n_universo, s)) / total
+
+
+def premios_esperados_bilhete(k: int, t: int, n_universo: int, s: int) -> float:
+    """Número esperado de apostas simples premiadas na faixa t dentro de um bilhete de k dezenas."""
+    total = math.comb(n_universo, s)
+    return sum(
+        math.comb(k, h) * math.comb(n_universo - k, s - h) * math.comb(h, t) * math.comb(k - h, s - t)
+        for h in range(t, min(s, k) + 1)
+    ) / total
+
+
+def _combinacoes(n: int, k: int) -> np.ndarray:
+    c = list(combinations(range(n), k))
+    return np.array(c, dtype=np.intp).reshape(len(c), k)
+
+
+def _rank_uniao(x: np.ndarray, y: np.ndarray, tabela: np.ndarray) -> np.ndarray:
+    """
+    rank_colex de x ∪ y (partes disjuntas, cada uma ordenada, broadcast entre si) sem ordenar:
+    a posição de cada dezena na união é o índice na própria parte + quantas da outra são menores.
+    `x`/`y` em int8 e índices int16 para manter os passos vetorizados leves em memória.
+    """
+    largura = x.shape[-1] + y.shape[-1] + 1
+    forma = np.broadcast_shapes(x.shape[:-1], y.shape[:-1])
+    rank = np.zeros(forma, dtype=tabela.dtype)
+    for parte, outra in ((x, y), (y, x)):
+        base = parte.astype(np.int16) * largura
+        for i in range(parte.shape[-1]):
+            v = parte[..., i]
+            idx = np.broadcast_to(base[..., i] + (i + 1), forma).astype(np.int16)
+            for j in range(outra.shape[-1]):
+                idx += outra[..., j] < v
+            rank += tabela[idx]
+    return rank.ravel()
+
+
+def _marcar_por_enumeracao(cobertos: np.ndarray, jogos: np.ndarray, t: int, n_universo: int, s: int) -> None:
+    # Para cada bilhete, gera todos os sorteios premiados (h acertos dentro, s-h fora) e marca os ranks
+    k = jogos.shape[1]
+    jogos = jogos.astype(np.int8)
+    # Dezenas fora de cada bilhete, ordenadas: complemento da incidência
+    dentro_lut = np.zeros((len(jogos), n_universo), dtype=bool)
+    np.put_along_axis(dentro_lut, jogos.astype(np.intp), True, axis=1)
+    fora = np.nonzero(~dentro_lut)[1].astype(np.int8).reshape(len(jogos), n_universo - k)
+
+    tabela = _tabela_comb(n_universo, s).ravel()
+    tabela = tabela.astype(np.int32) if tabela.max() < 2**31 else tabela
+    for h in _acertos_validos(k, t, n_universo, s):
+        a = _combinacoes(k, h)
+        b = _combinacoes(n_universo - k, s - h)
+        por_bilhete = len(a) * len(b) * s
+        passo = max(1, CHUNK_ELEMENTOS // max(1, por_bilhete))
+        for i in range(0, len(jogos), passo):
+            dentro = jogos[i : i + passo][:, a]  # (c, nA, h)
+            extra = fora[i : i + passo][:, b]  # (c, nB, s-h)
+            cobertos[_rank_uniao(dentro[:, :, None, :], extra[:, None, :, :], tabela)] = True
+
+
+def _marcar_por_varredura(cobertos: np.ndarray, mascaras: np.ndarray, tams: np.ndarray, t: int, n_universo: int, s: int) -> None:
+    # Percorre o espaço inteiro de sorteios; os já cobertos saem das próximas rodadas
+    restantes = np.flatnonzero(~cobertos)
+    dtype = np.uint32 if n_universo <= 32 else np.uint64
+    rest = mascaras_todos_sorteios(n_universo, s)[restantes].astype(dtype)
+    mascaras = mascaras.astype(dtype)
+    h_min = np.maximum(t, s - (n_universo - tams)).astype(np.uint8)
+    h_span = (np.minimum(np.minimum(s, tams), tams - s + t) - h_min).astype(np.uint8)
+
+    i = 0
+    while i < len(mascaras) and len(restantes):
+        passo = max(1, CHUNK_ELEMENTOS // len(restantes))
+        bloco = slice(i, i + passo)
+        # (bilhetes, sorteios): eixo interno longo mantém o broadcast eficiente
+        h = popcount(mascaras[bloco][:, None] & rest[None, :])
+        # h_min <= h <= h_max numa comparação só (subtração uint8 dá a volta abaixo de h_min)
+        ganha = ((h - h_min[bloco][:, None]) <= h_span[bloco][:, None]).any(axis=0)
+        cobertos[restantes[ganha]] = True
+        restantes, rest = restantes[~ganha], rest[~ganha]
+        i += passo
+
+
+def _grupos_por_tamanho(jogos: list[list[int]] | np.ndarray | GamePack) -> dict[int, np.ndarray]:
+    if isinstance(jogos, GamePack):
+        return {k: g.astype(np.intp) - 1 for k, g in jogos.grupos_por_tamanho().items()}
+    if isinstance(jogos, np.ndarray):
+        return {jogos.shape[1]: np.sort(jogos.astype(np.intp), axis=1) - 1} if len(jogos) else {}
+    grupos: dict[int, list[list[int]]] = {}
+    for j in jogos:
+        grupos.setdefault(len(j), []).append(sorted(j))
+    return {k: np.array(v, dtype=np.intp) - 1 for k, v in grupos.items()}
+
+
+def probabilidades_faixas(
+    jogos: list[list[int]] | np.ndarray | GamePack,
+    spec: LotterySpec,
+    *,
+    orcamento: float | None = None,
+) -> pd.DataFrame:
+    """
+    Probabilidade exata de o pacote ganhar ao menos um prêmio em cada faixa (união dos
+    sorteios cobertos, marcada num bitmap de ranks C(N, s)), mais o número esperado de
+    bilhetes premiados e de apostas simples premiadas por faixa (linearidade, sem supor independência).
+
+    Faixas cuja união custaria mais que `orcamento` não são marcadas: saem com `exata=False`,
+    probabilidade NaN e só a cota superior (soma das chances por bilhete, limitada a 1).
+    """
+    N, s = spec.n_universo, spec.n_dezenas_sorteio
+    total = math.comb(N, s)
+    grupos = {k: g for k, g in _grupos_por_tamanho(jogos).items() if k >= s}
+
+    linhas = []
+    for t in spec.faixas_premio:
+        esperado_bilhetes = sum(len(g) * prob_bilhete_faixa(k, t, N, s) for k, g in grupos.items())
+        esperado_premios = sum(len(g) * premios_esperados_bilhete(k, t, N, s) for k, g in grupos.items())
+
+        cobertos = np.zeros(total, dtype=bool)
+        custo_enum = sum(
+            len(g) * s * sum(math.comb(k, h) * math.comb(N - k, s - h) for h in _acertos_validos(k, t, N, s))
+            for k, g in grupos.items()
+        )
+        n_jogos = sum(len(g) for g in grupos.values())
+        p_medio = esperado_bilhetes / n_jogos if n_jogos else 0.0
+        custo_varredura = PESO_VARREDURA * total * min(n_jogos, 1.0 / p_medio if p_medio else n_jogos)
+
+        varredura = total <= MAX_SORTEIOS_VARREDURA and custo_varredura < custo_enum
+        cota = min(1.0, esperado_bilhetes)
+        if orcamento is not None and (custo_varredura if varredura else custo_enum) > orcamento:
+            linhas.append(
+                {
+                    "faixa": spec.nome_faixa(t),
+                    "acertos": t,
+                    "probabilidade": np.nan,
+                    "chance": f"até {chance_txt(cota)}",
+                    "cota_superior": cota,
+                    "exata": False,
+                    "esperado_bilhetes": esperado_bilhetes,
+                    "esperado_premios": esperado_premios,
+                }
+            )
+            continue
+
+        if varredura:
+            mascaras = np.concatenate([mascaras_matriz(g + 1) for g in grupos.values()])
+            tams = np.concatenate([np.full(len(g), k) for k, g in grupos.items()])
+            _marcar_por_varredura(cobertos, mascaras, tams, t, N, s)
+        else:
+            for g in grupos.values():
+                _marcar_por_enumeracao(cobertos, g, t, N, s)
+
+        prob = int(cobertos.sum()) / total
+        linhas.append(
+            {
+                "faixa": spec.nome_faixa(t),
+                "acertos": t,
+                "probabilidade": prob,
+                "chance": chance_txt(prob),
+                "cota_superior": cota,
+                "exata": True,
+                "esperado_bilhetes": esperado_bilhetes,
+                "esperado_premios": esperado_premios,
+            }
+        )
+    return pd.DataFrame(linhas)
+
+
+def chance_txt(p: float) -> str:
+    return "NA" if p <= 0 else f"1 em {1 / p:,.0f}".replace(",", ".")
@@ -1,21 +1,197 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any
+from typing import IO, Any, Iterable, Iterator
 
 import io
 import json
+import os
+import tempfile
 import zipfile
 
 import pandas as pd
 
+from .instrumentation import etapa, medido
 
-def make_zip_bytes(files: list[tuple[str, bytes]]) -> bytes:
-    buf = io.BytesIO()
-    with zipfile.ZipFile(buf, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+# Linhas por bloco nos writers em streaming (memória ~ um bloco, não o arquivo inteiro)
+CHUNK_LINHAS = 50_000
+# Acima disso o arquivo temporário sai da memória e vai para o disco
+SPOOL_MAX_MEMORIA = 16 * 1024 * 1024
+
+Conteudo = bytes | Iterable[bytes]
+
+
+def _spooled() -> IO[bytes]:
+    return tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORIA, mode="w+b")
+
+
+def iter_csv_chunks(df: pd.DataFrame | None, chunk_linhas: int = CHUNK_LINHAS) -> Iterator[bytes]:
+    """Mesmo conteúdo de `df_to_csv_bytes`, em blocos de `chunk_linhas` linhas."""
+    if df is None:
+        df = pd.DataFrame()
+    # BOM só no início; o cabeçalho sai mesmo com df vazio
+    yield df.iloc[:0].to_csv(index=False).encode("utf-8-sig")
+    for i in range(0, len(df), chunk_linhas):
+        yield df.iloc[i : i + chunk_linhas].to_csv(index=False, header=False).encode("utf-8")
+
+
+def iter_jsonl_chunks(df: pd.DataFrame | None, chunk_linhas: int = CHUNK_LINHAS) -> Iterator[bytes]:
+    """JSON Lines (um objeto por linha), em blocos."""
+    if df is None:
+        return
+    for i in range(0, len(df), chunk_linhas):
+        txt = df.iloc[i : i + chunk_linhas].to_json(orient="records", lines=True, force_ascii=False)
+        yield (txt if txt.endswith("\n") else txt + "\n").encode("utf-8")
+
+
+def write_chunks(chunks: Iterable[bytes]) -> IO[bytes]:
+    """Grava os blocos num arquivo temporário (spooled) e devolve-o posicionado no início."""
+    f = _spooled()
+    for c in chunks:
+        f.write(c)
+    f.seek(0)
+    return f
+
+
+def as_download(f: IO[bytes]) -> io.BytesIO | io.FileIO:
+    """
+    Adapta o temporário para `st.download_button` (aceita BytesIO/RawIOBase, não SpooledTemporaryFile):
+    até SPOOL_MAX_MEMORIA (ainda em memória) vira BytesIO; maior, já está no disco e vira um FileIO
+    sobre o mesmo arquivo (sem nova cópia).
+    """
+    tamanho = f.seek(0, os.SEEK_END)
+    f.seek(0)
+    if tamanho <= SPOOL_MAX_MEMORIA:
+        with f:
+            return io.BytesIO(f.read())
+    # fileno() garante o arquivo em disco (SpooledTemporaryFile faz o rollover se preciso)
+    raw = io.FileIO(os.dup(f.fileno()), "rb")
+    f.close()
+    return raw
+
+
+# ---- Parquet / Arrow IPC (pyarrow)
+FORMATOS_TABELA = {
+    ".parquet": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+}
+
+
+def formato_tabela(file_name: str) -> str:
+    ext = "." + file_name.rsplit(".", 1)[-1].lower() if "." in file_name else ""
+    formato = FORMATOS_TABELA.get(ext)
+    if formato is None:
+        raise ValueError(f"Formato não suportado: {file_name} (use {', '.join(FORMATOS_TABELA)}).")
+    return formato
+
+
+def _schema_arrow(df: pd.DataFrame, chunk_linhas: int):
+    import pyarrow as pa
+
+    # Esquema a partir de um bloco inteiro (colunas object vazias viram null no df.iloc[:0])
+    return pa.Schema.from_pandas(df.iloc[:chunk_linhas], preserve_index=False)
+
+
+def _iter_tabelas_arrow(df: pd.DataFrame, schema, chunk_linhas: int):
+    import pyarrow as pa
+
+    for i in range(0, len(df), chunk_linhas):
+        yield pa.Table.from_pandas(df.iloc[i : i + chunk_linhas], schema=schema, preserve_index=False)
+
+
+def _escrever_parquet(df: pd.DataFrame, f: IO[bytes], chunk_linhas: int) -> None:
+    import pyarrow.parquet as pq
+
+    schema = _schema_arrow(df, chunk_linhas)
+    with pq.ParquetWriter(f, schema, compression="zstd") as w:
+        for t in _iter_tabelas_arrow(df, schema, chunk_linhas):
+            w.write_table(t, row_group_size=chunk_linhas)
+
+
+def _escrever_arrow(df: pd.DataFrame, f: IO[bytes], chunk_linhas: int) -> None:
+    import pyarrow as pa
+
+    schema = _schema_arrow(df, chunk_linhas)
+    with pa.ipc.new_file(f, schema) as w:
+        for t in _iter_tabelas_arrow(df, schema, chunk_linhas):
+            w.write_table(t)
+
+
+@medido("export.parquet", medir_bytes=True)
+def df_to_parquet_file(df: pd.DataFrame, chunk_linhas: int = CHUNK_LINHAS) -> IO[bytes]:
+    """Parquet em row groups de `chunk_linhas` (converte um bloco por vez para Arrow)."""
+    f = _spooled()
+    _escrever_parquet(pd.DataFrame() if df is None else df, f, chunk_linhas)
+    f.seek(0)
+    return f
+
+
+@medido("export.arrow", medir_bytes=True)
+def df_to_arrow_file(df: pd.DataFrame, chunk_linhas: int = CHUNK_LINHAS) -> IO[bytes]:
+    """Arrow IPC (formato arquivo / Feather v2), um record batch por bloco."""
+    f = _spooled()
+    _escrever_arrow(pd.DataFrame() if df is None else df, f, chunk_linhas)
+    f.seek(0)
+    return f
+
+
+def write_table(df: pd.DataFrame, destino: IO[bytes], formato: str, chunk_linhas: int = CHUNK_LINHAS) -> None:
+    """Grava `df` direto em `destino` (arquivo ou stdout binário), bloco a bloco."""
+    if formato not in ("parquet", "arrow", "csv", "jsonl"):
+        raise ValueError(f"Formato não suportado: {formato}")
+    with etapa(f"export.{formato}") as m:
+        inicio = destino.tell() if destino.seekable() else None
+        if formato == "parquet":
+            _escrever_parquet(df, destino, chunk_linhas)
+        elif formato == "arrow":
+            _escrever_arrow(df, destino, chunk_linhas)
+        else:
+            chunks = iter_csv_chunks if formato == "csv" else iter_jsonl_chunks
+            for c in chunks(df, chunk_linhas):
+                destino.write(c)
+        if inicio is not None:
+            m.bytes = destino.tell() - inicio
+
+
+def iter_file_chunks(f: IO[bytes], tamanho: int = 1024 * 1024) -> Iterator[bytes]:
+    """Lê um arquivo em blocos (para colocar Parquet/Arrow no ZIP sem carregar tudo)."""
+    with f:
+        while bloco := f.read(tamanho):
+            yield bloco
+
+
+def read_table(data: IO[bytes] | bytes, file_name: str) -> pd.DataFrame:
+    """Importa tabela exportada por este módulo (Parquet, Arrow IPC/Feather, CSV ou JSONL) pela extensão."""
+    formato = formato_tabela(file_name)
+    src = io.BytesIO(data) if isinstance(data, bytes) else data
+    if formato == "parquet":
+        return pd.read_parquet(src)
+    if formato == "arrow":
+        return pd.read_feather(src)
+    if formato == "jsonl":
+        return pd.read_json(src, lines=True)
+    return pd.read_csv(src, encoding="utf-8-sig")
+
+
+@medido("export.zip", medir_bytes=True)
+def make_zip_file(files: list[tuple[str, Conteudo]]) -> IO[bytes]:
+    """ZIP escrito membro a membro (blocos direto no arquivo) num temporário spooled."""
+    f = _spooled()
+    with zipfile.ZipFile(f, "w", compression=zipfile.ZIP_DEFLATED) as zf:
         for name, data in files:
-            zf.writestr(name, data)
-    return buf.getvalue()
+            with zf.open(name, "w", force_zip64=True) as membro:
+                for c in [data] if isinstance(data, bytes) else data:
+                    membro.write(c)
+    f.seek(0)
+    return f
+
+
+def make_zip_bytes(files: list[tuple[str, Conteudo]]) -> bytes:
+    with make_zip_file(files) as f:
+        return f.read()
 
 
 def _html_table(df: pd.DataFrame, max_rows: int = 200) -> str:
@@ -25,6 +201,7 @@ def _html_table(df: pd.DataFrame, max_rows: int = 200) -> str:
     return view.to_html(index=False, escape=True)
 
 
+@medido("export.html", medir_bytes=True)
 def build_html_report(
     *,
     title: str,
@@ -72,13 +249,23 @@ small {{ color: #666; }}
     return html.encode("utf-8")
 
 
+@medido("export.csv", medir_bytes=True)
 def df_to_csv_bytes(df: pd.DataFrame) -> bytes:
-    if df is None:
-        df = pd.DataFrame()
     # UTF-8 com BOM (mais “Excel-friendly”)
-    return df.to_csv(index=False).encode("utf-8-sig")
+    return b"".join(iter_csv_chunks(df))
+
+
+@medido("export.csv", medir_bytes=True)
+def df_to_csv_file(df: pd.DataFrame) -> IO[bytes]:
+    return write_chunks(iter_csv_chunks(df))
+
+
+@medido("export.jsonl", medir_bytes=True)
+def df_to_jsonl_file(df: pd.DataFrame) -> IO[bytes]:
+    return write_chunks(iter_jsonl_chunks(df))
 
 
+@medido("export.md", medir_bytes=True)
 def df_to_md_bytes(title: str, dfs: list[tuple[str, pd.DataFrame]], max_rows: int = 200) -> bytes:
     """
     Observação: DataFrame.to_markdown depende de tabulate instalado.
@@ -97,6 +284,7 @@ def df_to_md_bytes(title: str, dfs: list[tuple[str, pd.DataFrame]], max_rows: in
     return "\n".join(out).encode("utf-8")
 
 
+@medido("export.json", medir_bytes=True)
 def df_to_json_bytes(df: pd.DataFrame, orient: str = "records") -> bytes:
     if df is None:
         payload: Any = []
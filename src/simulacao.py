@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from .config import PREMIOS_FAIXA, LotterySpec
+from .domain_lottery import ESTRATEGIAS, gerar_estrategia, gerar_matriz_aleatoria, preco_aposta
+from .draw_index import mascaras_matriz, popcount
+from .models import Restricoes
+from .parallel import mapear
+
+ESTRATEGIAS_SIM = ESTRATEGIAS  # mesmas estratégias (e regras de aceitação) da página de geração
+
+# Jogos (= sorteios simulados) por chunk: limita a matriz de chaves do argpartition por worker
+LOTE_PADRAO = 100_000
+# Parada antecipada checada a cada rodada de chunks; rodada fixa => resultado não depende do nº de workers
+CHUNKS_POR_RODADA = 8
+# O IC só vale depois que toda faixa paga apareceu algumas vezes (senão ignora o prêmio raro)
+MIN_OCORRENCIAS_FAIXA = 10
+Z_95 = 1.959963984540054
+
+
+@dataclass(frozen=True)
+class ConfigSimulacao:
+    estrategia: str
+    tam: int
+    proporcao: tuple[int, int, int] = (5, 5, 0)
+    limite_seq: int = 3
+
+
+@dataclass(frozen=True)
+class ResultadoSimulacao:
+    """Acumulado em histograma de acertos (tamanho s+1): nada é guardado por sorteio."""
+
+    config: ConfigSimulacao
+    hist_acertos: np.ndarray  # int64 (s + 1,)
+    custo_jogo: float
+    pagamento: np.ndarray  # float64 (s + 1,): R$ pagos a um bilhete com h acertos
+    parou_cedo: bool
+
+    @property
+    def n_jogos(self) -> int:
+        return int(self.hist_acertos.sum())
+
+    @property
+    def retorno_por_real(self) -> float:
+        """Valor médio recebido por R$ 1 apostado (1.0 = empate)."""
+        n = self.n_jogos
+        return float(self.hist_acertos @ self.pagamento) / (n * self.custo_jogo) if n else 0.0
+
+    @property
+    def ic95(self) -> float:
+        """Meia-largura do IC 95% do retorno por real (só enxerga faixas já observadas)."""
+        n = self.n_jogos
+        if n < 2:
+            return math.inf
+        r = self.pagamento / self.custo_jogo
+        p = self.hist_acertos / n
+        var = float(p @ r**2) - float(p @ r) ** 2
+        return Z_95 * math.sqrt(max(var, 0.0) / n)
+
+
+def pagamento_por_acertos(tam: int, spec: LotterySpec, premios: dict[int, float]) -> np.ndarray:
+    """Bilhete de `tam` dezenas com h acertos contém C(h,t)·C(tam-h, s-t) apostas simples com t acertos."""
+    s = spec.n_dezenas_sorteio
+    return np.array(
+        [
+            sum(v * math.comb(h, t) * math.comb(tam - h, s - t) for t, v in premios.items())
+            for h in range(s + 1)
+        ],
+        dtype=np.float64,
+    )
+
+
+def retorno_exato(tam: int, spec: LotterySpec, pagamento: np.ndarray) -> float:
+    """Retorno por real contra sorteio uniforme (hipergeométrica): referência para a simulação."""
+    N, s = spec.n_universo, spec.n_dezenas_sorteio
+    esperado = sum(math.comb(tam, h) * math.comb(N - tam, s - h) * pagamento[h] for h in range(s + 1))
+    return float(esperado) / math.comb(N, s) / preco_aposta(tam, spec.n_min, spec.preco_base)
+
+
+def _gerar_jogos(
+    cfg: ConfigSimulacao, qtd: int, spec: LotterySpec, freq_df: pd.DataFrame | None, rng: np.random.Generator
+) -> np.ndarray:
+    # mesmo caminho da página de geração: amostragem com a máscara de aceitação exata de cada estratégia
+    return gerar_estrategia(
+        cfg.estrategia,
+        qtd,
+        cfg.tam,
+        spec.n_universo,
+        Restricoes(),
+        limite_baixo=spec.limite_baixo,
+        freq_df=freq_df,
+        proporcao=cfg.proporcao,
+        limite_seq=cfg.limite_seq,
+        rng=rng,
+    ).jogos
+
+
+def _simular_chunk(
+    tarefa: tuple[ConfigSimulacao, LotterySpec, pd.DataFrame | None, np.random.SeedSequence, int],
+) -> np.ndarray:
+    cfg, spec, freq_df, semente, lote = tarefa
+    rng = np.random.default_rng(semente)
+    jogos = _gerar_jogos(cfg, lote, spec, freq_df, rng)
+    # filtro raro (ex.: Sem sequências na Lotofácil) pode devolver menos que `lote`: um sorteio por jogo
+    sorteios = gerar_matriz_aleatoria(len(jogos), spec.n_dezenas_sorteio, spec.n_universo, rng)
+    h = popcount(mascaras_matriz(jogos) & mascaras_matriz(sorteios))
+    return np.bincount(h, minlength=spec.n_dezenas_sorteio + 1).astype(np.int64)
+
+
+def simular(
+    cfg: ConfigSimulacao,
+    spec: LotterySpec,
+    freq_df: pd.DataFrame | None = None,
+    *,
+    premios: dict[int, float] | None = None,
+    max_jogos: int = 5_000_000,
+    min_jogos: int = 1_000_000,
+    tol: float = 0.005,
+    seed: int | None = None,
+    workers: int | None = None,
+    lote: int = LOTE_PADRAO,
+    progresso: Callable[[ResultadoSimulacao], None] | None = None,
+) -> ResultadoSimulacao:
+    """
+    Cada jogo da estratégia enfrenta um sorteio aleatório independente. Roda em rodadas de
+    CHUNKS_POR_RODADA chunks (cada um com seu stream de RNG via SeedSequence.spawn) e para
+    quando o IC 95% do retorno por real fica <= `tol` (após `min_jogos` e com toda faixa paga
+    vista MIN_OCORRENCIAS_FAIXA vezes) ou em `max_jogos`.
+    """
+    if cfg.estrategia not in ESTRATEGIAS_SIM:
+        raise ValueError(f"Estratégia desconhecida: {cfg.estrategia}")
+    if not spec.n_min <= cfg.tam <= spec.n_max:
+        raise ValueError(f"Dezenas por jogo deve estar entre {spec.n_min} e {spec.n_max}.")
+
+    premios = PREMIOS_FAIXA[spec.modalidade] if premios is None else premios
+    pagamento = pagamento_por_acertos(cfg.tam, spec, premios)
+    custo = preco_aposta(cfg.tam, spec.n_min, spec.preco_base)
+    raiz = np.random.SeedSequence(seed)
+    hist = np.zeros(spec.n_dezenas_sorteio + 1, dtype=np.int64)
+    pagos = np.flatnonzero(pagamento > 0)
+
+    def resultado(parou_cedo: bool) -> ResultadoSimulacao:
+        return ResultadoSimulacao(cfg, hist.copy(), custo, pagamento, parou_cedo)
+
+    while hist.sum() < max_jogos:
+        falta = int(max_jogos - hist.sum())
+        lotes = [min(lote, falta - i * lote) for i in range(CHUNKS_POR_RODADA) if falta - i * lote > 0]
+        tarefas = [(cfg, spec, freq_df, s, n) for s, n in zip(raiz.spawn(len(lotes)), lotes)]
+        for parcial in mapear(_simular_chunk, tarefas, workers):
+            hist += parcial
+
+        res = resultado(False)
+        if progresso is not None:
+            progresso(res)
+        if res.n_jogos >= min_jogos and res.ic95 <= tol and (hist[pagos] >= MIN_OCORRENCIAS_FAIXA).all():
+            return resultado(res.n_jogos < max_jogos)
+    return resultado(False)
+
+
+def faixas_df(res: ResultadoSimulacao, spec: LotterySpec) -> pd.DataFrame:
+    """Distribuição de acertos por bilhete (simulada) nas faixas premiadas."""
+    n = max(res.n_jogos, 1)
+    linhas = []
+    for t in spec.faixas_premio:
+        qtd = int(res.hist_acertos[t])
+        linhas.append(
+            {
+                "faixa": spec.nome_faixa(t),
+                "acertos": t,
+                "bilhetes": qtd,
+                "frequencia": qtd / n,
+            }
+        )
+    return pd.DataFrame(linhas)
+
+
+def resumo_df(resultados: list[ResultadoSimulacao], spec: LotterySpec) -> pd.DataFrame:
+    faixa_min = min(spec.faixas_premio)
+    return pd.DataFrame(
+        [
+            {
+                "estrategia": r.config.estrategia,
+                "dezenas": r.config.tam,
+                "jogos_simulados": r.n_jogos,
+                "custo_jogo": r.custo_jogo,
+                "retorno_por_real": r.retorno_por_real,
+                "ic95": r.ic95,
+                "retorno_liquido_por_real": r.retorno_por_real - 1.0,
+                "retorno_exato_uniforme": retorno_exato(r.config.tam, spec, r.pagamento),
+                "p_algum_premio": float(r.hist_acertos[faixa_min:].sum()) / max(r.n_jogos, 1),
+                "parou_cedo": r.parou_cedo,
+            }
+            for r in resultados
+        ]
+    )
@@ -3,30 +3,60 @@ from __future__ import annotations
 import streamlit as st
 import pandas as pd
 
+from . import analytics_cached  # noqa: F401 (backend Streamlit dos caches do núcleo, antes do aquecimento)
+from . import prefetch
 from .config import Modalidade
-from .models import GameInfo
+from .game_pack import GamePack
+from .history_registry import Token, mais_recente, registrar, resolver
 
-HIST_KEY = "history_by_mod"
-GAMES_KEY = "games_info"  # list[GameInfo]
+HIST_KEY = "history_by_mod"  # modalidade -> token do histórico (o df fica no registro do processo)
+GAMES_KEY = "games_pack"  # GamePack (colunar)
+SIM_KEY = "sim_by_mod"  # modalidade -> list[ResultadoSimulacao]
 
 def init_state() -> None:
+    # toda página chama: o primeiro acesso ao processo já aquece as duas modalidades
+    prefetch.iniciar()
     st.session_state.setdefault(HIST_KEY, {})
-    st.session_state.setdefault(GAMES_KEY, [])
+    st.session_state.setdefault(GAMES_KEY, GamePack.vazio())
+    st.session_state.setdefault(SIM_KEY, {})
 
-def get_history(mod: Modalidade) -> pd.DataFrame | None:
+def get_history_token(mod: Modalidade) -> Token | None:
     return st.session_state[HIST_KEY].get(mod)
 
-def set_history(mod: Modalidade, df: pd.DataFrame) -> None:
-    st.session_state[HIST_KEY][mod] = df
+def _atualizar_token(mod: Modalidade, token: Token) -> Token:
+    # versão mais nova no processo (revalidação em segundo plano) substitui a da sessão
+    recente = mais_recente(mod)
+    if recente is not None and (recente[2], recente[1]) > (token[2], token[1]):
+        token = recente
+    st.session_state[HIST_KEY][mod] = token
+    return token
+
+def get_history(mod: Modalidade) -> pd.DataFrame | None:
+    token = get_history_token(mod)
+    if token is None:
+        return None
+    return resolver(_atualizar_token(mod, token))
+
+def set_history(mod: Modalidade, df: pd.DataFrame) -> pd.DataFrame:
+    """Registra no processo e guarda só o token; devolve o df compartilhado (use-o no lugar de `df`)."""
+    token, compartilhado = registrar(mod, df)
+    recente = resolver(_atualizar_token(mod, token))
+    return compartilhado if recente is None else recente
 
 def clear_history(mod: Modalidade) -> None:
     st.session_state[HIST_KEY].pop(mod, None)
 
-def get_games_info() -> list[GameInfo]:
+def get_game_pack() -> GamePack:
     return st.session_state[GAMES_KEY]
 
-def set_games_info(games: list[GameInfo]) -> None:
-    st.session_state[GAMES_KEY] = games
+def set_game_pack(pack: GamePack) -> None:
+    st.session_state[GAMES_KEY] = pack
 
 def clear_games() -> None:
-    st.session_state[GAMES_KEY] = []
+    st.session_state[GAMES_KEY] = GamePack.vazio()
+
+def get_simulacoes(mod: Modalidade) -> list:
+    return st.session_state[SIM_KEY].get(mod, [])
+
+def set_simulacoes(mod: Modalidade, resultados: list) -> None:
+    st.session_state[SIM_KEY][mod] = resultados
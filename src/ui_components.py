@@ -26,5 +26,5 @@ def pack_cards(*, spec, jogos_count: int, custo: float, chance_txt: str, media_d
     c1, c2, c3, c4 = st.columns(4)
     c1.metric("Jogos", jogos_count)
     c2.metric("Custo estimado", custo)
-    c3.metric("Chance aprox.", chance_txt)
+    c3.metric(f"Chance ({spec.nome_faixa(spec.n_dezenas_sorteio)})", chance_txt)
     c4.metric("Média dezenas/jogo", f"{media_dezenas:.1f}")
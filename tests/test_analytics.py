@@ -0,0 +1,135 @@
+"""Equivalência das análises vetorizadas (e do estado incremental) com as versões antigas."""
+import pandas as pd
+import pytest
+
+from benchmarks.common import historico_sintetico
+from src.analytics import atraso, frequencias, padroes_par_impar_baixa_alta, somas
+from src.analytics_state import RECENTES_MAX, AnalyticsState
+from src.config import get_spec
+from src.draw_index import DrawIndex
+
+
+def _frequencias_legado(df: pd.DataFrame, n_dezenas_sorteio: int, n_universo: int) -> pd.DataFrame:
+    dezenas_cols = [f"d{i}" for i in range(1, n_dezenas_sorteio + 1)]
+    todas = df[dezenas_cols].values.ravel()
+    freq = pd.Series(todas).value_counts().reindex(range(1, n_universo + 1), fill_value=0).sort_index()
+    out = freq.reset_index()
+    out.columns = ["dezena", "frequencia"]
+    out["dezena"] = out["dezena"].astype(int)
+    out["frequencia"] = out["frequencia"].astype(int)
+    return out
+
+
+def _somas_legado(df: pd.DataFrame, n_dezenas_sorteio: int):
+    dezenas_cols = [f"d{i}" for i in range(1, n_dezenas_sorteio + 1)]
+    dfx = df.copy()
+    dfx["soma"] = dfx[dezenas_cols].sum(axis=1)
+    bins = [0, 150, 200, 250, 300, 350, 500]
+    labels = ["0-150", "151-200", "201-250", "251-300", "301-350", "351-500"]
+    dfx["faixa_soma"] = pd.cut(dfx["soma"], bins=bins, labels=labels, right=True)
+    dist = dfx["faixa_soma"].value_counts(dropna=False).sort_index().reset_index()
+    dist.columns = ["faixa_soma", "qtd"]
+    return dfx[["concurso", "soma", "faixa_soma"]], dist
+
+
+def _atraso_legado(freq_df: pd.DataFrame, df: pd.DataFrame, n_dezenas_sorteio: int, n_universo: int) -> pd.DataFrame:
+    dezenas_cols = [f"d{i}" for i in range(1, n_dezenas_sorteio + 1)]
+    ultimo: dict[int, int] = {}
+    for _, row in df[["concurso"] + dezenas_cols].iterrows():
+        conc = int(row["concurso"])
+        for d in row[dezenas_cols]:
+            ultimo[int(d)] = conc
+
+    max_conc = int(df["concurso"].max())
+    linhas = []
+    for dezena in range(1, n_universo + 1):
+        fr = int(freq_df.loc[freq_df["dezena"] == dezena, "frequencia"].iloc[0])
+        ult = ultimo.get(dezena)
+        linhas.append(
+            {"dezena": dezena, "frequencia": fr, "ultimo_concurso": ult, "atraso_atual": (None if ult is None else max_conc - ult)}
+        )
+    return pd.DataFrame(linhas)
+
+
+def _padroes_legado(df: pd.DataFrame, n_dezenas_sorteio: int, limite_baixo: int):
+    dezenas_cols = [f"d{i}" for i in range(1, n_dezenas_sorteio + 1)]
+    registros = []
+    for _, row in df[["concurso"] + dezenas_cols].iterrows():
+        dezenas = [int(row[c]) for c in dezenas_cols]
+        pares = sum(1 for d in dezenas if d % 2 == 0)
+        impares = len(dezenas) - pares
+        baixos = sum(1 for d in dezenas if 1 <= d <= limite_baixo)
+        altos = len(dezenas) - baixos
+        registros.append({"concurso": int(row["concurso"]), "pares": pares, "impares": impares, "baixos": baixos, "altos": altos})
+
+    dfp = pd.DataFrame(registros)
+    dist_pi = dfp.groupby(["pares", "impares"]).size().reset_index(name="qtd").sort_values("qtd", ascending=False).reset_index(drop=True)
+    dist_ba = dfp.groupby(["baixos", "altos"]).size().reset_index(name="qtd").sort_values("qtd", ascending=False).reset_index(drop=True)
+    return dfp, dist_pi, dist_ba
+
+
+# 2.000 concursos: todas as dezenas saem; 3 concursos da Mega: a maioria nunca saiu (NaN no atraso)
+@pytest.fixture(
+    scope="module",
+    params=[("Mega-Sena", 2_000), ("Lotofácil", 2_000), ("Mega-Sena", 3)],
+    ids=["mega", "lotofacil", "mega-curto"],
+)
+def historico(request):
+    mod, n = request.param
+    spec = get_spec(mod)
+    return spec, historico_sintetico(spec, n, seed=1)
+
+
+def _dist_ordenada(d: pd.DataFrame) -> pd.DataFrame:
+    # empates em `qtd` podem sair em ordem diferente
+    return d.sort_values(list(d.columns)).reset_index(drop=True)
+
+
+def test_frequencias(historico):
+    spec, df = historico
+    n, N = spec.n_dezenas_sorteio, spec.n_universo
+    pd.testing.assert_frame_equal(frequencias(df, n, N), _frequencias_legado(df, n, N), check_dtype=False)
+
+
+def test_atraso(historico):
+    spec, df = historico
+    n, N = spec.n_dezenas_sorteio, spec.n_universo
+    freq = frequencias(df, n, N)
+    pd.testing.assert_frame_equal(atraso(freq, df, n, N), _atraso_legado(freq, df, n, N))
+
+
+def test_padroes(historico):
+    spec, df = historico
+    n, lb = spec.n_dezenas_sorteio, spec.limite_baixo
+    idx = DrawIndex.from_history(df, n, spec.n_universo)
+    for novo, antigo in zip(padroes_par_impar_baixa_alta(df, n, lb, idx=idx), _padroes_legado(df, n, lb)):
+        pd.testing.assert_frame_equal(novo, antigo)
+
+
+def test_somas(historico):
+    spec, df = historico
+    for novo, antigo in zip(somas(df, spec.n_dezenas_sorteio), _somas_legado(df, spec.n_dezenas_sorteio)):
+        pd.testing.assert_frame_equal(novo, antigo)
+
+
+def test_estado_incremental_confere(historico):
+    spec, df = historico
+    n, N, lb = spec.n_dezenas_sorteio, spec.n_universo, spec.limite_baixo
+    # metade de uma vez, o resto incremental
+    st = AnalyticsState.from_history(df.iloc[: len(df) // 2], spec)
+    st.apply(df.iloc[len(df) // 2 :])
+
+    freq = _frequencias_legado(df, n, N)
+    pd.testing.assert_frame_equal(st.frequencias_df(), freq, check_dtype=False)
+    pd.testing.assert_frame_equal(st.atraso_df(), _atraso_legado(freq, df, n, N), check_dtype=False)
+
+    dfp, dist_pi, dist_ba = st.padroes()
+    dfp_antigo, dist_pi_antigo, dist_ba_antigo = _padroes_legado(df, n, lb)
+    pd.testing.assert_frame_equal(dfp, dfp_antigo.tail(RECENTES_MAX).reset_index(drop=True), check_dtype=False)
+    pd.testing.assert_frame_equal(_dist_ordenada(dist_pi), _dist_ordenada(dist_pi_antigo), check_dtype=False)
+    pd.testing.assert_frame_equal(_dist_ordenada(dist_ba), _dist_ordenada(dist_ba_antigo), check_dtype=False)
+
+    dfs, dist_soma = st.somas()
+    dfs_antigo, dist_soma_antigo = _somas_legado(df, n)
+    pd.testing.assert_frame_equal(dfs, dfs_antigo.tail(RECENTES_MAX).reset_index(drop=True), check_dtype=False)
+    pd.testing.assert_frame_equal(dist_soma, dist_soma_antigo, check_dtype=False)
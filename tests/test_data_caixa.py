@@ -0,0 +1,32 @@
+from io import BytesIO
+
+import pytest
+from openpyxl import load_workbook
+
+from benchmarks.common import planilha_caixa
+from src.config import get_spec
+from src.data_caixa import COLUNAS_XLSX, _ler_colunas_iter_rows, _ler_colunas_xml, ler_xlsx_colunas
+
+
+@pytest.mark.parametrize("modalidade", ["Mega-Sena", "Lotofácil"])
+def test_atalho_xml_confere_com_iter_rows(modalidade):
+    conteudo = planilha_caixa(get_spec(modalidade), 200)
+    colunas = COLUNAS_XLSX[modalidade]
+
+    def ler(fn):
+        wb = load_workbook(BytesIO(conteudo), read_only=True, data_only=True)
+        try:
+            return fn(wb.worksheets[0], colunas, colunas[1:2], wb.epoch)
+        finally:
+            wb.close()
+
+    xml, publico = ler(_ler_colunas_xml), ler(_ler_colunas_iter_rows)
+    assert xml == publico
+    assert dict(zip(colunas, xml)) == ler_xlsx_colunas(BytesIO(conteudo), colunas, datas=colunas[1:2])
+    assert len(xml[0]) == 200
+
+
+def test_coluna_ausente():
+    conteudo = planilha_caixa(get_spec("Mega-Sena"), 5)
+    with pytest.raises(RuntimeError, match="colunas ausentes"):
+        ler_xlsx_colunas(BytesIO(conteudo), ["Concurso", "Bola9"])
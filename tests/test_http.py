@@ -0,0 +1,134 @@
+"""Atualização do histórico contra o servidor local (`stub_caixa`): 304, sha256, validadores e revalidação."""
+import time
+from datetime import timedelta
+from io import BytesIO
+
+import pytest
+
+import src.data_caixa as data_caixa
+from benchmarks.common import planilha_caixa
+from benchmarks.stub_caixa import StubCaixa
+from src.config import CACHE_DIR_ENV, DOWNLOAD_URL_ENV, get_spec, url_download
+from src.data_caixa import atualizar_da_caixa, ler_historico_xlsx, load_history, revalidando, revalidar
+from src.history_registry import mais_recente
+from src.history_store import agora_brasilia, carregar_store, carregar_validadores, salvar_store
+from src.http_client import get_condicional
+
+MOD = "Lotofácil"
+
+
+@pytest.fixture(scope="module")
+def planilhas():
+    spec = get_spec(MOD)
+    return planilha_caixa(spec, 199), planilha_caixa(spec, 200)
+
+
+@pytest.fixture
+def servidor(planilhas, tmp_path, monkeypatch):
+    monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path))
+    with StubCaixa({MOD: planilhas[0]}) as srv:
+        monkeypatch.setenv(DOWNLOAD_URL_ENV, srv.url)
+        yield srv
+
+
+@pytest.fixture
+def leituras(monkeypatch):
+    """Conta as planilhas efetivamente lidas (parse) por `atualizar_da_caixa`."""
+    chamadas = []
+
+    def ler(buf, mod):
+        chamadas.append(mod)
+        return ler_historico_xlsx(buf, mod)
+
+    monkeypatch.setattr(data_caixa, "ler_historico_xlsx", ler)
+    return chamadas
+
+
+def _store_vencido(df) -> None:
+    """Store com a última verificação há um dia: um sorteio novo é esperado."""
+    salvar_store(MOD, df, verificado_em=agora_brasilia() - timedelta(days=1))
+
+
+def test_get_condicional(servidor, planilhas):
+    url = url_download(MOD)
+    primeira = get_condicional(url)
+    assert primeira.status == 200 and primeira.conteudo == planilhas[0]
+    assert primeira.validadores.etag and primeira.validadores.last_modified and primeira.validadores.sha256
+
+    resp = get_condicional(url, primeira.validadores)
+    assert (resp.status, resp.conteudo) == (304, None)
+    assert resp.validadores == primeira.validadores
+
+    # servidor que ignora os cabeçalhos: 200, mas o corpo tem o mesmo sha256
+    servidor.validadores = False
+    resp = get_condicional(url, primeira.validadores)
+    assert (resp.status, resp.conteudo) == (200, None)
+    assert resp.validadores.sha256 == primeira.validadores.sha256
+
+
+def test_304_nao_le_a_planilha(servidor, leituras):
+    df = load_history(MOD)
+    assert leituras == [MOD]
+    validadores = carregar_validadores(MOD)
+    assert validadores.etag and validadores.sha256
+
+    _store_vencido(df)
+    antes = agora_brasilia()
+    novo = atualizar_da_caixa(MOD, carregar_store(MOD))
+    assert servidor.nao_modificado == 1
+    assert leituras == [MOD]  # só o download inicial passou pelo parse
+    assert novo is not df and novo.equals(df)
+    assert carregar_store(MOD)[1] >= antes.replace(microsecond=0)  # verificação registrada
+    assert carregar_validadores(MOD) == validadores
+
+
+def test_mesmo_sha256_sem_validadores(servidor, leituras):
+    servidor.validadores = False
+    df = load_history(MOD)
+    v = carregar_validadores(MOD)
+    assert v.etag is None and v.last_modified is None and v.sha256
+
+    atualizar_da_caixa(MOD, carregar_store(MOD))
+    assert servidor.requisicoes == 2 and servidor.nao_modificado == 0
+    assert leituras == [MOD]
+    assert carregar_store(MOD)[0].equals(df)
+
+
+def test_validadores_acompanham_o_store(servidor, planilhas, leituras):
+    df = load_history(MOD)
+    antigos = carregar_validadores(MOD)
+
+    servidor.publicar(MOD, planilhas[1])
+    novo = atualizar_da_caixa(MOD, carregar_store(MOD))
+    assert leituras == [MOD, MOD]
+    assert len(novo) == len(df) + 1
+    novos = carregar_validadores(MOD)
+    assert novos.etag != antigos.etag and novos.sha256 != antigos.sha256
+
+    # a próxima consulta já sai condicional com os validadores novos
+    atualizar_da_caixa(MOD, carregar_store(MOD))
+    assert servidor.nao_modificado == 1
+    assert carregar_validadores(MOD) == novos
+
+
+def test_stale_while_revalidate(servidor, planilhas):
+    base = load_history(MOD)
+    ultimo = int(ler_historico_xlsx(BytesIO(planilhas[1]), MOD)["concurso"].max())
+    servidor.publicar(MOD, planilhas[1])
+    servidor.atraso = 0.5
+    _store_vencido(base)
+
+    t0 = time.perf_counter()
+    df = load_history(MOD, em_segundo_plano=True)
+    assert time.perf_counter() - t0 < servidor.atraso  # devolve o store local sem esperar a rede
+    assert df.equals(base)
+    assert revalidando(MOD)
+    fut = revalidar(MOD)
+    assert revalidar(MOD) is fut  # uma revalidação por modalidade
+
+    novo = fut.result(timeout=30)
+    assert not revalidando(MOD)
+    assert int(novo["concurso"].max()) == ultimo
+    assert mais_recente(MOD)[2] == ultimo
+    assert carregar_store(MOD)[0].equals(novo)
+    assert carregar_validadores(MOD).sha256 is not None
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+import src.domain_lottery as dl
+from src.domain_lottery import MontadorPacote, amostrar_com_restricoes, gerar_matriz_aleatoria
+from src.draw_index import mascaras_matriz, popcount
+from src.models import Restricoes
+
+
+def _referencia(m: np.ndarray, max_comum: int, passo: int = 1024) -> np.ndarray:
+    # mesma regra do montador, comparando cada lote com o pacote inteiro (O(n²))
+    aceitas = np.zeros(0, dtype=np.uint64)
+    partes = []
+    for ini in range(0, len(m), passo):
+        bloco = m[ini : ini + passo]
+        mask = mascaras_matriz(bloco)
+        sobre = popcount(mask[:, None] & mask[None, :]) > max_comum
+        ruim = np.tril(sobre, -1).any(axis=1)
+        if len(aceitas):
+            ruim |= (popcount(mask[:, None] & aceitas[None, :]) > max_comum).any(axis=1)
+        aceitas = np.concatenate([aceitas, mask[~ruim]])
+        partes.append(bloco[~ruim])
+    return np.concatenate(partes)
+
+
+@pytest.mark.parametrize("indice", [False, True], ids=["direto", "indice"])
+@pytest.mark.parametrize(
+    "tam, n_universo, max_comum",
+    [(15, 60, 8), (12, 60, 6), (18, 25, 12)],
+    ids=["mega-15-8", "mega-12-6", "lotofacil-18-12"],
+)
+def test_indice_por_faixas_confere_com_forca_bruta(monkeypatch, indice, tam, n_universo, max_comum):
+    if indice:
+        monkeypatch.setattr(dl, "ACEITOS_POR_CHAVE", 0)  # índice desde o 1º aceito
+    pacote = MontadorPacote(tam, n_universo, max_comum)
+    assert not pacote.por_blocos
+    m = gerar_matriz_aleatoria(6_000, tam, n_universo, np.random.default_rng(3)).astype(np.int64)
+
+    obtido = pacote.adicionar(m)
+    assert (pacote._indice is not None) == indice
+    np.testing.assert_array_equal(obtido, _referencia(m, max_comum))
+
+    mask = mascaras_matriz(obtido)
+    comum = popcount(mask[:, None] & mask[None, :])
+    assert (np.triu(comum, 1) <= max_comum).all()
+
+
+def test_saturacao_para_cedo_e_avisa():
+    # 8 dezenas livres, jogos de 6: só C(8, 6) = 28 jogos distintos existem
+    r = Restricoes(dezenas_proibidas=list(range(9, 61)))
+    res = amostrar_com_restricoes(
+        500, 6, 60, r, limite_baixo=30, rng=np.random.default_rng(1), pacote=MontadorPacote(6, 60)
+    )
+    assert res.saturado
+    assert len(res.jogos) == 28
+    assert res.geradas < 500_000
+
+
+def test_sem_pacote_nao_satura():
+    res = amostrar_com_restricoes(100, 6, 60, Restricoes(), limite_baixo=30, rng=np.random.default_rng(1))
+    assert not res.saturado and len(res.jogos) == 100
@@ -0,0 +1,40 @@
+import math
+
+import numpy as np
+import pytest
+
+from src.config import get_spec
+from src.draw_index import mascaras_matriz, popcount
+from src.premios import mascaras_todos_sorteios, probabilidades_faixas
+
+
+@pytest.fixture(scope="module")
+def lotofacil():
+    spec = get_spec("Lotofácil")
+    rng = np.random.default_rng(7)
+    jogos = np.sort(np.array([rng.choice(spec.n_universo, 15, replace=False) for _ in range(20)]) + 1, axis=1)
+    return spec, jogos
+
+
+def test_uniao_exata_confere_com_forca_bruta(lotofacil):
+    spec, jogos = lotofacil
+    todos = mascaras_todos_sorteios(spec.n_universo, spec.n_dezenas_sorteio)
+    acertos = np.stack([popcount(todos & m) for m in mascaras_matriz(jogos)])
+
+    df = probabilidades_faixas(jogos, spec)
+    assert df["exata"].all()
+    for t, prob in zip(df["acertos"], df["probabilidade"]):
+        # apostas simples: a faixa t paga exatamente t acertos
+        assert prob == pytest.approx((acertos == t).any(axis=0).sum() / math.comb(25, 15))
+
+
+def test_orcamento_deixa_so_a_cota_superior(lotofacil):
+    spec, jogos = lotofacil
+    exato = probabilidades_faixas(jogos, spec)
+    barato = probabilidades_faixas(jogos, spec, orcamento=0)
+
+    assert not barato["exata"].any()
+    assert barato["probabilidade"].isna().all()
+    assert (barato["cota_superior"] >= exato["probabilidade"]).all()
+    assert barato["esperado_bilhetes"].tolist() == pytest.approx(exato["esperado_bilhetes"].tolist())
+    assert barato["chance"].str.startswith("até ").all()
@@ -0,0 +1,19 @@
+import io
+
+import pytest
+
+from src import reports
+
+
+@pytest.mark.parametrize(
+    "tamanho, tipo",
+    [(10, io.BytesIO), (reports.SPOOL_MAX_MEMORIA, io.BytesIO), (reports.SPOOL_MAX_MEMORIA + 1, io.FileIO)],
+)
+def test_as_download_pelo_tamanho(tamanho, tipo):
+    d = reports.as_download(reports.write_chunks([b"x" * (tamanho - 1), b"y"]))
+    try:
+        assert type(d) is tipo
+        conteudo = d.read()
+        assert len(conteudo) == tamanho and conteudo.endswith(b"y")
+    finally:
+        d.close()
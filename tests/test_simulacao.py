@@ -0,0 +1,69 @@
+from functools import partial
+
+import numpy as np
+import pytest
+
+from benchmarks.common import historico_sintetico
+from src import domain_lottery, simulacao
+from src.analytics import frequencias
+from src.config import get_spec
+from src.domain_lottery import gerar_estrategia, pares_matriz
+from src.models import Restricoes
+from src.simulacao import ESTRATEGIAS_SIM, ConfigSimulacao, simular
+
+
+def test_sem_sequencias_limite_restritivo_com_lote_incompleto(monkeypatch):
+    # Lotofácil com limite 3: aceitação ~0,3%; rodadas curtas => o chunk volta com menos jogos que `lote`
+    monkeypatch.setattr(
+        domain_lottery,
+        "amostrar_com_restricoes",
+        partial(domain_lottery.amostrar_com_restricoes, lote_max=20_000, max_rodadas=5),
+    )
+    spec = get_spec("Lotofácil")
+    cfg = ConfigSimulacao("Sem sequências longas", 15, (5, 5, 5), 3)
+
+    res = simular(cfg, spec, max_jogos=2_000, min_jogos=2_000, seed=1, workers=1, lote=5_000)
+
+    assert res.n_jogos >= 2_000
+    assert res.hist_acertos.shape == (spec.n_dezenas_sorteio + 1,)
+    # 15 de 25 contra 15 sorteadas: no mínimo 5 acertos
+    assert res.hist_acertos[:5].sum() == 0
+
+
+def test_chunk_incompleto_um_sorteio_por_jogo(monkeypatch):
+    spec = get_spec("Lotofácil")
+    cfg = ConfigSimulacao("Sem sequências longas", 15, (5, 5, 5), 3)
+    poucos = np.tile(np.array([1, 2, 4, 5, 7, 8, 10, 11, 13, 14, 16, 17, 19, 20, 22], dtype=np.int8), (37, 1))
+    monkeypatch.setattr(simulacao, "_gerar_jogos", lambda *a: poucos)
+
+    hist = simulacao._simular_chunk((cfg, spec, None, np.random.SeedSequence(0), 1_000))
+
+    assert hist.sum() == 37
+
+
+
+@pytest.mark.parametrize("estrategia", ESTRATEGIAS_SIM)
+def test_mesmos_jogos_da_pagina(estrategia):
+    # a página gera por gerar_estrategia: o simulador aposta exatamente o que ela geraria
+    spec = get_spec("Mega-Sena")
+    freq = frequencias(historico_sintetico(spec, 200, seed=1), spec.n_dezenas_sorteio, spec.n_universo)
+    cfg = ConfigSimulacao(estrategia, 8, (3, 3, 2), 2)
+
+    jogos = simulacao._gerar_jogos(cfg, 5_000, spec, freq, np.random.default_rng(0))
+    pagina = gerar_estrategia(
+        estrategia,
+        5_000,
+        8,
+        spec.n_universo,
+        Restricoes(),
+        limite_baixo=spec.limite_baixo,
+        freq_df=freq,
+        proporcao=(3, 3, 2),
+        limite_seq=2,
+        rng=np.random.default_rng(0),
+    ).jogos
+
+    np.testing.assert_array_equal(jogos, pagina)
+    if estrategia == "Balanceado par/ímpar":
+        p = pares_matriz(jogos)
+        assert ((p > 0) & (p < 8)).all()